@@ -96,20 +96,52 @@ with contextlib.suppress(ModuleNotFoundError):
     sys.modules.setdefault("backend.utils", _utils_mod)
 
 _skip_autoload = "pytest" in sys.modules or os.getenv("PYTEST_NET_OFF") == "1"
-_agents_mod = importlib.import_module(".agents", __name__)
-sys.modules.setdefault(__name__ + ".agents", _agents_mod)
-sys.modules["backend.agents"] = _agents_mod
-setattr(sys.modules[__name__], "agents", _agents_mod)
 
-_services_mod = importlib.import_module(".services", __name__)
-sys.modules.setdefault(__name__ + ".services", _services_mod)
-sys.modules["backend.services"] = _services_mod
-setattr(sys.modules[__name__], "services", _services_mod)
-
-if not _skip_autoload:
-    _fin_mod = importlib.import_module(".agents.finance_agent", __name__)
-    sys.modules.setdefault(__name__ + ".finance_agent", _fin_mod)
-    sys.modules["backend.finance_agent"] = _fin_mod
+# Agent discovery imports every domain agent and ``services`` pulls in the
+# API servers, together well over a second. Both load on first attribute
+# access rather than with the package, so light users such as the Insight
+# orchestrator start quickly. Once loaded, each module is also registered
+# under its legacy ``backend.<name>`` key in ``sys.modules``; see
+# ``_share_legacy_name`` for imports that use the legacy name first.
+_LAZY_SUBMODULES = {
+    "agents": ".agents",
+    "services": ".services",
+    "finance_agent": ".agents.finance_agent",
+}
+
+
+def _share_legacy_name(name: str) -> None:
+    """Point ``backend.<name>`` and its loaded submodules at the canonical modules.
+
+    Lazily loaded subpackages call this before and after their own imports.
+    When one was first imported through its legacy name, the canonical package
+    is loaded and takes its place in ``sys.modules``, so there is one module
+    tree whichever name is used.
+    """
+    canonical, legacy = f"{__name__}.{name}", f"backend.{name}"
+    first = sys.modules.get(legacy)
+    if first is not None and first.__name__ == legacy:
+        sys.modules[legacy] = importlib.import_module(canonical)
+    for key, mod in list(sys.modules.items()):
+        if key == canonical or key.startswith(f"{canonical}."):
+            sys.modules.setdefault(legacy + key[len(canonical):], mod)
+
+
+def _load_submodule(name: str) -> types.ModuleType:
+    mod = importlib.import_module(_LAZY_SUBMODULES[name], __name__)
+    sys.modules.setdefault(f"{__name__}.{name}", mod)
+    sys.modules.setdefault(f"backend.{name}", mod)
+    setattr(sys.modules[__name__], name, mod)
+    return mod
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        return _load_submodule(name)
+    if name == "app":
+        app = globals()["app"] = _build_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ──────────────────────── log & CSRF helpers (unchanged) ──────────────────
@@ -131,75 +163,93 @@ _api_buffer: Dict[str, float] = {}
 
 API_PREFIX = "/api"
 
-# ───────────────────────────── FastAPI branch ─────────────────────────────
-try:
-    from fastapi import FastAPI, APIRouter
+_metrics_app: Any = None
 
-    fast_app = FastAPI(
-        title="Alpha-Factory API",
-        summary="Multi-Agent AGENTIC α-AGI backend",
-        version="1.0.0",
-    )
 
-    api_router = APIRouter(prefix=API_PREFIX)
+def _build_app() -> Any:
+    """Create the ASGI app; FastAPI is imported on first access to ``app``."""
+    # ───────────────────────────── FastAPI branch ─────────────────────────────
+    try:
+        from fastapi import FastAPI, APIRouter
 
-    # .— /logs ————————————————————————————————————————————————.
-    @api_router.get("/logs")
-    async def api_logs() -> List[str]:
-        """Return the most recent (≤100) log lines."""
-        return _read_logs()
+        fast_app = FastAPI(
+            title="Alpha-Factory API",
+            summary="Multi-Agent AGENTIC α-AGI backend",
+            version="1.0.0",
+        )
 
-    # .— /csrf ————————————————————————————————————————————————.
-    @api_router.get("/csrf")
-    async def csrf_token() -> dict[str, str]:
-        """Issue a one-time CSRF token for the /ws/trace handshake."""
-        token = secrets.token_urlsafe(32)
-        _api_buffer[token] = time.time()
-        return {"token": token}
+        api_router = APIRouter(prefix=API_PREFIX)
 
-    fast_app.include_router(api_router)
+        # .— /logs ————————————————————————————————————————————————.
+        @api_router.get("/logs")
+        async def api_logs() -> List[str]:
+            """Return the most recent (≤100) log lines."""
+            return _read_logs()
 
-    # .— /ws/trace ————————————————————————————————————————————————.
-    try:
-        from .trace_ws import attach as _attach_trace_ws
+        # .— /csrf ————————————————————————————————————————————————.
+        @api_router.get("/csrf")
+        async def csrf_token() -> dict[str, str]:
+            """Issue a one-time CSRF token for the /ws/trace handshake."""
+            token = secrets.token_urlsafe(32)
+            _api_buffer[token] = time.time()
+            return {"token": token}
 
-        _attach_trace_ws(fast_app, prefix=API_PREFIX)  # registers /ws/trace
-    except Exception:  # pragma: no cover
-        _LOG.debug("trace_ws not attached (optional component missing).")
+        fast_app.include_router(api_router)
 
-    # .— /metrics (Prometheus) ————————————————————————————————————————.
-    if not _skip_autoload:
+        # .— /ws/trace ————————————————————————————————————————————————.
         try:
-            from .agents.finance_agent import metrics_asgi_app
+            from .trace_ws import attach as _attach_trace_ws
 
-            fast_app.mount(f"{API_PREFIX}/metrics", metrics_asgi_app())
+            _attach_trace_ws(fast_app, prefix=API_PREFIX)  # registers /ws/trace
         except Exception:  # pragma: no cover
-            _LOG.debug("Prometheus metrics endpoint not active.")
-
-    # Export the ASGI application expected by uvicorn & gunicorn
-    app = fast_app
-
-# ─────────────────────── zero-dependency HTTP fallback ────────────────────
-except ModuleNotFoundError:  # pragma: no cover
-
-    async def app(
-        scope: Dict[str, Any],
-        receive: Callable[..., Awaitable[Any]],
-        send: Callable[..., Awaitable[Any]],
-    ) -> None:  # type: ignore  # noqa: D401, N802
-        """Tiny HTTP-only ASGI app used when FastAPI is not installed."""
-        if scope["type"] != "http":  # only handle plain HTTP
-            return
-
-        path = scope.get("path", "/")
-
-        if path == f"{API_PREFIX}/logs":
-            body = json.dumps(_read_logs()).encode()
-            ctype = b"application/json"
-        else:
-            body = b"Alpha-Factory online"
-            ctype = b"text/plain"
-
-        headers = [(b"content-type", ctype)]
-        await send({"type": "http.response.start", "status": 200, "headers": headers})
-        await send({"type": "http.response.body", "body": body})
+            _LOG.debug("trace_ws not attached (optional component missing).")
+
+        # .— /metrics (Prometheus) ————————————————————————————————————————.
+        if not _skip_autoload:
+
+            async def _lazy_metrics(scope: Dict[str, Any], receive: Any, send: Any) -> None:
+                """Import the finance agent's metrics app on the first scrape."""
+                global _metrics_app
+                if _metrics_app is None:
+                    try:
+                        from .agents.finance_agent import metrics_asgi_app
+
+                        _metrics_app = metrics_asgi_app()
+                    except Exception:  # pragma: no cover
+                        _LOG.debug("Prometheus metrics endpoint not active.")
+                        await send({"type": "http.response.start", "status": 404, "headers": []})
+                        await send({"type": "http.response.body", "body": b""})
+                        return
+                await _metrics_app(scope, receive, send)
+
+            fast_app.mount(f"{API_PREFIX}/metrics", _lazy_metrics)
+
+        # Export the ASGI application expected by uvicorn & gunicorn
+        return fast_app
+
+    # ─────────────────────── zero-dependency HTTP fallback ────────────────────
+    except ModuleNotFoundError:  # pragma: no cover
+
+        async def app(
+            scope: Dict[str, Any],
+            receive: Callable[..., Awaitable[Any]],
+            send: Callable[..., Awaitable[Any]],
+        ) -> None:  # type: ignore  # noqa: D401, N802
+            """Tiny HTTP-only ASGI app used when FastAPI is not installed."""
+            if scope["type"] != "http":  # only handle plain HTTP
+                return
+
+            path = scope.get("path", "/")
+
+            if path == f"{API_PREFIX}/logs":
+                body = json.dumps(_read_logs()).encode()
+                ctype = b"application/json"
+            else:
+                body = b"Alpha-Factory online"
+                ctype = b"text/plain"
+
+            headers = [(b"content-type", ctype)]
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        return app
@@ -15,8 +15,8 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
-from backend.agents.manufacturing_agent import ManufacturingAgent
-from backend.agents.biotech_agent import BiotechAgent
+from alpha_factory_v1.backend.agents.manufacturing_agent import ManufacturingAgent
+from alpha_factory_v1.backend.agents.biotech_agent import BiotechAgent
 from backend.governance import decision_span
 
 # ─── Optional ADK import (keeps ci green when adk not installed) ──────────
@@ -6,6 +6,6 @@ This module simply re-exports that class so legacy imports continue to
 work without modification.
 """
 
-from backend.agents.base import AgentBase
+from alpha_factory_v1.backend.agents.base import AgentBase
 
 __all__ = ["AgentBase"]
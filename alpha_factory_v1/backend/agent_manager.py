@@ -16,6 +16,17 @@ from typing import Dict, Optional
 from .agent_runner import AgentRunner, EventBus, hb_watch, regression_guard
 
 
+def _health_module() -> object:
+    """Return the module providing the health monitor hooks."""
+    agents_mod = sys.modules.get("backend.agents")
+    if agents_mod is not None and not hasattr(agents_mod, "__path__"):
+        return agents_mod  # a stubbed agents package supplies its own hooks
+    health_mod = sys.modules.get("backend.agents.health")
+    if health_mod is None:
+        from alpha_factory_v1.backend.agents import health as health_mod
+    return health_mod
+
+
 class AgentManager:
     """Manage a collection of :class:`AgentRunner` instances."""
 
@@ -29,7 +40,7 @@ class AgentManager:
             return registry_mod.list_agents
         if agents_mod is not None and hasattr(agents_mod, "list_agents"):
             return agents_mod.list_agents
-        from backend.agents.registry import list_agents
+        from alpha_factory_v1.backend.agents.registry import list_agents
 
         return list_agents
 
@@ -60,11 +71,8 @@ class AgentManager:
 
     async def start(self) -> None:
         """Launch heartbeat and regression guard tasks."""
-        health_mod = sys.modules.get("backend.agents.health")
-        agents_mod = sys.modules.get("backend.agents")
-        if health_mod is None and not (agents_mod is not None and not hasattr(agents_mod, "__path__")):
-            from backend.agents import health as health_mod
-        start_background_tasks = getattr(health_mod, "start_background_tasks", None) if health_mod else None
+        health_mod = _health_module()
+        start_background_tasks = getattr(health_mod, "start_background_tasks", None)
         if start_background_tasks is not None:
             await start_background_tasks()
 
@@ -89,11 +97,8 @@ class AgentManager:
         """Cancel helper tasks and wait for agent cycles to finish."""
 
         await self.bus.stop_consumer()
-        health_mod = sys.modules.get("backend.agents.health")
-        agents_mod = sys.modules.get("backend.agents")
-        if health_mod is None and not (agents_mod is not None and not hasattr(agents_mod, "__path__")):
-            from backend.agents import health as health_mod
-        stop_background_tasks = getattr(health_mod, "stop_background_tasks", None) if health_mod else None
+        health_mod = _health_module()
+        stop_background_tasks = getattr(health_mod, "stop_background_tasks", None)
         if stop_background_tasks is not None:
             await stop_background_tasks()
         if self._hb_task:
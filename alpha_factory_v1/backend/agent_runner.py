@@ -166,7 +166,7 @@ class AgentRunner:
             return registry_mod.get_agent
         if agents_mod is not None and hasattr(agents_mod, "get_agent"):
             return agents_mod.get_agent
-        from backend.agents.registry import get_agent
+        from alpha_factory_v1.backend.agents.registry import get_agent
 
         return get_agent
 
@@ -237,7 +237,7 @@ class AgentRunner:
                     self.last_beat = time.time()
                     self._publish("agent.cycle", {"agent": self.name, "latency_ms": dur_ms, "ts": utc_now()})
                     try:
-                        from backend.agents import health as health_mod
+                        from alpha_factory_v1.backend.agents import health as health_mod
 
                         health_task = getattr(health_mod, "_health_task", None)
                         if health_task is None or health_task.done():
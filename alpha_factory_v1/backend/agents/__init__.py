@@ -2,6 +2,10 @@
 """Agent discovery, health monitoring and registry."""
 from __future__ import annotations
 
+from .. import _share_legacy_name
+
+_share_legacy_name("agents")
+
 from .registry import (
     AGENT_REGISTRY,
     CAPABILITY_GRAPH,
@@ -43,6 +47,7 @@ from .plugins import verify_wheel as _verify_wheel
 
 # Perform initial discovery on import
 run_discovery_once()
+_share_legacy_name("agents")  # legacy ``backend.agents.<module>`` names for the modules loaded above
 
 logger.info(
     "\U0001f680 Agent registry ready \u2013 %3d agents, %3d distinct capabilities",
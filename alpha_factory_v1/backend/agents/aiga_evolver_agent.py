@@ -14,7 +14,7 @@ import logging
 logger = logging.getLogger(__name__)
 import asyncio
 
-from backend.agents.registry import register, _agent_base
+from alpha_factory_v1.backend.agents.registry import register, _agent_base
 from backend.orchestrator import _publish
 
 try:
@@ -56,12 +56,12 @@ from typing import Any, List, Mapping, MutableMapping, Optional
 # ░░░ 2. Optional, best-effort 3rd-party imports ░░░
 # ───────────────────────────────────────────────────────────────────────────────
 try:  # -- Prometheus metrics
-    from backend.agents.registry import Counter, Gauge  # type: ignore
+    from alpha_factory_v1.backend.agents.registry import Counter, Gauge  # type: ignore
 except Exception:  # pragma: no cover
     logging.getLogger(__name__).warning("prometheus_client missing – metrics disabled")
     Counter = Gauge = None  # type: ignore
 
-from backend.agents.registry import register
+from alpha_factory_v1.backend.agents.registry import register
 
 try:  # -- Kafka producer for heart-beats
     from kafka import KafkaProducer  # type: ignore
@@ -123,8 +123,8 @@ except Exception:  # pragma: no cover - optional
 # ────────────────────────────────────────────────────────────────────────────────
 # Alpha‑Factory locals (NO heavy deps)
 # ────────────────────────────────────────────────────────────────────────────────
-from backend.agents.base import AgentBase  # pylint: disable=import-error
-from backend.agents import register
+from alpha_factory_v1.backend.agents.base import AgentBase  # pylint: disable=import-error
+from alpha_factory_v1.backend.agents import register
 from backend.orchestrator import _publish  # re‑use event bus
 from alpha_factory_v1.utils.env import _env_int
 
@@ -124,8 +124,8 @@ except ModuleNotFoundError:  # pragma: no cover
 # ---------------------------------------------------------------------------
 # Alpha‑Factory locals (no heavy deps)
 # ---------------------------------------------------------------------------
-from backend.agents.base import AgentBase  # pylint: disable=import‑error
-from backend.agents import register
+from alpha_factory_v1.backend.agents.base import AgentBase  # pylint: disable=import‑error
+from alpha_factory_v1.backend.agents import register
 from backend.orchestrator import _publish  # reuse orchestrator event bus
 from alpha_factory_v1.utils.env import _env_int
 
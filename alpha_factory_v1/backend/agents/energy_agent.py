@@ -122,8 +122,8 @@ except Exception:  # pragma: no cover - optional
 # ---------------------------------------------------------------------------
 # Alpha-Factory core imports (lightweight, always available)
 # ---------------------------------------------------------------------------
-from backend.agents.base import AgentBase  # pylint: disable=import-error
-from backend.agents import register
+from alpha_factory_v1.backend.agents.base import AgentBase  # pylint: disable=import-error
+from alpha_factory_v1.backend.agents import register
 from backend.orchestrator import _publish  # reuse event-bus helper
 from alpha_factory_v1.utils.env import _env_int
 
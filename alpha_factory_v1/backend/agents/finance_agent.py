@@ -52,7 +52,7 @@ try:
 except ModuleNotFoundError:
     _log.warning("scipy.special.erfcinv unavailable")
 try:
-    from backend.agents.registry import Gauge  # type: ignore
+    from alpha_factory_v1.backend.agents.registry import Gauge  # type: ignore
     from prometheus_client import make_asgi_app  # type: ignore
 except Exception:
     _log.warning("prometheus_client missing – metrics disabled")
@@ -113,7 +113,7 @@ if "tool" not in globals():  # offline stub
 
 # ─────────────────────── α-Factory imports ─────────────────────
 from backend.agent_base import AgentBase  # type: ignore
-from backend.agents import register  # type: ignore
+from alpha_factory_v1.backend.agents import register  # type: ignore
 from backend.orchestrator import _publish  # type: ignore
 from .. import risk
 from ..model_provider import ModelProvider
@@ -69,7 +69,7 @@ except ModuleNotFoundError:  # pragma: no cover
     np = None  # type: ignore
 
 try:
-    from backend.agents.registry import Gauge  # type: ignore
+    from alpha_factory_v1.backend.agents.registry import Gauge  # type: ignore
 except Exception:  # pragma: no cover
     logger.warning("prometheus-client missing – metrics disabled")
     Gauge = None  # type: ignore
@@ -113,7 +113,7 @@ except Exception:  # pragma: no cover - optional
 # ---------------------------------------------------------------------------
 from backend.trace_ws import hub  # pylint: disable=import-error
 from backend.agent_base import AgentBase  # pylint: disable=import-error
-from backend.agents import register  # pylint: disable=import-error
+from alpha_factory_v1.backend.agents import register  # pylint: disable=import-error
 from backend.orchestrator import _publish  # pylint: disable=import-error
 from alpha_factory_v1.utils.env import _env_int
 
@@ -97,7 +97,7 @@ except ModuleNotFoundError:  # pragma: no cover
     KafkaProducer = None  # type: ignore
 
 try:
-    from backend.agents.registry import Counter  # type: ignore
+    from alpha_factory_v1.backend.agents.registry import Counter  # type: ignore
 except Exception:  # pragma: no cover
     logger.warning("prometheus-client missing – metrics disabled")
     Counter = None  # type: ignore
@@ -129,7 +129,7 @@ except ModuleNotFoundError:  # pragma: no cover
 # Alpha‑Factory internals
 # ────────────────────────────────────────────────────────────────────────────
 from backend.agent_base import AgentBase  # type: ignore
-from backend.agents import register  # type: ignore
+from alpha_factory_v1.backend.agents import register  # type: ignore
 
 logger = logging.getLogger(__name__)
 
@@ -239,7 +239,7 @@ def _agent_base():
     """Return the canonical AgentBase implementation."""
 
     try:
-        from backend.agents.base import AgentBase  # type: ignore
+        from alpha_factory_v1.backend.agents.base import AgentBase  # type: ignore
 
         return AgentBase
     except ModuleNotFoundError:  # pragma: no cover - legacy only
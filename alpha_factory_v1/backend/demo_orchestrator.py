@@ -6,14 +6,16 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import time
-from typing import Callable, Dict, List
+from typing import TYPE_CHECKING, Callable, Dict, List
 
 import alpha_factory_v1.core.utils.a2a_pb2 as pb
 
-from .orchestrator_utils import AgentRunner, handle_heartbeat, monitor_agents
-from alpha_factory_v1.core.archive.service import ArchiveService
-from alpha_factory_v1.core.archive.solution_archive import SolutionArchive
-from alpha_factory_v1.core.governance.stake_registry import StakeRegistry
+from .orchestrator_utils import AgentRunner, LivenessTable, handle_heartbeat, monitor_agents
+
+if TYPE_CHECKING:  # pragma: no cover - type hints only
+    from alpha_factory_v1.core.archive.service import ArchiveService
+    from alpha_factory_v1.core.archive.solution_archive import SolutionArchive
+    from alpha_factory_v1.core.governance.stake_registry import StakeRegistry
 
 
 class DemoOrchestrator:
@@ -31,6 +33,9 @@ class DemoOrchestrator:
         err_threshold: int = 3,
         backoff_exp_after: int = 3,
         promotion_threshold: float = 0.0,
+        cpu_budget: float = 1.0,
+        coalesce: float = 0.0,
+        heartbeat_snapshot: float = 0.0,
     ) -> None:
         self.bus = bus
         self.ledger = ledger
@@ -39,16 +44,21 @@ class DemoOrchestrator:
         self.registry = registry
         self.island_backends = dict(island_backends)
         self.runners: Dict[str, AgentRunner] = {}
+        self.liveness = LivenessTable()
         self.island_pops: Dict[str, object] = {}
         self.experiment_pops: Dict[str, Dict[str, object]] = {"default": self.island_pops}
         self._err_threshold = err_threshold
         self._backoff_exp_after = backoff_exp_after
         self._promotion_threshold = promotion_threshold
+        self._cpu_budget = cpu_budget
+        self._coalesce = coalesce
+        self._heartbeat_snapshot = heartbeat_snapshot
         self.bus.subscribe("orch", lambda env: handle_heartbeat(self.runners, env))
         self._monitor_task: asyncio.Task[None] | None = None
+        self._liveness_task: asyncio.Task[None] | None = None
 
     def add_agent(self, agent: object) -> None:
-        runner = AgentRunner(agent)
+        runner = AgentRunner(agent, cpu_budget=self._cpu_budget, coalesce=self._coalesce, liveness=self.liveness)
         self.runners[agent.name] = runner
         self._register(runner)
 
@@ -122,14 +132,19 @@ class DemoOrchestrator:
                 on_restart=self._record_restart,
             )
         )
+        if self._heartbeat_snapshot > 0:
+            self._liveness_task = asyncio.create_task(
+                self.liveness.snapshot_loop(self.ledger, self._heartbeat_snapshot)
+            )
         try:
             while True:
                 await asyncio.sleep(0.5)
         finally:
-            if self._monitor_task:
-                self._monitor_task.cancel()
-                with contextlib.suppress(asyncio.CancelledError):
-                    await self._monitor_task
+            for task in (self._monitor_task, self._liveness_task):
+                if task:
+                    task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await task
             for r in self.runners.values():
                 if r.task:
                     r.task.cancel()
@@ -0,0 +1,8 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Legacy ``backend.finance_agent`` path for :mod:`alpha_factory_v1.backend.agents.finance_agent`."""
+
+import sys
+
+from alpha_factory_v1.backend.agents import finance_agent as _finance_agent
+
+sys.modules[__name__] = _finance_agent
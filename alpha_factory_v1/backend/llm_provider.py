@@ -15,6 +15,10 @@ Unified Large-Language-Model facade for Alpha-Factory v1
 • Streaming or blocking replies, plus provider-agnostic embeddings with
   automatic SBERT/hashing fallback if OpenAI errors.
 
+• Cloud replies share the response cache of :mod:`.utils.llm_cache`, keyed
+  by provider, model and sampling parameters; cached streams are replayed
+  chunk by chunk.
+
 Usage
 ~~~~~
 >>> from backend.llm_provider import chat
@@ -39,6 +43,7 @@ from typing import (
 )
 
 from .mcp_bridge import store as _mcp_store_async
+from .utils import llm_cache
 
 __all__ = ["chat", "embed"]
 
@@ -84,6 +89,13 @@ def _provider() -> str:
     return "local"
 
 
+def _model(provider: str) -> str:
+    """Model name used for ``provider``."""
+    if provider == "openai":
+        return os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    return os.getenv("ANTHROPIC_MODEL", "claude-3-opus-20240229")
+
+
 def _note(model: str) -> None:
     _LOG.info("🔮  LLM call | provider=%s | model=%s", _provider(), model)
 
@@ -156,6 +168,7 @@ async def chat(
     stream: bool = False,
     temperature: float = _DEFAULT_TEMP,
     max_tokens: int = 1024,
+    cache: bool = True,
 ) -> Union[str, AsyncGenerator[str, None]]:
     """
     Provider-agnostic chat endpoint.
@@ -166,6 +179,10 @@ async def chat(
         Either a plain user string or a list of OpenAI-style chat messages.
     stream
         When *True* an async generator yielding tokens is returned.
+    cache
+        Serve and store cloud replies through :mod:`.utils.llm_cache`. Entries
+        are keyed by provider, model, ``temperature`` and ``max_tokens`` as
+        well as the messages. The offline heuristic is never cached.
     """
     # Normalise input --------------------------------------------------- #
     if isinstance(prompt_or_messages, str):
@@ -178,11 +195,35 @@ async def chat(
 
     # Dispatch to chosen provider -------------------------------------- #
     prov = _provider()
-    if prov == "openai":
-        return await _chat_openai(messages, stream, temperature, max_tokens)
-    if prov == "anthropic":
-        return await _chat_anthropic(messages, stream, temperature, max_tokens)
-    return await _chat_local(messages, stream)
+    if prov == "local":
+        return await _chat_local(messages, stream)
+
+    key = (
+        llm_cache.cache_key(
+            messages,
+            provider=prov,
+            model=_model(prov),
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        if cache
+        else None
+    )
+    if key is not None:
+        if stream:
+            chunks = await asyncio.to_thread(llm_cache.cached_chunks, key)
+            if chunks is not None:
+                return llm_cache.areplay(chunks)
+        elif (hit := await asyncio.to_thread(llm_cache.cache_get, key)) is not None:
+            return hit
+
+    impl = _chat_openai if prov == "openai" else _chat_anthropic
+    out = await impl(messages, stream, temperature, max_tokens)
+    if key is not None:
+        if stream:
+            return llm_cache.atee_stream(out, key, prov)  # type: ignore[arg-type]
+        await asyncio.to_thread(llm_cache.cache_put, key, out, prov)  # type: ignore[arg-type]
+    return out
 
 
 # --------------------------------------------------------------------- #
@@ -195,7 +236,7 @@ async def _chat_openai(
     max_tokens: int,
 ) -> Union[str, AsyncGenerator[str, None]]:
     assert openai and _OPENAI_KEY  # Sanity – guaranteed by _provider
-    model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    model = _model("openai")
     _note(model)
 
     openai.api_key = _OPENAI_KEY
@@ -233,7 +274,7 @@ async def _chat_anthropic(
     max_tokens: int,
 ) -> Union[str, AsyncGenerator[str, None]]:
     assert anthropic and _ANTHROPIC_KEY
-    model = os.getenv("ANTHROPIC_MODEL", "claude-3-opus-20240229")
+    model = _model("anthropic")
     _note(model)
 
     client = anthropic.AsyncAnthropic(api_key=_ANTHROPIC_KEY, timeout=_TIMEOUT)
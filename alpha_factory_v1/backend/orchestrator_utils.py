@@ -9,31 +9,234 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import heapq
+import itertools
+import logging
 import random
 import time
-from typing import Callable, Dict
+from typing import Any, Callable, Dict, List, Tuple
 
 from google.protobuf import struct_pb2
 
+logger = logging.getLogger(__name__)
+
+
+class _NoopMetric:
+    def labels(self, *_a: Any) -> "_NoopMetric":
+        return self
+
+    def set(self, *_a: Any) -> None: ...
+
+    def inc(self, *_a: Any) -> None: ...
+
+    def observe(self, *_a: Any) -> None: ...
+
+
+def _runner_metrics() -> dict[str, Any]:
+    try:
+        from prometheus_client import Counter, Gauge, Histogram
+        from .metrics_registry import get_metric
+    except Exception:  # pragma: no cover - prometheus optional
+        noop = _NoopMetric()
+        return {"utilisation": noop, "wakeups": noop, "throttled": noop, "restart": noop}
+    return {
+        "utilisation": get_metric(
+            Gauge, "af_agent_utilisation", "Event-loop CPU seconds per second used by the agent", ["agent"]
+        ),
+        "wakeups": get_metric(Counter, "af_agent_wakeups_total", "Agent cycles by wake-up reason", ["agent", "reason"]),
+        "throttled": get_metric(
+            Counter, "af_agent_throttled_seconds_total", "Time an agent was held back by its CPU budget", ["agent"]
+        ),
+        "restart": get_metric(
+            Histogram, "af_agent_restart_seconds", "Time to replace a crashed agent", ["agent", "mode"]
+        ),
+    }
+
+
+class LivenessTable:
+    """In-memory record of agent heartbeats.
+
+    Runners write successful cycles here instead of hashing a heartbeat
+    envelope into the ledger and publishing it on the bus. :meth:`snapshot`
+    condenses the table into one envelope so the ledger can keep a periodic
+    aggregated trace.
+    """
+
+    def __init__(self) -> None:
+        self._beats: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+
+    def beat(self, name: str, ts: float | None = None) -> None:
+        """Record a heartbeat for ``name``."""
+        self._beats[name] = time.time() if ts is None else ts
+        self._counts[name] = self._counts.get(name, 0) + 1
+
+    def set(self, name: str, ts: float) -> None:
+        """Overwrite the last heartbeat of ``name`` without counting a beat."""
+        self._beats[name] = ts
+
+    def last_beat(self, name: str) -> float | None:
+        return self._beats.get(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._beats
+
+    def snapshot(self) -> Any:
+        """Return an envelope summarising every agent's liveness."""
+        import alpha_factory_v1.core.utils.a2a_pb2 as pb
+
+        env = pb.Envelope(sender="orch", recipient="system", ts=time.time())
+        agents = {name: {"last_beat": ts, "beats": self._counts.get(name, 0)} for name, ts in self._beats.items()}
+        env.payload.update({"event": "liveness", "agents": agents})
+        return env
+
+    async def snapshot_loop(self, ledger: object, interval: float) -> None:
+        """Log :meth:`snapshot` to ``ledger`` every ``interval`` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            if self._beats and hasattr(ledger, "log"):
+                try:
+                    ledger.log(self.snapshot())
+                except Exception:  # pragma: no cover - logging optional
+                    pass
+
 
 class AgentRunner:
-    """Wrap a single agent instance and expose lifecycle helpers."""
+    """Wrap a single agent instance and expose lifecycle helpers.
+
+    Cycles are event driven: an envelope published on the agent's topic wakes
+    the runner, and ``period`` (``CYCLE_SECONDS``) only bounds how long an idle
+    agent sleeps. Envelopes arriving within ``coalesce`` seconds of a wake-up
+    share one cycle. ``cpu_budget`` (or the agent's ``CPU_BUDGET``) caps the
+    fraction of event-loop CPU time the agent may use; after a cycle the
+    runner pauses long enough to stay under it. CPU time is measured on the
+    event-loop thread, so work other coroutines do while a cycle awaits is
+    included and the budget errs on the strict side.
+
+    When a :class:`LivenessTable` is supplied, successful cycles only update
+    it and ``last_beat`` reads from it. Without one every cycle logs and
+    publishes a heartbeat envelope on ``"orch"``.
+
+    :meth:`restart` hands the old agent's ``snapshot()`` to ``cls.restore``
+    when both exist, so the replacement keeps its in-memory state and LLM
+    handles. A restart that follows another without a successful cycle in
+    between cold starts the agent in case the carried state caused the crash.
+    """
 
-    def __init__(self, agent: object) -> None:
+    UTILISATION_WINDOW = 5.0
+
+    def __init__(
+        self,
+        agent: object,
+        *,
+        cpu_budget: float = 1.0,
+        coalesce: float = 0.0,
+        liveness: LivenessTable | None = None,
+    ) -> None:
         self.cls: Callable[..., object] = type(agent)
         self.agent = agent
+        self.liveness = liveness
+        self._last_beat = 0.0
         self.period = getattr(agent, "CYCLE_SECONDS", 1.0)
         self.capabilities = getattr(agent, "CAPABILITIES", [])
+        self.cpu_budget = float(getattr(agent, "CPU_BUDGET", cpu_budget))
+        if not 0.0 < self.cpu_budget <= 1.0:
+            raise ValueError(f"cpu_budget must be in (0, 1], got {self.cpu_budget}")
+        self.coalesce = coalesce
+        self.utilisation = 0.0
         self.last_beat = time.time()
         self.restarts = 0
         self.task: asyncio.Task[None] | None = None
         self.error_count = 0
         self.restart_streak = 0
+        self.last_restart_seconds = 0.0
+        self._wake: asyncio.Event | None = None
+        self._window_start = time.perf_counter()
+        self._window_cpu = 0.0
+        self._metrics = _runner_metrics()
+
+    @property
+    def last_beat(self) -> float:
+        if self.liveness is not None:
+            ts = self.liveness.last_beat(self.agent.name)
+            if ts is not None:
+                return ts
+        return self._last_beat
+
+    @last_beat.setter
+    def last_beat(self, ts: float) -> None:
+        self._last_beat = ts
+        if self.liveness is not None:
+            self.liveness.set(self.agent.name, ts)
+
+    def _heartbeat(self, bus: object, ledger: object) -> None:
+        if self.liveness is not None:
+            self.liveness.beat(self.agent.name)
+            return
+        env = struct_pb2.Struct()
+        env.update({"heartbeat": True})
+        if hasattr(ledger, "log"):
+            try:
+                ledger.log(env)
+            except Exception:  # pragma: no cover - logging optional
+                pass
+        if hasattr(bus, "publish"):
+            try:
+                bus.publish("orch", env)
+            except Exception:  # pragma: no cover - publish optional
+                pass
+        self.last_beat = time.time()
+
+    def wake(self, _env: object = None) -> None:
+        """Schedule the next cycle as soon as the CPU budget allows."""
+        if self._wake is not None:
+            self._wake.set()
+
+    def _account(self, cpu: float) -> None:
+        self._window_cpu += cpu
+        now = time.perf_counter()
+        elapsed = now - self._window_start
+        if elapsed >= self.UTILISATION_WINDOW:
+            self.utilisation = self._window_cpu / elapsed
+            self._metrics["utilisation"].labels(self.agent.name).set(self.utilisation)
+            self._window_start = now
+            self._window_cpu = 0.0
+
+    async def _idle(self, cpu: float) -> None:
+        assert self._wake is not None
+        pause = cpu * (1.0 / self.cpu_budget - 1.0)
+        if pause > 0:
+            self._metrics["throttled"].labels(self.agent.name).inc(pause)
+            await asyncio.sleep(pause)
+        timeout = max(self.period - pause, 0.0)
+        if timeout > 0 and not self._wake.is_set():
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), timeout)
+        else:
+            await asyncio.sleep(0)  # always yield to the loop between cycles
+        reason = "message" if self._wake.is_set() else "timeout"
+        if reason == "message" and self.coalesce > 0:
+            await asyncio.sleep(self.coalesce)
+        self._wake.clear()
+        self._metrics["wakeups"].labels(self.agent.name, reason).inc()
 
     async def loop(self, bus: object, ledger: object) -> None:
-        """Run the agent cycle indefinitely."""
+        """Run the agent cycle whenever it is woken or idle for ``period``."""
+        self._wake = asyncio.Event()
+        topic = getattr(self.agent, "name", None)
+        subscribed = isinstance(topic, str) and hasattr(bus, "subscribe")
+        if subscribed:
+            bus.subscribe(topic, self.wake)
+        try:
+            await self._run(bus, ledger)
+        finally:
+            if subscribed and hasattr(bus, "unsubscribe"):
+                bus.unsubscribe(topic, self.wake)
+
+    async def _run(self, bus: object, ledger: object) -> None:
         while True:
             start = time.perf_counter()
+            cpu_start = time.thread_time()
             try:
                 await self.agent.run_cycle()
             except asyncio.CancelledError:
@@ -48,47 +251,184 @@ class AgentRunner:
             else:
                 self.error_count = 0
                 self.restart_streak = 0
-                env = struct_pb2.Struct()
-                env.update({"heartbeat": True})
-                if hasattr(ledger, "log"):
-                    try:
-                        ledger.log(env)
-                    except Exception:  # pragma: no cover - logging optional
-                        pass
-                if hasattr(bus, "publish"):
-                    try:
-                        bus.publish("orch", env)
-                    except Exception:  # pragma: no cover - publish optional
-                        pass
-                self.last_beat = time.time()
+                self._heartbeat(bus, ledger)
             finally:
                 if hasattr(bus, "metrics"):
                     try:
                         bus.metrics.observe(time.perf_counter() - start)
                     except Exception:  # pragma: no cover - metrics optional
                         pass
-            await asyncio.sleep(self.period)
+            cpu = time.thread_time() - cpu_start
+            self._account(cpu)
+            await self._idle(cpu)
 
     def start(self, bus: object, ledger: object) -> None:
         self.task = asyncio.create_task(self.loop(bus, ledger))
 
+    def _snapshot(self) -> Any:
+        snapshot = getattr(self.agent, "snapshot", None)
+        if snapshot is None:
+            return None
+        try:
+            return snapshot()
+        except Exception:  # noqa: BLE001 - fall back to a cold start
+            logger.exception("snapshot of %s failed", self.agent.name)
+            return None
+
+    def _replace(self, bus: object, ledger: object, state: Any) -> Tuple[object, str]:
+        restore = getattr(self.cls, "restore", None)
+        if state is not None and restore is not None:
+            try:
+                return restore(bus, ledger, state), "warm"
+            except Exception:  # noqa: BLE001 - fall back to a cold start
+                logger.exception("restoring %s failed", self.agent.name)
+        return self.cls(bus, ledger), "cold"
+
     async def restart(self, bus: object, ledger: object) -> None:
         if self.task:
             self.task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await self.task
+        start = time.perf_counter()
+        state = self._snapshot() if self.restart_streak == 0 else None
         try:
             close = getattr(self.agent, "close")
         except AttributeError:
             pass
         else:
             close()
-        self.agent = self.cls(bus, ledger)
+        self.agent, mode = self._replace(bus, ledger, state)
+        self.last_restart_seconds = time.perf_counter() - start
+        self._metrics["restart"].labels(self.agent.name, mode).observe(self.last_restart_seconds)
         self.restarts += 1
         self.restart_streak += 1
         self.start(bus, ledger)
 
 
+class Supervisor:
+    """Restart crashed or stalled agents, each on its own schedule.
+
+    Every runner has a deadline in a heap: it is checked once per ``period``
+    for errors and exactly when its heartbeat would go stale, and immediately
+    when its task finishes. Restarts run as separate tasks, so one agent's
+    exponential backoff never delays the checks or restarts of the others.
+    Runners added to ``runners`` later are picked up within ``MAX_WAIT``.
+    """
+
+    MIN_INTERVAL = 0.05
+    MAX_WAIT = 1.0
+
+    def __init__(
+        self,
+        runners: Dict[str, AgentRunner],
+        bus: object,
+        ledger: object,
+        *,
+        err_threshold: int = 3,
+        backoff_exp_after: int = 3,
+        on_restart: Callable[[AgentRunner], None] | None = None,
+        log: logging.Logger | None = None,
+    ) -> None:
+        self.runners = runners
+        self.bus = bus
+        self.ledger = ledger
+        self.err_threshold = err_threshold
+        self.backoff_exp_after = backoff_exp_after
+        self.on_restart = on_restart
+        self.log = log or logger
+        self._heap: List[Tuple[float, int, str]] = []
+        self._next: Dict[str, float] = {}
+        self._seq = itertools.count()
+        self._known: set[str] = set()
+        self._hooked: Dict[str, object] = {}
+        self._restarting: Dict[str, asyncio.Task[None]] = {}
+        self._restarted_at: Dict[str, float] = {}
+        self._kick: asyncio.Event | None = None
+
+    def _schedule(self, name: str, when: float) -> None:
+        if self._next.get(name, float("inf")) <= when:
+            return
+        self._next[name] = when
+        heapq.heappush(self._heap, (when, next(self._seq), name))
+
+    def _due(self, name: str) -> None:
+        if self._kick is not None:
+            self._schedule(name, 0.0)
+            self._kick.set()
+
+    def _sync(self) -> None:
+        if len(self.runners) == len(self._known):
+            return
+        now = time.time()
+        for name in self.runners.keys() - self._known:
+            self._schedule(name, now)
+        self._known = set(self.runners)
+
+    def _check(self, name: str, now: float) -> None:
+        runner = self.runners.get(name)
+        if runner is None or name in self._restarting:
+            return
+        task = runner.task
+        if task is not None and self._hooked.get(name) is not task:
+            self._hooked[name] = task
+            task.add_done_callback(lambda _t, n=name: self._due(n))
+        beat = max(runner.last_beat, self._restarted_at.get(name, 0.0))
+        stall = runner.period * 5
+        if (task and task.done()) or runner.error_count >= self.err_threshold or now - beat > stall:
+            self._restarting[name] = asyncio.create_task(self._restart(name, runner))
+            return
+        self._schedule(name, max(now + self.MIN_INTERVAL, min(now + runner.period, beat + stall)))
+
+    async def _restart(self, name: str, runner: AgentRunner) -> None:
+        try:
+            self.log.warning("%s unresponsive – restarting", runner.agent.name)
+            delay = random.uniform(0.5, 1.5)
+            if runner.restart_streak >= self.backoff_exp_after:
+                delay *= 2 ** (runner.restart_streak - self.backoff_exp_after + 1)
+            prior_restarts = runner.restarts
+            await asyncio.sleep(delay)
+            await asyncio.shield(runner.restart(self.bus, self.ledger))
+            if self.on_restart and runner.restarts > prior_restarts:
+                self.on_restart(runner)
+        except Exception:  # noqa: BLE001 - retried on the next deadline
+            self.log.exception("restarting %s failed", name)
+        finally:
+            self._restarting.pop(name, None)
+            self._restarted_at[name] = time.time()
+            if self._kick is not None:
+                self._schedule(name, time.time() + max(runner.period, self.MIN_INTERVAL))
+                self._kick.set()
+
+    async def run(self) -> None:
+        """Supervise ``runners`` until cancelled."""
+        self._kick = asyncio.Event()
+        try:
+            while True:
+                self._sync()
+                now = time.time()
+                while self._heap and self._heap[0][0] <= now:
+                    when, _, name = heapq.heappop(self._heap)
+                    if self._next.get(name) != when:
+                        continue  # superseded by an earlier deadline
+                    del self._next[name]
+                    self._check(name, now)
+                timeout = self.MAX_WAIT
+                if self._heap:
+                    timeout = min(timeout, self._heap[0][0] - now)
+                self._kick.clear()
+                # A timer instead of ``wait_for``: before Python 3.12 the latter
+                # can swallow a cancellation that races with the event being set.
+                timer = asyncio.get_running_loop().call_later(max(timeout, self.MIN_INTERVAL / 10), self._kick.set)
+                try:
+                    await self._kick.wait()
+                finally:
+                    timer.cancel()
+        finally:
+            self._kick = None
+            for task in self._restarting.values():
+                task.cancel()
+
+
 async def monitor_agents(
     runners: Dict[str, AgentRunner],
     bus: object,
@@ -99,25 +439,14 @@ async def monitor_agents(
     on_restart: Callable[[AgentRunner], None] | None = None,
 ) -> None:
     """Restart crashed or stalled agents and apply exponential backoff."""
-    while True:
-        await asyncio.sleep(2)
-        now = time.time()
-        for r in list(runners.values()):
-            needs_restart = False
-            if r.task and r.task.done():
-                needs_restart = True
-            elif r.error_count >= err_threshold:
-                needs_restart = True
-            elif now - r.last_beat > r.period * 5:
-                needs_restart = True
-            if needs_restart:
-                delay = random.uniform(0.5, 1.5)
-                if r.restart_streak >= backoff_exp_after:
-                    delay *= 2 ** (r.restart_streak - backoff_exp_after + 1)
-                await asyncio.sleep(delay)
-                await r.restart(bus, ledger)
-                if on_restart:
-                    on_restart(r)
+    await Supervisor(
+        runners,
+        bus,
+        ledger,
+        err_threshold=err_threshold,
+        backoff_exp_after=backoff_exp_after,
+        on_restart=on_restart,
+    ).run()
 
 
 def handle_heartbeat(runners: Dict[str, AgentRunner], env: object) -> None:
@@ -131,4 +460,4 @@ def handle_heartbeat(runners: Dict[str, AgentRunner], env: object) -> None:
             r.restart_streak = 0
 
 
-__all__ = ["AgentRunner", "monitor_agents", "handle_heartbeat"]
+__all__ = ["AgentRunner", "LivenessTable", "Supervisor", "monitor_agents", "handle_heartbeat"]
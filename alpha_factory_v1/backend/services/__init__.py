@@ -3,6 +3,12 @@
 
 __all__ = ["APIServer", "KafkaService", "MetricsExporter"]
 
+from .. import _share_legacy_name
+
+_share_legacy_name("services")
+
 from .api_server_service import APIServer
 from .kafka_service import KafkaService
 from .metrics_service import MetricsExporter
+
+_share_legacy_name("services")
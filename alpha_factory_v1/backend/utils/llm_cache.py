@@ -0,0 +1,546 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+alpha_factory_v1.backend.utils.llm_cache
+========================================
+
+Two-tier LLM response cache shared by :mod:`..utils.llm_provider` and
+:mod:`alpha_factory_v1.backend.llm_provider`: a lock-striped in-memory LRU in
+front of a size-bounded SQLite table. Keys are :func:`cache_key` of the chat
+messages.
+
+Streamed completions are cached as their list of chunks under a separate key:
+:func:`tee_stream` / :func:`atee_stream` pass chunks through and store them
+once the stream completes, and :func:`cached_chunks` plus :func:`replay` /
+:func:`areplay` play a hit back with the original chunking. A completed
+stream also fills the plain entry, so blocking callers hit it too.
+
+An opt-in semantic tier (:func:`semantic_tier`) matches near-duplicate
+prompts by embedding similarity and serves the neighbour's exact entry.
+"""
+from __future__ import annotations
+
+import collections
+import functools
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, AsyncIterable, Callable, Dict, Generator, Iterable, List, Sequence
+
+from alpha_factory_v1.backend import metrics_registry
+
+__all__ = [
+    "cache_get",
+    "cache_put",
+    "cache_key",
+    "cached_chunks",
+    "replay",
+    "areplay",
+    "tee_stream",
+    "atee_stream",
+    "semantic_tier",
+    "semantic_hit_rate",
+]
+
+_HAS_PROM = False
+try:
+    from prometheus_client import Counter, Gauge  # type: ignore
+
+    _HAS_PROM = True
+except Exception:
+    pass
+
+_log = logging.getLogger("alpha_factory.llm_provider")
+
+
+class _N:
+    def labels(self, *_, **__):
+        return self
+
+    def inc(self, *_, **__):
+        ...
+
+    def set(self, *_, **__):
+        ...
+
+
+# ───────────────────────── cache ───────────────────────────
+_TTL = int(os.getenv("AF_LLM_CACHE_TTL", "86400"))  # 1 day default
+_CACHE_SIZE = int(os.getenv("AF_LLM_CACHE_SIZE", "1024"))  # in-memory entries
+_CACHE_SHARDS = int(os.getenv("AF_LLM_CACHE_SHARDS", "16"))  # lock stripes
+_DISK_BYTES = int(os.getenv("AF_LLM_CACHE_MAX_BYTES", str(256 * 2**20)))  # disk budget
+_COMPACT_SECS = float(os.getenv("AF_LLM_CACHE_COMPACT_SECS", "300"))
+_ZSTD = os.getenv("AF_LLM_CACHE_ZSTD", "").lower() in {"1", "true", "yes"}
+
+_db_path = pathlib.Path(os.getenv("AF_LLM_CACHE_PATH", pathlib.Path.home() / ".cache" / "alpha_factory_llm.sqlite"))
+
+if _HAS_PROM:
+    _CNT_CACHE = metrics_registry.get_metric(
+        Counter,
+        "af_llm_cache_events_total",
+        "LLM cache hits, misses and evictions",
+        ["tier", "event"],
+    )
+    _GAUGE_DISK = metrics_registry.get_metric(Gauge, "af_llm_cache_disk_bytes", "LLM disk-cache payload size")
+else:
+    _CNT_CACHE = _GAUGE_DISK = _N()  # type: ignore
+
+_stats_lock = threading.Lock()
+_cache_stats: collections.Counter[tuple[str, str]] = collections.Counter()
+
+
+def _cache_event(tier: str, event: str, n: int = 1) -> None:
+    with _stats_lock:
+        _cache_stats[(tier, event)] += n
+    _CNT_CACHE.labels(tier, event).inc(n)
+
+
+class _MemTier:
+    """Lock-striped LRU: keys hash onto ``shards`` ordered dicts with their own lock."""
+
+    def __init__(self, size: int, shards: int = _CACHE_SHARDS) -> None:
+        self.shards = max(1, min(shards, size or 1))
+        self.cap = max(1, -(-size // self.shards))  # per shard, rounded up
+        self._maps: List[OrderedDict[str, tuple[float, str]]] = [OrderedDict() for _ in range(self.shards)]
+        self._locks = [threading.Lock() for _ in range(self.shards)]
+
+    def _shard(self, h: str) -> int:
+        return hash(h) % self.shards
+
+    def get(self, h: str) -> str | None:
+        i = self._shard(h)
+        with self._locks[i]:
+            m = self._maps[i]
+            v = m.get(h)
+            if v is None:
+                return None
+            if time.time() - v[0] < _TTL:
+                m.move_to_end(h)
+                return v[1]
+            del m[h]
+        _cache_event("mem", "expired")
+        return None
+
+    def put(self, h: str, out: str) -> None:
+        i = self._shard(h)
+        evicted = 0
+        with self._locks[i]:
+            m = self._maps[i]
+            m[h] = (time.time(), out)
+            m.move_to_end(h)
+            while len(m) > self.cap:
+                m.popitem(last=False)
+                evicted += 1
+        if evicted:
+            _cache_event("mem", "eviction", evicted)
+
+    def __len__(self) -> int:
+        return sum(len(m) for m in self._maps)
+
+    def __contains__(self, h: object) -> bool:
+        return isinstance(h, str) and h in self._maps[self._shard(h)]
+
+
+class _DiskTier:
+    """SQLite tier with one connection per thread and a byte budget.
+
+    A daemon thread deletes expired rows every ``compact_secs`` and, once the
+    payload exceeds ``max_bytes``, the oldest rows until it is back under 90 %
+    of the budget. Values are zstd-compressed when ``compress`` is set and
+    ``zstandard`` is installed.
+    """
+
+    def __init__(self, path: pathlib.Path, *, max_bytes: int, compact_secs: float, compress: bool) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compact_secs = compact_secs
+        self._zc = self._zd = None
+        if compress:
+            try:
+                import zstandard  # type: ignore
+
+                self._zc, self._zd = zstandard.ZstdCompressor(level=3), zstandard.ZstdDecompressor()
+            except Exception:  # pragma: no cover - optional dependency
+                _log.warning("zstandard not installed – disk cache stays uncompressed")
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        db = self._conn()
+        with db:
+            db.execute(
+                """CREATE TABLE IF NOT EXISTS cache
+                       (h TEXT PRIMARY KEY, ts REAL, out TEXT, provider TEXT)"""
+            )
+            if "size" not in {row[1] for row in db.execute("PRAGMA table_info(cache)")}:
+                db.execute("ALTER TABLE cache ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+                db.execute("UPDATE cache SET size = length(CAST(out AS BLOB))")
+            db.execute("CREATE INDEX IF NOT EXISTS cache_ts ON cache(ts)")
+        os.chmod(path, 0o600)
+        self._bytes = self._total()
+        _GAUGE_DISK.set(self._bytes)
+        self._compact_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._compactor, name="llm-cache-compact", daemon=True)
+        self._thread.start()
+
+    def _conn(self) -> sqlite3.Connection:
+        db: sqlite3.Connection | None = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL;")
+            db.execute("PRAGMA synchronous=NORMAL;")
+        return db
+
+    def _total(self) -> int:
+        return int(self._conn().execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0])
+
+    def get(self, h: str) -> str | None:
+        row = self._conn().execute(
+            "SELECT out FROM cache WHERE h=? AND ?-ts<?",
+            (h, time.time(), _TTL),
+        ).fetchone()
+        if row is None:
+            return None
+        out = row[0]
+        if isinstance(out, bytes):
+            if self._zd is None:
+                import zstandard  # type: ignore
+
+                self._zd = zstandard.ZstdDecompressor()
+            out = self._zd.decompress(out).decode()
+        return out
+
+    def put(self, h: str, out: str, prov: str) -> None:
+        blob: str | bytes = self._zc.compress(out.encode()) if self._zc else out
+        size = len(blob) if isinstance(blob, bytes) else len(blob.encode())
+        db = self._conn()
+        with self._compact_lock:
+            with db:
+                old = db.execute("SELECT size FROM cache WHERE h=?", (h,)).fetchone()
+                db.execute(
+                    "INSERT OR REPLACE INTO cache (h, ts, out, provider, size) VALUES (?,?,?,?,?)",
+                    (h, time.time(), blob, prov, size),
+                )
+            self._bytes += size - (old[0] if old else 0)
+            total = self._bytes
+        _GAUGE_DISK.set(total)
+        if total > self.max_bytes:
+            self._wake.set()
+
+    def compact(self) -> int:
+        """Drop expired rows, then the oldest until under budget; return rows removed."""
+        with self._compact_lock:
+            db = self._conn()
+            with db:
+                removed = db.execute("DELETE FROM cache WHERE ?-ts>=?", (time.time(), _TTL)).rowcount
+            _cache_event("disk", "expired", removed)
+            rows = db.execute("SELECT h, size FROM cache ORDER BY ts, rowid").fetchall()
+            total = sum(size for _, size in rows)
+            if total > self.max_bytes:
+                target = int(self.max_bytes * 0.9)
+                evicted = 0
+                with db:
+                    for h, size in rows:
+                        if total <= target:
+                            break
+                        db.execute("DELETE FROM cache WHERE h=?", (h,))
+                        total -= size
+                        evicted += 1
+                _cache_event("disk", "eviction", evicted)
+                removed += evicted
+            self._bytes = total
+        _GAUGE_DISK.set(total)
+        return removed
+
+    def _compactor(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.compact_secs)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.compact()
+            except Exception as exc:  # pragma: no cover - best effort
+                _log.warning("LLM cache compaction failed: %s", exc)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+
+
+def _db_init() -> _DiskTier | None:
+    try:
+        return _DiskTier(_db_path, max_bytes=_DISK_BYTES, compact_secs=_COMPACT_SECS, compress=_ZSTD)
+    except Exception as exc:
+        _log.warning("Disk-cache disabled: %s", exc)
+        return None
+
+
+_cache_mem = _MemTier(_CACHE_SIZE)
+_DB = _db_init()
+
+
+def cache_get(h: str) -> str | None:
+    # in-memory first
+    v = _cache_mem.get(h)
+    if v is not None:
+        _cache_event("mem", "hit")
+        return v
+    _cache_event("mem", "miss")
+    if _DB:
+        try:
+            v = _DB.get(h)
+        except Exception as exc:
+            _log.warning("Disk-cache read failed: %s", exc)
+            v = None
+        if v is not None:
+            _cache_event("disk", "hit")
+            _cache_mem.put(h, v)  # promote
+            return v
+        _cache_event("disk", "miss")
+    return None
+
+
+def cache_put(h: str, out: str, prov: str) -> None:
+    _cache_mem.put(h, out)
+    if _DB:
+        try:
+            _DB.put(h, out, prov)
+        except Exception as exc:
+            _log.warning("Disk-cache write failed: %s", exc)
+
+
+# ───────────────────────── keys ────────────────────────────
+def cache_key(messages: Sequence[Dict[str, str]], **params: Any) -> str:
+    """SHA-256 of the JSON-encoded chat ``messages`` and any request ``params``.
+
+    Without ``params`` the key covers the messages alone, as used by
+    :class:`..llm_provider.LLMProvider`.
+    """
+    payload: Any = {"messages": messages, **params} if params else messages
+    blob = json.dumps(payload, sort_keys=True).encode()
+    return hashlib.sha256(blob).hexdigest()
+
+
+def _stream_key(h: str) -> str:
+    return h + ":stream"
+
+
+# ───────────────────── streamed replies ────────────────────
+def cached_chunks(h: str) -> List[str] | None:
+    """Chunks of a cached reply for ``h``; a blocking reply counts as one chunk."""
+    raw = cache_get(_stream_key(h))
+    if raw is not None:
+        return json.loads(raw)
+    text = cache_get(h)
+    return None if text is None else [text]
+
+
+def _store_chunks(h: str, chunks: List[str], prov: str) -> None:
+    cache_put(_stream_key(h), json.dumps(chunks), prov)
+    cache_put(h, "".join(chunks).strip(), prov)
+
+
+def tee_stream(chunks: Iterable[str], h: str, prov: str) -> Generator[str, None, None]:
+    """Yield ``chunks`` and cache them under ``h`` once the stream is exhausted.
+
+    Streams that fail or are closed early by the consumer are not cached.
+    """
+    seen: List[str] = []
+    for chunk in chunks:
+        seen.append(chunk)
+        yield chunk
+    _store_chunks(h, seen, prov)
+
+
+async def atee_stream(chunks: AsyncIterable[str], h: str, prov: str) -> AsyncGenerator[str, None]:
+    """Async counterpart of :func:`tee_stream`."""
+    seen: List[str] = []
+    async for chunk in chunks:
+        seen.append(chunk)
+        yield chunk
+    _store_chunks(h, seen, prov)
+
+
+def replay(chunks: List[str]) -> Generator[str, None, None]:
+    """Generator over cached ``chunks``, mirroring a live stream."""
+    yield from chunks
+
+
+async def areplay(chunks: List[str]) -> AsyncGenerator[str, None]:
+    """Async generator over cached ``chunks``."""
+    for chunk in chunks:
+        yield chunk
+
+
+# ───────────────────── semantic tier ───────────────────────
+_SEM_THRESHOLD = float(os.getenv("AF_LLM_SEMANTIC_THRESHOLD", "0.95"))  # cosine similarity
+_SEM_SIZE = int(os.getenv("AF_LLM_SEMANTIC_SIZE", "1024"))  # prompts per scope
+_SEM_SCOPES = int(os.getenv("AF_LLM_SEMANTIC_SCOPES", "64"))  # conversation prefixes kept
+
+try:
+    import numpy as _np  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    _np = None
+try:
+    import faiss  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    faiss = None
+
+if _HAS_PROM:
+    _CNT_SEM = metrics_registry.get_metric(
+        Counter,
+        "af_llm_semantic_cache_total",
+        "Semantic LLM cache lookups",
+        ["agent", "result"],
+    )
+else:
+    _CNT_SEM = _N()  # type: ignore
+
+_semantic_stats: collections.Counter[tuple[str, str]] = collections.Counter()
+
+
+def _default_embed(text: str) -> Sequence[float]:
+    from alpha_factory_v1.backend.memory_vector import _embed
+
+    return list(_embed([text])[0])
+
+
+class _VectorIndex:
+    """Inner-product search over L2-normalised vectors, oldest evicted first.
+
+    Uses FAISS when installed, NumPy otherwise and plain Python as a last
+    resort. At capacity the oldest quarter is dropped in one go so eviction
+    stays amortised O(1).
+    """
+
+    def __init__(self, cap: int) -> None:
+        self.cap = max(1, cap)
+        self._keys: List[str] = []
+        self._rows: List[Sequence[float]] = []
+        self._faiss: Any = None
+        self._mat: Any = None  # NumPy matrix of ``_rows`` built on demand
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, vec: Sequence[float], key: str) -> None:
+        if len(self._keys) >= self.cap:
+            drop = max(1, self.cap // 4)
+            del self._keys[:drop], self._rows[:drop]
+            self._faiss = self._mat = None
+        self._keys.append(key)
+        self._rows.append(vec)
+        if self._faiss is not None:
+            self._faiss.add(_np.asarray([vec], dtype="float32"))
+        self._mat = None
+
+    def search(self, vec: Sequence[float]) -> tuple[str, float] | None:
+        if not self._keys:
+            return None
+        if _np is None:
+            sims = [sum(a * b for a, b in zip(row, vec)) for row in self._rows]
+            best = max(range(len(sims)), key=sims.__getitem__)
+            return self._keys[best], float(sims[best])
+        query = _np.asarray([vec], dtype="float32")
+        if faiss is not None:
+            if self._faiss is None:
+                self._faiss = faiss.IndexFlatIP(query.shape[1])
+                self._faiss.add(_np.asarray(self._rows, dtype="float32"))
+            sims, idx = self._faiss.search(query, 1)
+            return self._keys[int(idx[0][0])], float(sims[0][0])
+        if self._mat is None:
+            self._mat = _np.asarray(self._rows, dtype="float32")
+        sims = self._mat @ query[0]
+        best = int(sims.argmax())
+        return self._keys[best], float(sims[best])
+
+
+class _SemanticTier:
+    """Map near-duplicate prompts onto answers already in the exact cache.
+
+    The final message is embedded (``backend.memory_vector._embed`` by
+    default: OpenAI, SBERT or the hash fallback, which only matches identical
+    text) and searched among prompts that share the same earlier messages.
+    A neighbour at or above ``threshold`` yields its cached answer.
+    """
+
+    def __init__(
+        self,
+        threshold: float = _SEM_THRESHOLD,
+        size: int = _SEM_SIZE,
+        scopes: int = _SEM_SCOPES,
+        embed: Callable[[str], Sequence[float]] | None = None,
+    ) -> None:
+        self.threshold = threshold
+        self.size = size
+        self.scopes = scopes
+        self._embed = functools.lru_cache(maxsize=256)(embed or _default_embed)
+        self._index: OrderedDict[str, _VectorIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _split(messages: Sequence[Dict[str, str]]) -> tuple[str, str] | None:
+        if not messages or messages[-1].get("role") != "user":
+            return None
+        return cache_key(messages[:-1]), messages[-1]["content"]
+
+    def get(self, messages: Sequence[Dict[str, str]], agent: str = "default") -> str | None:
+        """Cached answer of the closest earlier prompt, if similar enough."""
+        split = self._split(messages)
+        if split is None:
+            return None
+        scope, text = split
+        vec = self._embed(text)
+        with self._lock:
+            index = self._index.get(scope)
+            found = index.search(vec) if index is not None else None
+        out = cache_get(found[0]) if found is not None and found[1] >= self.threshold else None
+        result = "miss" if out is None else "hit"
+        with _stats_lock:
+            _semantic_stats[(agent, result)] += 1
+        _CNT_SEM.labels(agent, result).inc()
+        return out
+
+    def put(self, messages: Sequence[Dict[str, str]], h: str) -> None:
+        """Index the prompt of ``messages`` whose answer is cached under ``h``."""
+        split = self._split(messages)
+        if split is None:
+            return
+        scope, text = split
+        vec = self._embed(text)
+        with self._lock:
+            index = self._index.get(scope)
+            if index is None:
+                index = self._index[scope] = _VectorIndex(self.size)
+                while len(self._index) > self.scopes:
+                    self._index.popitem(last=False)
+            self._index.move_to_end(scope)
+            index.add(vec, h)
+
+
+_semantic: _SemanticTier | None = None
+
+
+def semantic_tier() -> _SemanticTier:
+    """Process-wide semantic tier, created on first use."""
+    global _semantic
+    if _semantic is None:
+        with _stats_lock:
+            if _semantic is None:
+                _semantic = _SemanticTier()
+    return _semantic
+
+
+def semantic_hit_rate(agent: str | None = None) -> float:
+    """Share of semantic lookups that hit, for ``agent`` or across all agents."""
+    with _stats_lock:
+        rows = [(k, n) for k, n in _semantic_stats.items() if agent is None or k[0] == agent]
+    total = sum(n for _, n in rows)
+    return sum(n for (_, result), n in rows if result == "hit") / total if total else 0.0
@@ -16,7 +16,8 @@ Public API
 
 Extras
 ~~~~~~
-* ``LLMProvider.achat`` – `async` variant (awaitable).
+* ``LLMProvider.achat`` – `async` variant (awaitable); identical in-flight
+  prompts share one upstream request.
 * CLI smoke-test: ``python -m alpha_factory_v1.backend.utils.llm_provider
   --prompt "quick demo"``
 
@@ -24,11 +25,14 @@ Design pillars
 --------------
 1. Single **call-site** for every agent → ``llm.chat(...)``.
 2. **Provider-cascade** → automatic fail-over & rate-limit budgeting.
-3. **Disk cache** (SQLite) + in-mem LRU to slash cost/latency.
-4. Full **observability** – Prometheus counters + latency histograms.
-5. **Extensible** – drop a new provider in `_providers/` and it registers
+3. **Disk cache** (SQLite) + in-mem LRU to slash cost/latency, including
+   replay of streamed replies (see :mod:`.llm_cache`).
+4. **Async-native** – per-provider concurrency limits, bounded worker pools
+   and micro-batching for back-ends with batched completions.
+5. Full **observability** – Prometheus counters + latency histograms.
+6. **Extensible** – drop a new provider in `_providers/` and it registers
    automatically (≤10 LOC).
-6. Runs **with or without** any cloud API key; offline path via llama-cpp.
+7. Runs **with or without** any cloud API key; offline path via llama-cpp.
 
 """
 from __future__ import annotations
@@ -37,17 +41,16 @@ from __future__ import annotations
 import asyncio
 import dataclasses
 import functools
-import hashlib
-import json
 import logging
 import os
 import pathlib
-import sqlite3
 import sys
+import threading
 import time
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from types import GeneratorType
-from typing import Any, Dict, Generator, List, Optional, Sequence
+from typing import Any, Dict, Generator, List, Optional, Sequence, Tuple
 
 from alpha_factory_v1.core.monitoring import metrics
 from alpha_factory_v1.backend import metrics_registry
@@ -55,7 +58,7 @@ from alpha_factory_v1.backend import metrics_registry
 # ──────────────────── optional dependencies ────────────────
 _HAS_PROM = _HAS_TOK = False
 try:
-    from prometheus_client import Counter, Histogram  # type: ignore
+    from prometheus_client import Counter, Gauge, Histogram  # type: ignore
 
     _HAS_PROM = True
 except Exception:
@@ -109,6 +112,9 @@ else:  # no-op stubs
         def observe(self, *_, **__):
             ...
 
+        def set(self, *_, **__):
+            ...
+
     _CNT_REQ = _CNT_TOK = _HIST_LAT = _N()  # type: ignore
 
 
@@ -126,92 +132,151 @@ def _count_tokens(text: str) -> int:
     return max(1, len(text) // 4)
 
 
-# ───────────────────────── cache ───────────────────────────
-_TTL = int(os.getenv("AF_LLM_CACHE_TTL", "86400"))  # 1 day default
-_CACHE_SIZE = int(os.getenv("AF_LLM_CACHE_SIZE", "1024"))  # in-memory entries
-_cache_mem: OrderedDict[str, tuple[float, str]] = OrderedDict()
+_TOKEN_MEMO = int(os.getenv("AF_LLM_TOKEN_MEMO", "4096"))  # memoised message counts
 
-_db_path = pathlib.Path(os.getenv("AF_LLM_CACHE_PATH", pathlib.Path.home() / ".cache" / "alpha_factory_llm.sqlite"))
 
+@functools.lru_cache(maxsize=_TOKEN_MEMO)
+def _message_tokens(content: str) -> int:
+    """Memoised :func:`_count_tokens`; history messages repeat across calls."""
+    return _count_tokens(content)
 
-def _db_init() -> sqlite3.Connection | None:
-    try:
-        _db_path.parent.mkdir(parents=True, exist_ok=True)
-        db = sqlite3.connect(_db_path)
-        db.execute("PRAGMA journal_mode=WAL;")
-        db.execute(
-            """CREATE TABLE IF NOT EXISTS cache
-                   (h TEXT PRIMARY KEY, ts REAL, out TEXT, provider TEXT)"""
-        )
-        os.chmod(_db_path, 0o600)
-        return db
-    except Exception as exc:
-        _log.warning("Disk-cache disabled: %s", exc)
-        return None
-
-
-_DB = _db_init()
-
-
-def _cache_get(h: str) -> str | None:
-    # in-memory first
-    v = _cache_mem.get(h)
-    if v:
-        if time.time() - v[0] < _TTL:
-            _cache_mem.move_to_end(h)
-            return v[1]
-        _cache_mem.pop(h, None)
-    if _DB:
-        row = _DB.execute(
-            "SELECT out, ts FROM cache WHERE h=? AND ?-ts<?",
-            (h, time.time(), _TTL),
-        ).fetchone()
-        if row:
-            return row[0]
-    return None
-
-
-def _cache_put(h: str, out: str, prov: str) -> None:
-    _cache_mem[h] = (time.time(), out)
-    _cache_mem.move_to_end(h)
-    if len(_cache_mem) > _CACHE_SIZE:
-        _cache_mem.popitem(last=False)
-    if _DB:
-        with _DB:
-            _DB.execute(
-                "INSERT OR REPLACE INTO cache VALUES (?,?,?,?)",
-                (h, time.time(), out, prov),
-            )
+
+def _trim(msgs: List[Dict[str, str]], limit: int) -> List[Dict[str, str]]:
+    """Drop the oldest messages after the first until the total fits ``limit``.
+
+    The first message (usually the system prompt) and the last one are always
+    kept. Counts come from :func:`_message_tokens`, and the cut point is found
+    in one pass over the running total.
+    """
+    counts = [_message_tokens(m["content"]) for m in msgs]
+    total = sum(counts)
+    cut = 1
+    while total > limit and cut < len(msgs) - 1:
+        total -= counts[cut]
+        cut += 1
+    return msgs if cut == 1 else msgs[:1] + msgs[cut:]
+
+
+# ───────────────────────── cache ───────────────────────────
+from .llm_cache import (  # noqa: E402
+    cache_get as _cache_get,
+    cache_put as _cache_put,
+    cache_key,
+    cached_chunks,
+    replay,
+    semantic_tier,
+    tee_stream,
+)
 
 
 # ───────────────── rate-limit budgeting ────────────────────
+if _HAS_PROM:
+    _GAUGE_BUDGET = metrics_registry.get_metric(
+        Gauge,
+        "af_llm_budget_utilisation",
+        "Share of the per-minute LLM budget in use",
+        ["provider", "kind"],
+    )
+else:
+    _GAUGE_BUDGET = _N()  # type: ignore
+
+
+def _env_limit(kind: str, name: str, default: str) -> float:
+    return float(os.getenv(f"AF_LLM_{name.upper()}_{kind}", os.getenv(f"AF_{kind}_LIMIT", default)))
+
+
 @dataclasses.dataclass
 class _Budget:
-    rpm: int = int(os.getenv("AF_RPM_LIMIT", "900"))  # requests / min
-    tpm: int = int(os.getenv("AF_TPM_LIMIT", "60000"))  # tokens / min
-    # sliding window
-    _req_ts: List[float] = dataclasses.field(default_factory=list)
-    _tok_ts: List[tuple[float, int]] = dataclasses.field(default_factory=list)
+    """Per-provider request and token buckets refilled continuously.
+
+    Each bucket holds up to one minute of allowance and refills at
+    ``limit / 60`` per second, so admission is O(1) and the rate is smoothed
+    instead of resetting every minute. A single request larger than the whole
+    token budget is admitted once the bucket is full.
+    """
+
+    name: str = "base"
+    rpm: float = dataclasses.field(default_factory=lambda: float(os.getenv("AF_RPM_LIMIT", "900")))  # requests / min
+    tpm: float = dataclasses.field(default_factory=lambda: float(os.getenv("AF_TPM_LIMIT", "60000")))  # tokens / min
+    _req: float = dataclasses.field(init=False)
+    _tok: float = dataclasses.field(init=False)
+    _ts: float = dataclasses.field(init=False)
+    _lock: threading.Lock = dataclasses.field(init=False, default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        self._req, self._tok, self._ts = float(self.rpm), float(self.tpm), time.monotonic()
+
+    @classmethod
+    def for_provider(cls, name: str) -> "_Budget":
+        """Budget from ``AF_LLM_<NAME>_RPM``/``_TPM``, else ``AF_RPM_LIMIT``/``AF_TPM_LIMIT``."""
+        return cls(name, _env_limit("RPM", name, "900"), _env_limit("TPM", name, "60000"))
+
+    def _refill(self, now: float) -> None:
+        dt, self._ts = now - self._ts, now
+        self._req = min(self.rpm, self._req + dt * self.rpm / 60)
+        self._tok = min(self.tpm, self._tok + dt * self.tpm / 60)
+
+    def _take(self, tokens: int) -> float:
+        """Consume allowance and return 0, or return the seconds until it is available."""
+        need = min(tokens, self.tpm)
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._req >= 1 and self._tok >= need:
+                self._req -= 1
+                self._tok -= need
+                wait = 0.0
+            else:
+                wait = max((1 - self._req) * 60 / self.rpm, (need - self._tok) * 60 / self.tpm)
+            req_used, tok_used = 1 - self._req / self.rpm, 1 - self._tok / self.tpm
+        _GAUGE_BUDGET.labels(self.name, "requests").set(req_used)
+        _GAUGE_BUDGET.labels(self.name, "tokens").set(tok_used)
+        return wait
 
     def allow(self, tokens: int) -> bool:
-        now = time.time()
-        # purge old
-        self._req_ts = [t for t in self._req_ts if now - t < 60]
-        self._tok_ts = [p for p in self._tok_ts if now - p[0] < 60]
-        if len(self._req_ts) >= self.rpm:
-            return False
-        if sum(t for _, t in self._tok_ts) + tokens > self.tpm:
-            return False
-        # record
-        self._req_ts.append(now)
-        self._tok_ts.append((now, tokens))
-        return True
+        """Admit a request of ``tokens`` now or return ``False``."""
+        return self._take(tokens) == 0.0
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until a request of ``tokens`` fits the budget, then admit it."""
+        while (wait := self._take(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+    def utilisation(self) -> tuple[float, float]:
+        """Fraction of the request and token allowance currently used."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return 1 - self._req / self.rpm, 1 - self._tok / self.tpm
+
+
+# ───────────────── async request coalescing ────────────────
+_CONCURRENCY = int(os.getenv("AF_LLM_CONCURRENCY", "8"))  # in-flight calls / provider
+_BATCH_SIZE = int(os.getenv("AF_LLM_BATCH_SIZE", "8"))  # prompts per batched call
+_BATCH_WINDOW = float(os.getenv("AF_LLM_BATCH_WINDOW_MS", "5")) / 1000
+
+_BatchKey = Tuple[float, int, Tuple[str, ...]]
+
+
+@dataclasses.dataclass
+class _LoopState:
+    """Async state a provider keeps per event loop."""
+
+    loop: asyncio.AbstractEventLoop
+    sem: asyncio.Semaphore
+    batches: Dict[_BatchKey, List[tuple[List[Dict[str, str]], asyncio.Future[str]]]] = dataclasses.field(
+        default_factory=dict
+    )
+    tasks: set[asyncio.Task[None]] = dataclasses.field(default_factory=set)
+    client: Any = None  # provider specific async client
 
 
 # ───────────────── provider base class ─────────────────────
+_BUDGET_LOCK = threading.Lock()
+_POOL_LOCK = threading.Lock()
+
+
 class _Provider:
     name: str = "base"
-    _budget = _Budget()
+    supports_batch: bool = False  # True when ``_invoke_batch`` is native
 
     # ----- helpers ---------------------------------------------------------
     def _record(self, ok: bool, tokens: int | None, lat: float) -> None:
@@ -222,6 +287,45 @@ class _Provider:
             metrics.dgm_cost_usd_total.labels(self.name).inc(tokens * metrics.COST_PER_TOKEN)
         _HIST_LAT.labels(self.name).observe(lat)
 
+    @property
+    def _budget(self) -> _Budget:
+        budget: _Budget | None = self.__dict__.get("_budget_inst")
+        if budget is None:
+            with _BUDGET_LOCK:
+                budget = self.__dict__.setdefault("_budget_inst", _Budget.for_provider(self.name))
+        return budget
+
+    @staticmethod
+    def _estimate(messages: List[Dict[str, str]], max_tokens: int) -> int:
+        # estimated tokens (cheap; provider may return more/less)
+        return sum(_message_tokens(m["content"]) for m in messages) + max_tokens
+
+    def _admit(self, messages: List[Dict[str, str]], max_tokens: int) -> int:
+        est_toks = self._estimate(messages, max_tokens)
+        if not self._budget.allow(est_toks):
+            raise RuntimeError(f"{self.name} rate-limit budget exhausted")
+        return est_toks
+
+    def _concurrency(self) -> int:
+        """In-flight limit; ``AF_LLM_<NAME>_CONCURRENCY`` overrides the default."""
+        return max(1, int(os.getenv(f"AF_LLM_{self.name.upper()}_CONCURRENCY", _CONCURRENCY)))
+
+    def _executor(self) -> ThreadPoolExecutor:
+        pool: ThreadPoolExecutor | None = self.__dict__.get("_pool")
+        if pool is None:
+            with _POOL_LOCK:
+                pool = self.__dict__.get("_pool")
+                if pool is None:
+                    pool = self._pool = ThreadPoolExecutor(self._concurrency(), thread_name_prefix=f"llm-{self.name}")
+        return pool
+
+    def _loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state: _LoopState | None = self.__dict__.get("_aio")
+        if state is None or state.loop is not loop:
+            state = self._aio = _LoopState(loop, asyncio.Semaphore(self._concurrency()))
+        return state
+
     # ----- public sync interface ------------------------------------------
     def chat(  # noqa: D401
         self,
@@ -232,10 +336,7 @@ class _Provider:
         stop: Optional[Sequence[str]],
     ) -> str | Generator[str, None, None]:
         t0 = time.perf_counter()
-        # estimated tokens (cheap; provider may return more/less)
-        est_toks = sum(_count_tokens(m["content"]) for m in messages) + max_tokens
-        if not self._budget.allow(est_toks):
-            raise RuntimeError(f"{self.name} rate-limit budget exhausted")
+        est_toks = self._admit(messages, max_tokens)
         try:
             out = self._invoke(messages, temperature, max_tokens, stream, stop)
             if not isinstance(out, GeneratorType):
@@ -245,15 +346,125 @@ class _Provider:
             self._record(False, None, time.perf_counter() - t0)
             raise
 
-    # ----- async wrapper ---------------------------------------------------
-    async def achat(self, *a: Any, **k: Any) -> Any:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, lambda: self.chat(*a, **k))
+    # ----- public async interface -----------------------------------------
+    async def achat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        stream: bool = False,
+        stop: Optional[Sequence[str]] = None,
+    ) -> str | Generator[str, None, None]:
+        """Async completion bounded by the provider's concurrency limit.
+
+        Waits for rate budget rather than raising when it is exhausted.
+        Streaming calls return the sync generator of :meth:`chat`. Providers
+        with ``supports_batch`` have concurrent prompts sharing the same
+        sampling parameters grouped into one :meth:`_invoke_batch` call.
+        """
+        if stream:
+            return self.chat(messages, temperature, max_tokens, stream, stop)
+        est_toks = self._estimate(messages, max_tokens)
+        await self._budget.acquire(est_toks)
+        t0 = time.perf_counter()
+        state = self._loop_state()
+        try:
+            if self.supports_batch:
+                out = await self._enqueue(state, messages, temperature, max_tokens, stop)
+            else:
+                async with state.sem:
+                    out = await self._ainvoke(state, messages, temperature, max_tokens, stop)
+        except Exception:
+            self._record(False, None, time.perf_counter() - t0)
+            raise
+        self._record(True, est_toks, time.perf_counter() - t0)
+        return out
+
+    def _enqueue(
+        self,
+        state: _LoopState,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        stop: Optional[Sequence[str]],
+    ) -> asyncio.Future[str]:
+        key: _BatchKey = (temperature, max_tokens, tuple(stop or ()))
+        fut: asyncio.Future[str] = state.loop.create_future()
+        batch = state.batches.setdefault(key, [])
+        batch.append((messages, fut))
+        if len(batch) >= _BATCH_SIZE:
+            self._flush(state, key)
+        elif len(batch) == 1:
+            state.loop.call_later(_BATCH_WINDOW, self._flush, state, key)
+        return fut
+
+    def _flush(self, state: _LoopState, key: _BatchKey) -> None:
+        batch = state.batches.pop(key, None)
+        if batch:
+            task = state.loop.create_task(self._run_batch(state, key, batch))
+            state.tasks.add(task)
+            task.add_done_callback(state.tasks.discard)
+
+    async def _run_batch(
+        self,
+        state: _LoopState,
+        key: _BatchKey,
+        batch: List[tuple[List[Dict[str, str]], asyncio.Future[str]]],
+    ) -> None:
+        temperature, max_tokens, stop = key
+        prompts = [msgs for msgs, _ in batch]
+        try:
+            async with state.sem:
+                outs = await state.loop.run_in_executor(
+                    self._executor(),
+                    lambda: self._invoke_batch(prompts, temperature, max_tokens, list(stop) or None),
+                )
+            if len(outs) != len(batch):
+                raise RuntimeError(f"{self.name} returned {len(outs)} completions for {len(batch)} prompts")
+        except Exception as exc:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        for (_, fut), out in zip(batch, outs):
+            if not fut.done():
+                fut.set_result(out)
 
     # ----- to be implemented by concrete providers ------------------------
     def _invoke(self, *a: Any, **k: Any):  # noqa: D401
         raise NotImplementedError
 
+    async def _ainvoke(
+        self,
+        state: _LoopState,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        stop: Optional[Sequence[str]],
+    ) -> str:
+        """Non-streaming completion; by default :meth:`_invoke` on the worker pool."""
+        return await state.loop.run_in_executor(
+            self._executor(),
+            lambda: self._invoke(messages, temperature, max_tokens, False, stop),
+        )
+
+    def _invoke_batch(
+        self,
+        batch: List[List[Dict[str, str]]],
+        temperature: float,
+        max_tokens: int,
+        stop: Optional[Sequence[str]],
+    ) -> List[str]:
+        """One completion per conversation in ``batch``, in order."""
+        return [self._invoke(msgs, temperature, max_tokens, False, stop) for msgs in batch]
+
+
+def _async_http_client(limit: int) -> Any:
+    """``httpx`` client whose connection pool holds at most ``limit`` sockets."""
+    import httpx  # type: ignore  # shipped with the openai/anthropic SDKs
+
+    return httpx.AsyncClient(limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit))
+
 
 # ───────────────────── dynamic provider import ─────────────
 _PROVIDERS: Dict[str, "_Provider"] = {}
@@ -301,6 +512,21 @@ try:
                     r = self._cli.chat.completions.create(**kw)
                     return r.choices[0].message.content.strip()
 
+            async def _ainvoke(self, state, msgs, temperature, max_tokens, stop):
+                if state.client is None:
+                    state.client = openai.AsyncOpenAI(
+                        api_key=os.getenv("OPENAI_API_KEY"),
+                        http_client=_async_http_client(self._concurrency()),
+                    )
+                r = await state.client.chat.completions.create(
+                    model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+                    messages=msgs,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stop=stop or None,
+                )
+                return r.choices[0].message.content.strip()
+
         _install("openai", _OpenAI)
 except ImportError:
     pass
@@ -337,6 +563,21 @@ try:
                     )
                     return r.content[0].text.strip()
 
+            async def _ainvoke(self, state, msgs, temperature, max_tokens, stop):
+                if state.client is None:
+                    state.client = anthropic.AsyncAnthropic(
+                        api_key=os.getenv("ANTHROPIC_API_KEY"),
+                        http_client=_async_http_client(self._concurrency()),
+                    )
+                r = await state.client.messages.create(
+                    model=os.getenv("ANTHROPIC_MODEL", "claude-3-opus-20240229"),
+                    messages=[{"role": m["role"], "content": m["content"]} for m in msgs],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stop_sequences=stop or None,
+                )
+                return r.content[0].text.strip()
+
         _install("anthropic", _Anthropic)
 except ImportError:
     pass
@@ -540,6 +781,17 @@ if not _PROVIDERS:
 
 
 # ──────────────────────── facade class ─────────────────────
+# single-flight: prompt hash → task answering it, shared by concurrent ``achat``
+_INFLIGHT: Dict[str, asyncio.Task[str]] = {}
+
+
+def _inflight_done(hsh: str, task: asyncio.Task[str]) -> None:
+    if _INFLIGHT.get(hsh) is task:
+        del _INFLIGHT[hsh]
+    if not task.cancelled():
+        task.exception()  # retrieved here in case every waiter was cancelled
+
+
 class LLMProvider:
     """
     Unified chat-completion interface for all Alpha-Factory agents.
@@ -550,31 +802,96 @@ class LLMProvider:
         Default sampling temperature.
     max_tokens : int
         Default maximum tokens for completions.
+    context_limit : int, optional
+        Prompt token limit of the target model; older history is trimmed to
+        fit. Defaults to ``AF_LLM_CONTEXT_LIMIT`` (12000).
+    semantic_cache : bool, optional
+        Also serve near-duplicate prompts from the semantic cache tier
+        (blocking calls only). Defaults to ``AF_LLM_SEMANTIC_CACHE``.
+    agent : str
+        Label for the semantic-cache hit-rate metrics.
 
     Environment knobs
     -----------------
     * ``AF_LLM_CACHE_TTL`` (secs) – disk-cache expiry (default 86400).
-    * ``AF_LLM_CACHE_SIZE`` – max in-memory cache entries (default 1024).
-    * ``AF_RPM_LIMIT`` / ``AF_TPM_LIMIT`` – per-provider budgets.
+    * ``AF_LLM_CACHE_SIZE`` – max in-memory cache entries (default 1024),
+      split over ``AF_LLM_CACHE_SHARDS`` independently locked LRU shards.
+    * ``AF_LLM_CACHE_MAX_BYTES`` – disk-cache payload budget (default 256 MiB),
+      enforced every ``AF_LLM_CACHE_COMPACT_SECS`` or when exceeded.
+    * ``AF_LLM_CACHE_ZSTD`` – compress disk-cache values with zstd.
+    * ``AF_LLM_CONTEXT_LIMIT`` – default prompt token limit (12000).
+    * ``AF_LLM_TOKEN_MEMO`` – per-message token counts kept in memory (4096).
+    * ``AF_LLM_SEMANTIC_CACHE`` – enable the semantic tier by default;
+      ``AF_LLM_SEMANTIC_THRESHOLD`` is its cosine cut-off (0.95).
+    * ``AF_RPM_LIMIT`` / ``AF_TPM_LIMIT`` – per-provider budgets, overridable
+      per provider via ``AF_LLM_<NAME>_RPM`` / ``AF_LLM_<NAME>_TPM``; ``achat``
+      waits for budget, ``chat`` fails over to the next provider.
+    * ``AF_LLM_CONCURRENCY`` – in-flight ``achat`` calls per provider (default 8);
+      ``AF_LLM_<NAME>_CONCURRENCY`` overrides it for one provider.
+    * ``AF_LLM_BATCH_SIZE`` / ``AF_LLM_BATCH_WINDOW_MS`` – micro-batch size and
+      collection window for providers with batched completions.
     * ``AF_LOG_PROMPTS`` – if *truthy*, user prompts are logged verbatim.
     * ``AF_LLM_PROVIDERS`` – comma-separated provider order override.
     """
 
-    def __init__(self, *, temperature: float = 0.7, max_tokens: int = 512) -> None:
+    def __init__(
+        self,
+        *,
+        temperature: float = 0.7,
+        max_tokens: int = 512,
+        context_limit: int | None = None,
+        semantic_cache: bool | None = None,
+        agent: str = "default",
+    ) -> None:
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.context_limit = context_limit or int(os.getenv("AF_LLM_CONTEXT_LIMIT", "12000"))
+        if semantic_cache is None:
+            semantic_cache = os.getenv("AF_LLM_SEMANTIC_CACHE", "").lower() in {"1", "true", "yes"}
+        self.semantic_cache = semantic_cache
+        self.agent = agent
 
     # ----------------------------- helpers ------------------------------
     @staticmethod
     def _hash(messages: List[Dict[str, str]]) -> str:
-        blob = json.dumps(messages, sort_keys=True).encode()
-        return hashlib.sha256(blob).hexdigest()
+        return cache_key(messages)
 
     @staticmethod
     def _log_prompt(msgs: Sequence[Dict[str, str]]) -> None:
         if os.getenv("AF_LOG_PROMPTS"):
             _log.debug("Prompt: %s", msgs)
 
+    def _prepare(
+        self,
+        prompt: str | List[Dict[str, str]],
+        system_prompt: str | None,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+    ) -> tuple[List[Dict[str, str]], float, int]:
+        msgs = ([{"role": "system", "content": system_prompt}] if system_prompt else []) + (
+            [{"role": "user", "content": prompt}] if isinstance(prompt, str) else prompt
+        )
+        self._log_prompt(msgs)
+
+        temperature = temperature if temperature is not None else self.temperature
+        max_tokens = max_tokens if max_tokens is not None else self.max_tokens
+
+        return _trim(msgs, self.context_limit), temperature, max_tokens
+
+    def _semantic_get(self, msgs: List[Dict[str, str]]) -> str | None:
+        try:
+            return semantic_tier().get(msgs, self.agent)
+        except Exception as exc:
+            _log.warning("Semantic cache lookup failed: %s", exc)
+            return None
+
+    @staticmethod
+    def _semantic_put(msgs: List[Dict[str, str]], hsh: str) -> None:
+        try:
+            semantic_tier().put(msgs, hsh)
+        except Exception as exc:
+            _log.warning("Semantic cache update failed: %s", exc)
+
     # ----------------------------- public API ---------------------------
     def chat(
         self,
@@ -589,31 +906,36 @@ class LLMProvider:
     ) -> str | Generator[str, None, None]:
         """
         Synchronous call – returns answer *or* generator when ``stream=True``.
-        """
-        msgs = ([{"role": "system", "content": system_prompt}] if system_prompt else []) + (
-            [{"role": "user", "content": prompt}] if isinstance(prompt, str) else prompt
-        )
-        self._log_prompt(msgs)
 
-        temperature = temperature if temperature is not None else self.temperature
-        max_tokens = max_tokens if max_tokens is not None else self.max_tokens
-
-        # trim history if needed
-        while sum(_count_tokens(m["content"]) for m in msgs) > 12000 and len(msgs) > 2:
-            msgs.pop(1)
+        Streamed replies are cached once fully consumed and cache hits are
+        replayed as a generator with the original chunks.
+        """
+        msgs, temperature, max_tokens = self._prepare(prompt, system_prompt, temperature, max_tokens)
 
         hsh = self._hash(msgs)
-        if cache and not stream:
-            if hit := _cache_get(hsh):
+        if cache:
+            if stream:
+                if (chunks := cached_chunks(hsh)) is not None:
+                    _CNT_REQ.labels("cache", "hit").inc()
+                    return replay(chunks)
+            elif hit := _cache_get(hsh):
                 _CNT_REQ.labels("cache", "hit").inc()
                 return hit
+            elif self.semantic_cache and (hit := self._semantic_get(msgs)):
+                _CNT_REQ.labels("cache", "semantic").inc()
+                return hit
 
         last_exc: Optional[Exception] = None
         for name, prov in _PROVIDERS.items():
             try:
                 out = prov.chat(msgs, temperature, max_tokens, stream, stop)
-                if not stream and cache:
-                    _cache_put(hsh, out, name)  # type: ignore[arg-type]
+                if cache:
+                    if stream:
+                        out = tee_stream(out, hsh, name)  # type: ignore[arg-type]
+                    else:
+                        _cache_put(hsh, out, name)  # type: ignore[arg-type]
+                        if self.semantic_cache:
+                            self._semantic_put(msgs, hsh)
                 return out
             except Exception as e:
                 last_exc = e
@@ -621,13 +943,78 @@ class LLMProvider:
 
         raise RuntimeError("All providers failed") from last_exc
 
-    # --------------------------- async wrapper --------------------------
-    async def achat(self, *a: Any, **k: Any):
+    # ---------------------------- async API -----------------------------
+    async def achat(
+        self,
+        prompt: str | List[Dict[str, str]],
+        *,
+        system_prompt: str | None = None,
+        stream: bool = False,
+        stop: Optional[Sequence[str]] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cache: bool = True,
+    ) -> str | Generator[str, None, None]:
         """
         Asynchronous counterpart of :meth:`chat`.
+
+        With ``cache`` enabled, concurrent calls for the same conversation
+        (same :meth:`_hash`) await a single upstream request.
         """
+        if stream:
+            return self.chat(
+                prompt,
+                system_prompt=system_prompt,
+                stream=True,
+                stop=stop,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                cache=cache,
+            )
+        msgs, temperature, max_tokens = self._prepare(prompt, system_prompt, temperature, max_tokens)
+        if not cache:
+            return await self._acascade(msgs, temperature, max_tokens, stop, None)
+
+        hsh = self._hash(msgs)
+        if hit := _cache_get(hsh):
+            _CNT_REQ.labels("cache", "hit").inc()
+            return hit
+        if self.semantic_cache and (hit := await asyncio.to_thread(self._semantic_get, msgs)):
+            _CNT_REQ.labels("cache", "semantic").inc()
+            return hit
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, lambda: self.chat(*a, **k))
+        task = _INFLIGHT.get(hsh)
+        if task is not None and task.get_loop() is loop:
+            _CNT_REQ.labels("coalesced", "hit").inc()
+        else:
+            task = loop.create_task(self._acascade(msgs, temperature, max_tokens, stop, hsh))
+            _INFLIGHT[hsh] = task
+            task.add_done_callback(functools.partial(_inflight_done, hsh))
+        # shielded so one cancelled waiter does not cancel the shared request
+        return await asyncio.shield(task)
+
+    async def _acascade(
+        self,
+        msgs: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        stop: Optional[Sequence[str]],
+        hsh: str | None,
+    ) -> str:
+        last_exc: Optional[Exception] = None
+        for name, prov in _PROVIDERS.items():
+            try:
+                out = await prov.achat(msgs, temperature, max_tokens, False, stop)
+                if hsh is not None:
+                    _cache_put(hsh, out, name)  # type: ignore[arg-type]
+                    if self.semantic_cache:
+                        await asyncio.to_thread(self._semantic_put, msgs, hsh)
+                return out  # type: ignore[return-value]
+            except Exception as e:
+                last_exc = e
+                _log.warning("Provider '%s' failed: %s", name, e)
+
+        raise RuntimeError("All providers failed") from last_exc
 
 
 # --------------------------- CLI smoke test -----------------------------
@@ -8,18 +8,22 @@ default) and can periodically broadcast the Merkle root to Solana.
 
 from __future__ import annotations
 
-__all__ = ["Ledger", "setup", "logging"]
+__all__ = ["AsyncLedger", "Ledger", "setup", "logging"]
 
 import asyncio
+import concurrent.futures
 import contextlib
 import json
 import logging
+import queue
 import sqlite3
 import os
+import threading
+import time
 from datetime import datetime
 import dataclasses
 from pathlib import Path
-from typing import Iterable, List, cast
+from typing import Any, Callable, Iterable, List, TypeVar, cast
 
 try:  # optional dependency for colorized output
     import coloredlogs
@@ -27,6 +31,7 @@ except Exception:  # pragma: no cover - optional
     coloredlogs = None
 
 from . import messaging
+from .merkle import MerkleAccumulator, Proof
 from google.protobuf import json_format
 from typing import TYPE_CHECKING
 
@@ -101,7 +106,14 @@ def _merkle_root(hashes: Iterable[str]) -> str:
 
 
 class Ledger:
-    """Append-only ledger with optional Merkle root broadcasting."""
+    """Append-only ledger with optional Merkle root broadcasting.
+
+    With ``batch_size`` > 0 the ledger buffers rows and writes them with a
+    single ``executemany`` transaction once ``batch_size`` rows are queued or
+    every ``flush_ms`` milliseconds from a background task. Buffered SQLite
+    ledgers switch to WAL journaling. :meth:`flush`, :meth:`close` and
+    ``__aexit__`` write any pending rows.
+    """
 
     def __init__(
         self,
@@ -110,6 +122,9 @@ class Ledger:
         wallet: str | None = None,
         broadcast: bool = True,
         db: str | None = None,
+        *,
+        batch_size: int = 0,
+        flush_ms: float = 50.0,
     ) -> None:
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
@@ -184,6 +199,17 @@ class Ledger:
                 """
             )
         self.conn.commit()
+        self._pg = db_type == "postgres" and not isinstance(self.conn, sqlite3.Connection)
+        self.batch_size = batch_size
+        self.flush_ms = flush_ms
+        self._pending: List[tuple[float, str, str, str, str]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        if batch_size > 0 and isinstance(self.conn, sqlite3.Connection):
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._merkle = MerkleAccumulator(
+            self.conn, "messages", hasher=blake3, paramstyle="format" if self._pg else "qmark"
+        )
         self._task: asyncio.Task[None] | None = None
         self.rpc_url = rpc_url
         self.wallet = wallet
@@ -208,45 +234,85 @@ class Ledger:
             data = json.dumps(record, sort_keys=True).encode()
             digest = blake3(data).hexdigest()
             payload_json = json.dumps(record.get("payload", {}))
-            if self.db_type == "postgres":
-                with self.conn, self.conn.cursor() as cur:
-                    cur.execute(
-                        "INSERT INTO messages (ts, sender, recipient, payload, hash) VALUES (%s, %s, %s, %s, %s)",
-                        (env.ts, env.sender, env.recipient, payload_json, digest),
-                    )
-            else:
-                with self.conn:
-                    self.conn.execute(
-                        "INSERT INTO messages (ts, sender, recipient, payload, hash) VALUES (?, ?, ?, ?, ?)",
-                        (env.ts, env.sender, env.recipient, payload_json, digest),
-                    )
+            row = (env.ts, env.sender, env.recipient, payload_json, digest)
+            if self.batch_size <= 0:
+                self._write([row])
+                return
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+            elif self._flush_task is None:
+                self._start_flush_task()
 
-    def compute_merkle_root(self) -> str:
+    def _write(self, rows: List[tuple[float, str, str, str, str]]) -> None:
         assert self.conn is not None
-        if self.db_type == "postgres":
-            with self.conn.cursor() as cur:
-                cur.execute("SELECT hash FROM messages ORDER BY id")
-                raw_hashes = [row[0] for row in cur.fetchall()]
+        if self._pg:
+            with self.conn, self.conn.cursor() as cur:
+                cur.executemany(
+                    "INSERT INTO messages (ts, sender, recipient, payload, hash) VALUES (%s, %s, %s, %s, %s)",
+                    rows,
+                )
         else:
-            cur = self.conn.execute("SELECT hash FROM messages ORDER BY id")
-            raw_hashes = [row[0] for row in cur.fetchall()]
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO messages (ts, sender, recipient, payload, hash) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
 
-        hashes: List[str] = []
-        for h in raw_hashes:
-            if not isinstance(h, str) or not h:
-                continue
+    def flush(self) -> None:
+        """Write buffered rows in a single transaction."""
+        if not self._pending or self.conn is None:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            self._write(rows)
+        except Exception:
+            self._pending[:0] = rows
+            raise
+
+    def _start_flush_task(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # flushed by size, flush() or close() instead
+        self._flush_task = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_ms / 1000)
             try:
-                bytes.fromhex(h)
-            except Exception:
-                continue
-            hashes.append(h)
+                self.flush()
+            except Exception as exc:  # pragma: no cover - transient db errors
+                _log.warning("Ledger flush failed: %s", exc)
+
+    async def stop_flush_task(self) -> None:
+        """Cancel the background flush task and write pending rows."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        self.flush()
 
-        return _merkle_root(hashes)
+    def compute_merkle_root(self) -> str:
+        """Return the Merkle root, absorbing rows logged since the last call."""
+        assert self.conn is not None
+        self.flush()
+        self._merkle.sync()
+        return self._merkle.root()
+
+    def merkle_proof(self, row_id: int) -> Proof:
+        """Return the inclusion proof of message ``row_id`` against :meth:`compute_merkle_root`."""
+        assert self.conn is not None
+        self.flush()
+        self._merkle.sync()
+        return self._merkle.proof(row_id)
 
     def tail(self, count: int = 10) -> List[dict[str, object]]:
         """Return the last ``count`` ledger entries."""
 
         assert self.conn is not None
+        self.flush()
         if self.db_type == "postgres":
             with self.conn.cursor() as cur:
                 cur.execute(
@@ -275,6 +341,9 @@ class Ledger:
         except Exception as exc:  # pragma: no cover - corruption
             _log.warning("Failed to compute Merkle root: %s", exc)
             return
+        await self._publish_root(root)
+
+    async def _publish_root(self, root: str) -> None:
         if AsyncClient is None or not self.broadcast:
             _log.info("Merkle root %s", root)
             return
@@ -327,7 +396,12 @@ class Ledger:
             self._task = None
 
     def close(self) -> None:
+        """Flush pending rows and close the database."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
         if self.conn:
+            self.flush()
             self.conn.close()
             self.conn = None
 
@@ -345,6 +419,212 @@ class Ledger:
         return self
 
     async def __aexit__(self, exc_type: object, exc: object, tb: object) -> None:
-        """Stop the Merkle task and close the database."""
+        """Stop background tasks, flush pending rows and close the database."""
         await self.stop_merkle_task()
+        await self.stop_flush_task()
         self.close()
+
+
+_T = TypeVar("_T")
+_STOP = object()
+
+
+class AsyncLedger:
+    """Non-blocking facade over :class:`Ledger` for event-loop callers.
+
+    A dedicated writer thread owns the underlying :class:`Ledger` and its
+    database connection. :meth:`alog` and :meth:`log` only enqueue the
+    envelope on a bounded queue; the writer drains it and flushes whenever the
+    queue runs empty so bursts are committed together. When the queue is full
+    :meth:`alog` waits off the event loop and :meth:`log` blocks the caller,
+    which is recorded in :attr:`backpressure_events` and the
+    ``af_ledger_backpressure_total`` metric. Reads are executed on the writer
+    thread after all previously queued envelopes.
+    """
+
+    def __init__(self, path: str, *, queue_size: int = 10_000, **kwargs: Any) -> None:
+        self._queue: queue.Queue[object] = queue.Queue(maxsize=queue_size)
+        self.backpressure_events = 0
+        self._task: asyncio.Task[None] | None = None
+        self._metrics = _ledger_metrics()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        ready: concurrent.futures.Future[Ledger] = concurrent.futures.Future()
+        self._thread = threading.Thread(target=self._run, args=(path, kwargs, ready), name="ledger-writer", daemon=True)
+        self._thread.start()
+        self.ledger = ready.result()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of envelopes waiting for the writer thread."""
+        return self._queue.qsize()
+
+    def _run(self, path: str, kwargs: dict[str, Any], ready: concurrent.futures.Future[Ledger]) -> None:
+        try:
+            ledger = Ledger(path, **kwargs)
+        except BaseException as exc:
+            ready.set_exception(exc)
+            return
+        ready.set_result(ledger)
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            if isinstance(item, tuple):
+                fn, fut = item
+                if fut.set_running_or_notify_cancel():
+                    try:
+                        fut.set_result(fn())
+                    except BaseException as exc:  # noqa: BLE001 - forwarded to caller
+                        fut.set_exception(exc)
+            else:
+                try:
+                    ledger.log(cast(messaging.Envelope, item))
+                except Exception as exc:  # pragma: no cover - db errors
+                    _log.warning("Ledger write failed: %s", exc)
+            if self._queue.empty():
+                with contextlib.suppress(Exception):
+                    ledger.flush()
+            self._metrics["depth"].set(self._queue.qsize())
+        ledger.close()
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("ledger is closed")
+
+    def _put_blocking(self, item: object) -> None:
+        start = time.perf_counter()
+        self._queue.put(item)
+        self._metrics["wait"].observe(time.perf_counter() - start)
+
+    def _enqueue_nowait(self, item: object) -> bool:
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.backpressure_events += 1
+            self._metrics["backpressure"].inc()
+            return False
+        self._metrics["depth"].set(self._queue.qsize())
+        return True
+
+    def log(self, env: messaging.Envelope) -> None:
+        """Queue ``env`` for writing, blocking only while the queue is full."""
+        self._check_open()
+        if not self._enqueue_nowait(env):
+            self._put_blocking(env)
+
+    async def alog(self, env: messaging.Envelope) -> None:
+        """Queue ``env`` for writing without blocking the event loop."""
+        self._check_open()
+        if not self._enqueue_nowait(env):
+            await asyncio.to_thread(self._put_blocking, env)
+
+    def _submit(self, fn: Callable[[], _T]) -> concurrent.futures.Future[_T]:
+        fut: concurrent.futures.Future[_T] = concurrent.futures.Future()
+        with self._close_lock:  # nothing may be queued behind ``_STOP``
+            self._check_open()
+            self._queue.put((fn, fut))
+        return fut
+
+    def call(self, fn: Callable[[Ledger], _T]) -> _T:
+        """Run ``fn(ledger)`` on the writer thread and return its result."""
+        return self._submit(lambda: fn(self.ledger)).result()
+
+    async def acall(self, fn: Callable[[Ledger], _T]) -> _T:
+        """Awaitable variant of :meth:`call`."""
+        return await asyncio.wrap_future(self._submit(lambda: fn(self.ledger)))
+
+    def flush(self) -> None:
+        """Wait until every queued envelope is committed."""
+        self.call(lambda led: led.flush())
+
+    def compute_merkle_root(self) -> str:
+        return self.call(lambda led: led.compute_merkle_root())
+
+    def merkle_proof(self, row_id: int) -> Proof:
+        return self.call(lambda led: led.merkle_proof(row_id))
+
+    def tail(self, count: int = 10) -> List[dict[str, object]]:
+        return self.call(lambda led: led.tail(count))
+
+    async def broadcast_merkle_root(self) -> None:
+        try:
+            root = await self.acall(lambda led: led.compute_merkle_root())
+        except Exception as exc:  # pragma: no cover - corruption
+            _log.warning("Failed to compute Merkle root: %s", exc)
+            return
+        await self.ledger._publish_root(root)
+
+    async def _loop(self, interval: int) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.broadcast_merkle_root()
+
+    def start_merkle_task(self, interval: int = 3600) -> None:
+        if self._task is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:  # pragma: no cover - no loop in sync context
+                _log.warning("Merkle task requires a running event loop")
+                return
+            self._task = loop.create_task(self._loop(interval))
+
+    async def stop_merkle_task(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def close(self) -> None:
+        """Drain the queue, close the ledger and join the writer thread.
+
+        Later calls raise :class:`RuntimeError` since no writer is left to serve them.
+        """
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread.is_alive():
+                self._queue.put(_STOP)
+        self._thread.join()
+
+    async def aclose(self) -> None:
+        """Awaitable variant of :meth:`close`."""
+        await self.stop_merkle_task()
+        await asyncio.to_thread(self.close)
+
+    def __enter__(self) -> "AsyncLedger":
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "AsyncLedger":
+        self.start_merkle_task()
+        return self
+
+    async def __aexit__(self, exc_type: object, exc: object, tb: object) -> None:
+        await self.aclose()
+
+
+class _NoopMetric:
+    def set(self, *_a: Any) -> None: ...
+
+    def inc(self, *_a: Any) -> None: ...
+
+    def observe(self, *_a: Any) -> None: ...
+
+
+def _ledger_metrics() -> dict[str, Any]:
+    try:
+        from prometheus_client import Counter, Gauge, Histogram
+        from alpha_factory_v1.backend.metrics_registry import get_metric
+    except Exception:  # pragma: no cover - prometheus optional
+        noop = _NoopMetric()
+        return {"depth": noop, "backpressure": noop, "wait": noop}
+    return {
+        "depth": get_metric(Gauge, "af_ledger_queue_depth", "Envelopes waiting for the ledger writer"),
+        "backpressure": get_metric(Counter, "af_ledger_backpressure_total", "Ledger writes that found the queue full"),
+        "wait": get_metric(Histogram, "af_ledger_enqueue_wait_seconds", "Time spent waiting for ledger queue space"),
+    }
@@ -0,0 +1,188 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Append-only Merkle accumulator persisted alongside a hash column.
+
+:class:`MerkleAccumulator` keeps the frontier of a Merkle tree (at most one
+pending node per level) in two small tables of the same database that holds
+the hashed rows. Appending a leaf costs ``O(log N)`` and the root is derived
+from the frontier without re-reading earlier rows. Roots match the
+duplicate-last-node construction used by ``Ledger`` and ``ArchiveService``.
+"""
+
+from __future__ import annotations
+
+__all__ = ["MerkleAccumulator", "verify_proof"]
+
+from typing import Any, Callable, Iterable, List, Sequence, Tuple
+
+try:  # optional dependency
+    from blake3 import blake3
+except Exception:  # pragma: no cover - fallback
+    from hashlib import sha256 as blake3
+
+Hasher = Callable[[bytes], Any]
+Proof = List[Tuple[str, bool]]
+
+
+def _valid_leaves(rows: Iterable[Tuple[int, object]]) -> List[Tuple[int, bytes]]:
+    leaves: List[Tuple[int, bytes]] = []
+    for row_id, h in rows:
+        if not isinstance(h, str) or not h:
+            continue
+        try:
+            leaves.append((int(row_id), bytes.fromhex(h)))
+        except ValueError:
+            continue
+    return leaves
+
+
+def verify_proof(leaf: str, proof: Sequence[Tuple[str, bool]], root: str, hasher: Hasher = blake3) -> bool:
+    """Return ``True`` when ``proof`` links ``leaf`` to ``root``.
+
+    Each proof step is ``(sibling_hex, sibling_is_left)``.
+    """
+    node = bytes.fromhex(leaf)
+    for sibling_hex, is_left in proof:
+        sibling = bytes.fromhex(sibling_hex)
+        node = hasher(sibling + node).digest() if is_left else hasher(node + sibling).digest()
+    return node.hex() == root
+
+
+class MerkleAccumulator:
+    """Incrementally maintained Merkle root over ``table.column`` ordered by ``id``.
+
+    Rows whose hash is missing or not valid hex are skipped, mirroring the
+    filtering of the full recomputation. The frontier and the id of the last
+    absorbed row live in the ``merkle_frontier`` and ``merkle_state`` tables
+    keyed by ``name`` so several accumulators can share one database.
+    """
+
+    def __init__(
+        self,
+        conn: Any,
+        table: str,
+        *,
+        column: str = "hash",
+        name: str | None = None,
+        hasher: Hasher = blake3,
+        paramstyle: str = "qmark",
+    ) -> None:
+        self.conn = conn
+        self.table = table
+        self.column = column
+        self.name = name or table
+        self.hasher = hasher
+        self._ph = "%s" if paramstyle == "format" else "?"
+        self.size = 0
+        self.last_id = 0
+        self.frontier: dict[int, bytes] = {}
+        self._execute("CREATE TABLE IF NOT EXISTS merkle_state(name TEXT PRIMARY KEY, size BIGINT, last_id BIGINT)")
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS merkle_frontier(name TEXT, level INTEGER, node TEXT, PRIMARY KEY(name, level))"
+        )
+        self.conn.commit()
+        self._load()
+
+    def _execute(self, sql: str, params: Sequence[object] = ()) -> List[Tuple[Any, ...]]:
+        sql = sql.replace("?", self._ph)
+        if self._ph == "%s":
+            with self.conn.cursor() as cur:
+                cur.execute(sql, tuple(params))
+                return list(cur.fetchall()) if cur.description else []
+        cur = self.conn.execute(sql, tuple(params))
+        return list(cur.fetchall()) if cur.description else []
+
+    def _load(self) -> None:
+        state = self._execute("SELECT size, last_id FROM merkle_state WHERE name = ?", (self.name,))
+        if not state:
+            return
+        self.size, self.last_id = int(state[0][0]), int(state[0][1])
+        rows = self._execute("SELECT level, node FROM merkle_frontier WHERE name = ?", (self.name,))
+        self.frontier = {int(level): bytes.fromhex(node) for level, node in rows}
+
+    def _save(self) -> None:
+        self._execute("DELETE FROM merkle_state WHERE name = ?", (self.name,))
+        self._execute(
+            "INSERT INTO merkle_state(name, size, last_id) VALUES (?, ?, ?)", (self.name, self.size, self.last_id)
+        )
+        self._execute("DELETE FROM merkle_frontier WHERE name = ?", (self.name,))
+        for level, node in sorted(self.frontier.items()):
+            self._execute(
+                "INSERT INTO merkle_frontier(name, level, node) VALUES (?, ?, ?)", (self.name, level, node.hex())
+            )
+        self.conn.commit()
+
+    def reset(self) -> None:
+        """Forget the accumulated state so the next :meth:`sync` starts over."""
+        self.size = 0
+        self.last_id = 0
+        self.frontier = {}
+        self._save()
+
+    def append(self, leaf: bytes) -> None:
+        """Absorb ``leaf`` into the frontier in ``O(log N)``."""
+        node = leaf
+        level = 0
+        while level in self.frontier:
+            node = self.hasher(self.frontier.pop(level) + node).digest()
+            level += 1
+        self.frontier[level] = node
+        self.size += 1
+
+    def sync(self) -> None:
+        """Absorb rows appended to ``table`` since the last call and persist the frontier."""
+        max_id = self._execute(f"SELECT MAX(id) FROM {self.table}")[0][0] or 0
+        if int(max_id) < self.last_id:
+            self.reset()
+        rows = self._execute(
+            f"SELECT id, {self.column} FROM {self.table} WHERE id > ? ORDER BY id",
+            (self.last_id,),
+        )
+        if not rows:
+            return
+        for _, leaf in _valid_leaves(rows):
+            self.append(leaf)
+        self.last_id = int(rows[-1][0])
+        self._save()
+
+    def root(self) -> str:
+        """Return the Merkle root of the absorbed leaves."""
+        if self.size == 0:
+            return str(self.hasher(b"\x00").hexdigest())
+        carry: bytes | None = None  # trailing node built from an incomplete block
+        level = 0
+        while -(-self.size // (1 << level)) > 1:
+            odd = (self.size >> level) & 1
+            if carry is None:
+                carry = self.hasher(self.frontier[level] * 2).digest() if odd else None
+            elif odd:
+                carry = self.hasher(self.frontier[level] + carry).digest()
+            else:
+                carry = self.hasher(carry * 2).digest()
+            level += 1
+        return (carry if carry is not None else self.frontier[level]).hex()
+
+    def proof(self, row_id: int) -> Proof:
+        """Return the inclusion proof for the leaf stored at ``row_id``.
+
+        The proof covers the leaves absorbed so far and verifies against
+        :meth:`root` with :func:`verify_proof`.
+        """
+        rows = self._execute(
+            f"SELECT id, {self.column} FROM {self.table} WHERE id <= ? ORDER BY id",
+            (self.last_id,),
+        )
+        leaves = _valid_leaves(rows)
+        ids = [i for i, _ in leaves]
+        if row_id not in ids:
+            raise KeyError(f"row {row_id} is not part of the tree")
+        index = ids.index(row_id)
+        nodes = [leaf for _, leaf in leaves]
+        proof: Proof = []
+        while len(nodes) > 1:
+            if len(nodes) % 2 == 1:
+                nodes.append(nodes[-1])
+            sibling = index ^ 1
+            proof.append((nodes[sibling].hex(), sibling < index))
+            nodes = [self.hasher(nodes[i] + nodes[i + 1]).digest() for i in range(0, len(nodes), 2)]
+            index //= 2
+        return proof
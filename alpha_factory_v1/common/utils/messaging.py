@@ -11,13 +11,16 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import random
+from collections import OrderedDict
 from pathlib import Path
 import contextlib
 from types import TracebackType
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, TypeAlias
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Protocol, TypeAlias
 from cachetools import TTLCache
 
 from .config import Settings
+from .shm_ring import ShmTransport
 from google.protobuf import json_format, struct_pb2
 from typing import TYPE_CHECKING
 from alpha_factory_v1.core.utils import alerts
@@ -67,21 +70,199 @@ if not hasattr(struct_pb2.Struct, "get"):
     struct_pb2.Struct.get = _struct_get  # type: ignore[attr-defined]
 
 
+WIRE_JSON = 0
+WIRE_BINARY = 1
+
+
+def encode_envelope(env: EnvelopeLike, wire: int = WIRE_JSON) -> bytes:
+    """Serialise ``env`` for the Kafka/gRPC transports.
+
+    ``WIRE_BINARY`` frames are the version byte followed by
+    ``Envelope.SerializeToString()``. JSON is used for ``WIRE_JSON`` and for
+    objects that are not protobuf envelopes.
+    """
+    if isinstance(env, pb.Envelope):
+        if wire >= WIRE_BINARY:
+            return bytes((WIRE_BINARY,)) + env.SerializeToString()
+        payload = json_format.MessageToDict(env, preserving_proto_field_name=True)
+    else:  # support SimpleNamespace in tests
+        payload = env.__dict__
+    return json.dumps(payload).encode()
+
+
+def decode_envelope(data: bytes) -> tuple[EnvelopeLike, str | None]:
+    """Return the envelope encoded in ``data`` and the JSON auth token, if any.
+
+    Binary frames are recognised by their leading version byte; anything else
+    is parsed as the legacy JSON format.
+    """
+    if data and data[0] == WIRE_BINARY:
+        return pb.Envelope.FromString(memoryview(data)[1:]), None
+    if data and data[0] < 0x20 and data[0] not in b" \t\r\n":
+        raise ValueError(f"unsupported wire version {data[0]}")
+    obj = json.loads(data)
+    token = obj.pop("token", None)
+    env = Envelope(
+        sender=obj.get("sender", ""),
+        recipient=obj.get("recipient", ""),
+        ts=float(obj.get("ts", 0.0)),
+    )
+    if isinstance(obj.get("payload"), dict):
+        env.payload.update(obj["payload"])
+    return env, token
+
+
+Handler: TypeAlias = Callable[[EnvelopeLike], Awaitable[None] | None]
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+class _Subscriber:
+    """Bounded queue and worker task feeding a single handler."""
+
+    def __init__(self, topic: str, handler: Handler, maxsize: int) -> None:
+        self.topic = topic
+        self.handler = handler
+        self.queue: asyncio.Queue[EnvelopeLike] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        from alpha_factory_v1.core.utils.tracing import bus_queue_depth
+
+        while True:
+            env = await self.queue.get()
+            try:
+                res = self.handler(env)
+                if asyncio.iscoroutine(res):
+                    await res
+            except Exception:  # noqa: BLE001
+                logger.exception("handler error %s -> %s on %s", env.sender, env.recipient, self.topic)
+            finally:
+                self.queue.task_done()
+                bus_queue_depth.labels(self.topic).set(self.queue.qsize())
+
+
+class _TopicTrie:
+    """Routing trie for wildcard subscriptions.
+
+    Topics are split on ``.``; ``*`` matches exactly one segment and a
+    trailing ``#`` matches any number of remaining segments, including none.
+    """
+
+    __slots__ = ("children", "handlers", "tail")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TopicTrie] = {}
+        self.handlers: List[tuple[str, Handler]] = []
+        self.tail: List[tuple[str, Handler]] = []
+
+    def add(self, pattern: str, handler: Handler) -> None:
+        node = self
+        parts = pattern.split(".")
+        for i, part in enumerate(parts):
+            if part == "#":
+                if i != len(parts) - 1:
+                    raise ValueError(f"'#' must be the last segment of {pattern!r}")
+                node.tail.append((pattern, handler))
+                return
+            node = node.children.setdefault(part, _TopicTrie())
+        node.handlers.append((pattern, handler))
+
+    def remove(self, pattern: str, handler: Handler) -> None:
+        node: _TopicTrie | None = self
+        parts = pattern.split(".")
+        for part in parts[:-1] if parts[-1] == "#" else parts:
+            node = node.children.get(part) if node else None
+        if node is not None:
+            entries = node.tail if parts[-1] == "#" else node.handlers
+            with contextlib.suppress(ValueError):
+                entries.remove((pattern, handler))
+
+    def match(self, topic: str) -> List[tuple[str, Handler]]:
+        found: List[tuple[str, Handler]] = []
+        nodes = [self]
+        for part in topic.split("."):
+            step: List[_TopicTrie] = []
+            for node in nodes:
+                found.extend(node.tail)
+                for key in (part, "*"):
+                    child = node.children.get(key)
+                    if child is not None:
+                        step.append(child)
+            nodes = step
+        for node in nodes:
+            found.extend(node.tail)
+            found.extend(node.handlers)
+        return found
+
+
+def _is_pattern(topic: str) -> bool:
+    return "*" in topic.split(".") or topic.split(".")[-1] == "#"
+
+
+def topic_matches(pattern: str, topic: str) -> bool:
+    """Return ``True`` when ``topic`` is routed to a ``pattern`` subscription."""
+    pat = pattern.split(".")
+    parts = topic.split(".")
+    for i, seg in enumerate(pat):
+        if seg == "#" and i == len(pat) - 1:
+            return True
+        if i >= len(parts) or (seg != "*" and seg != parts[i]):
+            return False
+    return len(pat) == len(parts)
+
+
 class A2ABus:
-    """In-memory pub/sub with best-effort gRPC transport."""
+    """In-memory pub/sub with best-effort gRPC transport.
+
+    Subscriptions may use wildcard patterns such as ``research.*`` or
+    ``research.#`` (see :class:`_TopicTrie`). Matches are resolved once per
+    topic and cached until the subscriptions change.
+
+    With ``bus_queue_size`` > 0 every subscription gets a bounded queue and a
+    dedicated worker task instead of being invoked inline by :meth:`publish`.
+    ``bus_overflow`` selects what happens when a queue is full: ``block``
+    makes :meth:`apublish` wait for room, ``drop_oldest`` evicts the oldest
+    queued envelope and ``drop_newest`` discards the new one. The synchronous
+    :meth:`publish` cannot wait, so under ``block`` it drops the new envelope.
+    Drops are counted per topic in ``bus_dropped_total``. :meth:`drain` waits
+    until every queue is empty.
+
+    Peers negotiate the wire format during the handshake by appending
+    ``wire=<n>`` to ``PROTO_VERSION``; the bus answers with the highest
+    version both sides support. Messages from peers that omit it are parsed as
+    JSON. Kafka records are binary when ``bus_wire`` is ``"binary"``.
+
+    Setting ``bus_shm_dir`` links every bus started with the same directory on
+    this host through shared-memory rings (see :mod:`.shm_ring`). Envelopes
+    received that way are delivered to local subscribers only.
+    """
 
     PROTO_VERSION = "proto_schema=1"
+    WIRE_VERSION = WIRE_BINARY
 
     HANDSHAKE_TTL = 60
+    ROUTE_CACHE_SIZE = 4096  # wildcard routes kept for recently published topics
 
     def __init__(self, settings: Settings) -> None:
         self.settings = settings
-        self._subs: Dict[str, List[Callable[[EnvelopeLike], Awaitable[None] | None]]] = {}
+        self._subs: Dict[str, List[Handler]] = {}
+        self._patterns = _TopicTrie()
+        self._pattern_count = 0
+        self._routes: OrderedDict[str, List[tuple[str, Handler]]] = OrderedDict()
+        if settings.bus_overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy {settings.bus_overflow!r}")
+        self._queue_size = settings.bus_queue_size
+        self._overflow = settings.bus_overflow
+        self._queues: Dict[tuple[str, Handler], _Subscriber] = {}
         self._server: "grpc.aio.Server | None" = None
         self._producer: Optional[AIOKafkaProducer] = None
+        self._shm: Optional[ShmTransport] = None
         self._handshake_peers: set[str] = set()
         self._handshake_failures: TTLCache[str, int] = TTLCache(maxsize=1024, ttl=self.HANDSHAKE_TTL)
         self._handshake_nonces: TTLCache[str, None] = TTLCache(maxsize=1024, ttl=self.HANDSHAKE_TTL)
+        self._wire = WIRE_BINARY if settings.bus_wire == "binary" else WIRE_JSON
 
     async def __aenter__(self) -> "A2ABus":
         """Start the bus when entering an async context."""
@@ -101,47 +282,200 @@ class A2ABus:
         """Send an alert using :func:`alerts.send_alert`."""
         alerts.send_alert(message, url or self.settings.alert_webhook_url)
 
-    def subscribe(self, topic: str, handler: Callable[[EnvelopeLike], Awaitable[None] | None]) -> None:
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        if _is_pattern(topic):
+            self._patterns.add(topic, handler)
+            self._pattern_count += 1
         self._subs.setdefault(topic, []).append(handler)
+        self._routes.clear()
 
-    def unsubscribe(self, topic: str, handler: Callable[[EnvelopeLike], Awaitable[None] | None]) -> None:
+    def unsubscribe(self, topic: str, handler: Handler) -> None:
         """Remove a previously subscribed handler."""
         handlers = self._subs.get(topic)
         if not handlers:
             return
-        with contextlib.suppress(ValueError):
+        try:
             handlers.remove(handler)
+        except ValueError:
+            return
+        if _is_pattern(topic):
+            self._patterns.remove(topic, handler)
+            self._pattern_count -= 1
+        self._routes.clear()
+        if handler not in handlers:
+            sub = self._queues.pop((topic, handler), None)
+            if sub is not None:
+                sub.task.cancel()
         if not handlers:
             self._subs.pop(topic, None)
 
+    def _handlers(self, topic: str) -> List[tuple[str, Handler]]:
+        """Return ``(subscription, handler)`` pairs receiving ``topic``."""
+        if not self._pattern_count:
+            return [(topic, h) for h in self._subs.get(topic, [])]
+        route = self._routes.get(topic)
+        if route is not None:
+            self._routes.move_to_end(topic)
+            return route
+        exact = [] if _is_pattern(topic) else [(topic, h) for h in self._subs.get(topic, [])]
+        route = self._routes[topic] = exact + self._patterns.match(topic)
+        if len(self._routes) > self.ROUTE_CACHE_SIZE:
+            self._routes.popitem(last=False)
+        return route
+
+    def _forward(self, topic: str, env: EnvelopeLike) -> None:
+        if self._producer:
+            data = encode_envelope(env, self._wire)
+            asyncio.create_task(self._producer.send_and_wait(topic, data))
+        if self._shm:
+            self._shm_send(topic, [env])
+
+    def _shm_send(self, topic: str, envelopes: List[EnvelopeLike]) -> None:
+        assert self._shm is not None
+        dropped = self._shm.send(topic, [encode_envelope(env, WIRE_BINARY) for env in envelopes])
+        if dropped:
+            from alpha_factory_v1.core.utils.tracing import bus_dropped_total
+
+            bus_dropped_total.labels(topic).inc(dropped)
+
+    def _on_shm(self, topic: str, data: bytes) -> None:
+        env, _ = decode_envelope(data)
+        self._deliver(topic, env, self._handlers(topic))
+
+    def _dispatch(self, topic: str, handler: Handler, env: EnvelopeLike) -> None:
+        try:
+            res = handler(env)
+            if asyncio.iscoroutine(res):
+                try:
+                    asyncio.get_running_loop().create_task(res)
+                except RuntimeError:  # pragma: no cover - sync context
+                    asyncio.run(res)
+        except Exception:  # noqa: BLE001
+            logger.exception(
+                "handler error %s -> %s on %s",
+                env.sender,
+                env.recipient,
+                topic,
+            )
+
+    def _subscriber(self, topic: str, handler: Handler) -> _Subscriber | None:
+        sub = self._queues.get((topic, handler))
+        if sub is None or sub.task.done():
+            try:
+                sub = _Subscriber(topic, handler, self._queue_size)
+            except RuntimeError:  # no running loop – dispatch inline
+                return None
+            self._queues[(topic, handler)] = sub
+        return sub
+
+    def _enqueue(self, topic: str, handler: Handler, env: EnvelopeLike) -> None:
+        from alpha_factory_v1.core.utils.tracing import bus_dropped_total, bus_queue_depth
+
+        sub = self._subscriber(topic, handler)
+        if sub is None:
+            self._dispatch(topic, handler, env)
+            return
+        if sub.queue.full():
+            sub.dropped += 1
+            bus_dropped_total.labels(topic).inc()
+            if self._overflow != "drop_oldest":
+                return
+            sub.queue.get_nowait()
+            sub.queue.task_done()
+        sub.queue.put_nowait(env)
+        bus_queue_depth.labels(topic).set(sub.queue.qsize())
+
+    def _deliver(self, topic: str, env: EnvelopeLike, handlers: List[tuple[str, Handler]]) -> None:
+        for key, h in handlers:
+            if self._queue_size > 0:
+                self._enqueue(key, h, env)
+            else:
+                self._dispatch(topic, h, env)
+
     def publish(self, topic: str, env: EnvelopeLike) -> None:
         from alpha_factory_v1.core.utils.tracing import span, bus_messages_total
-        from alpha_factory_v1.core.utils import a2a_pb2 as pb
 
         with span("bus.publish"):
             bus_messages_total.labels(topic).inc()
+            self._forward(topic, env)
+            self._deliver(topic, env, self._handlers(topic))
+
+    def publish_many(self, topic: str, envelopes: Iterable[EnvelopeLike]) -> None:
+        """Publish several envelopes to ``topic`` under a single span.
+
+        Subscribers are resolved once and Kafka receives the batch through one
+        producer call.
+        """
+        from alpha_factory_v1.core.utils.tracing import span, bus_messages_total
+
+        envs = list(envelopes)
+        if not envs:
+            return
+        with span("bus.publish_many"):
+            bus_messages_total.labels(topic).inc(len(envs))
             if self._producer:
-                if isinstance(env, pb.Envelope):
-                    payload = json_format.MessageToDict(env, preserving_proto_field_name=True)
-                else:  # support SimpleNamespace in tests
-                    payload = env.__dict__
-                data = json.dumps(payload).encode()
-                asyncio.create_task(self._producer.send_and_wait(topic, data))
-            for h in list(self._subs.get(topic, [])):
-                try:
-                    res = h(env)
-                    if asyncio.iscoroutine(res):
-                        try:
-                            asyncio.get_running_loop().create_task(res)
-                        except RuntimeError:  # pragma: no cover - sync context
-                            asyncio.run(res)
-                except Exception:  # noqa: BLE001
-                    logger.exception(
-                        "handler error %s -> %s on %s",
-                        env.sender,
-                        env.recipient,
-                        topic,
-                    )
+                data = [encode_envelope(env, self._wire) for env in envs]
+                asyncio.create_task(self._send_batch(topic, data))
+            if self._shm:
+                self._shm_send(topic, envs)
+            handlers = self._handlers(topic)
+            for env in envs:
+                self._deliver(topic, env, handlers)
+
+    async def _send_batch(self, topic: str, data: List[bytes]) -> None:
+        producer = self._producer
+        if producer is None:
+            return
+        if not hasattr(producer, "create_batch"):
+            await asyncio.gather(*(producer.send_and_wait(topic, item) for item in data))
+            return
+        partitions = sorted(await producer.partitions_for(topic))
+        batch = producer.create_batch()
+        for item in data:
+            if batch.append(key=None, value=item, timestamp=None) is not None:
+                continue
+            if batch.record_count():
+                await producer.send_batch(batch, topic, partition=random.choice(partitions))
+                batch = producer.create_batch()
+                if batch.append(key=None, value=item, timestamp=None) is not None:
+                    continue
+            # larger than an empty batch: let the producer accept or reject it on its own
+            await producer.send_and_wait(topic, item)
+        if batch.record_count():
+            await producer.send_batch(batch, topic, partition=random.choice(partitions))
+
+    async def apublish(self, topic: str, env: EnvelopeLike) -> None:
+        """Publish ``env`` and wait for queue space under the ``block`` policy."""
+        if self._queue_size <= 0 or self._overflow != "block":
+            self.publish(topic, env)
+            return
+        from alpha_factory_v1.core.utils.tracing import span, bus_messages_total, bus_queue_depth
+
+        with span("bus.publish"):
+            bus_messages_total.labels(topic).inc()
+            self._forward(topic, env)
+            for key, h in self._handlers(topic):
+                sub = self._subscriber(key, h)
+                assert sub is not None
+                await sub.queue.put(env)
+                bus_queue_depth.labels(key).set(sub.queue.qsize())
+
+    async def drain(self) -> None:
+        """Wait until every subscriber queue has been processed."""
+        while True:
+            subs = list(self._queues.values())
+            await asyncio.gather(*(sub.queue.join() for sub in subs))
+            if all(sub.queue.empty() for sub in self._queues.values()):
+                return
+
+    async def _stop_workers(self) -> None:
+        subs = list(self._queues.values())
+        self._queues.clear()
+        for sub in subs:
+            sub.task.cancel()
+        for sub in subs:
+            with contextlib.suppress(asyncio.CancelledError):
+                await sub.task
 
     async def _fail_handshake(self, peer: str, context: Any) -> bytes:
         """Record a handshake failure and abort if the limit is exceeded."""
@@ -156,12 +490,17 @@ class A2ABus:
         return b"handshake required"
 
     async def _handle_rpc(self, request: bytes, context: Any) -> bytes:
-        text = request.decode()
         peer = context.peer() if grpc else ""
         if peer not in self._handshake_peers:
-            parts = text.strip().split()
-            if len(parts) != 2 or parts[0] != self.PROTO_VERSION:
+            parts = request.decode(errors="replace").strip().split()
+            if len(parts) not in (2, 3) or parts[0] != self.PROTO_VERSION:
                 return await self._fail_handshake(peer, context)
+            wire = WIRE_JSON
+            if len(parts) == 3:
+                key, _, value = parts[2].partition("=")
+                if key != "wire" or not value.isdigit():
+                    return await self._fail_handshake(peer, context)
+                wire = min(int(value), self.WIRE_VERSION)
             nonce = parts[1]
             if nonce in self._handshake_nonces:
                 return await self._fail_handshake(peer, context)
@@ -169,20 +508,16 @@ class A2ABus:
             self._handshake_peers.add(peer)
             if grpc and hasattr(context, "add_callback"):
                 context.add_callback(lambda: self._handshake_peers.discard(peer))
+            if len(parts) == 3:
+                return f"{self.PROTO_VERSION} wire={wire}".encode()
             return self.PROTO_VERSION.encode()
-        data = json.loads(text)
-        token = data.pop("token", None)
+        env, token = decode_envelope(request)
+        if token is None and request[:1] == bytes((WIRE_BINARY,)) and hasattr(context, "invocation_metadata"):
+            token = dict(context.invocation_metadata() or ()).get("bus-token")
         if self.settings.bus_token and token != self.settings.bus_token:
             if grpc:
                 await context.abort(grpc.StatusCode.PERMISSION_DENIED, "unauthenticated")
             return b"denied"
-        env = Envelope(
-            sender=data.get("sender", ""),
-            recipient=data.get("recipient", ""),
-            ts=float(data.get("ts", 0.0)),
-        )
-        if isinstance(data.get("payload"), dict):
-            env.payload.update(data["payload"])
         self.publish(env.recipient, env)
         if grpc and hasattr(context, "add_callback"):
             context.add_callback(lambda: self._handshake_peers.discard(peer))
@@ -200,6 +535,9 @@ class A2ABus:
         if self.settings.broker_url and AIOKafkaProducer:
             self._producer = AIOKafkaProducer(bootstrap_servers=self.settings.broker_url)
             await self._producer.start()
+        if self.settings.bus_shm_dir and self._shm is None:
+            self._shm = ShmTransport(self.settings.bus_shm_dir, self.settings.bus_shm_size)
+            self._shm.start(self._on_shm)
 
         if not self.settings.bus_port or grpc is None:
             return
@@ -235,6 +573,10 @@ class A2ABus:
         if self._producer:
             await self._producer.stop()
             self._producer = None
+        if self._shm:
+            self._shm.stop()
+            self._shm = None
+        await self._stop_workers()
         self._handshake_peers.clear()
         self._handshake_failures.clear()
         self._handshake_nonces.clear()
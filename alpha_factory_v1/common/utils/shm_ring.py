@@ -0,0 +1,313 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Same-host bus transport over shared-memory ring buffers.
+
+Every process attached to a bus directory owns one :class:`ShmRing` that the
+other processes write into. Records are ``u32 length + payload`` copied into a
+byte ring whose header holds monotonically increasing ``head`` and ``tail``
+offsets, so the common path is a ``memcpy`` into shared memory without any
+system call.
+
+Wakeups are futex-style: a consumer about to sleep raises a ``waiting`` flag
+in the header and parks on a named FIFO ("doorbell"); producers only write to
+the FIFO when that flag is set. Producers serialise on ``flock`` of the
+doorbell so several processes may feed one ring.
+"""
+
+from __future__ import annotations
+
+__all__ = ["ShmRing", "ShmTransport"]
+
+import asyncio
+import contextlib
+import errno
+import fcntl
+import logging
+import os
+import secrets
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<QQIxxxxQ")  # head, tail, waiting, capacity
+_HEAD = 0
+_TAIL = 8
+_WAITING = 16
+_DATA = 64
+_LEN = struct.Struct("<I")
+_TOPIC = struct.Struct("<H")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open an existing segment without handing ownership to the resource tracker."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:  # Python < 3.13
+        shm = shared_memory.SharedMemory(name=name)
+        with contextlib.suppress(Exception):
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return shm
+
+
+class ShmRing:
+    """Byte ring in a shared-memory segment.
+
+    Use :meth:`create` in the consumer and :meth:`open` in producers. The ring
+    never overwrites unread data: :meth:`write` stops at the first record
+    that does not fit.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self.shm = shm
+        self.owner = owner
+        self.buf = shm.buf
+        self.capacity = _HEADER.unpack_from(self.buf, 0)[3]
+
+    @classmethod
+    def create(cls, name: str, size: int) -> "ShmRing":
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_DATA + size)
+        _HEADER.pack_into(shm.buf, 0, 0, 0, 0, size)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def open(cls, name: str) -> "ShmRing":
+        return cls(_attach(name), owner=False)
+
+    def _u64(self, offset: int) -> int:
+        return int(struct.unpack_from("<Q", self.buf, offset)[0])
+
+    def _copy_in(self, pos: int, data: bytes | memoryview) -> None:
+        start = pos % self.capacity
+        first = min(len(data), self.capacity - start)
+        self.buf[_DATA + start:_DATA + start + first] = data[:first]
+        if first < len(data):
+            self.buf[_DATA:_DATA + len(data) - first] = data[first:]
+
+    def _copy_out(self, pos: int, size: int) -> bytes:
+        start = pos % self.capacity
+        first = min(size, self.capacity - start)
+        out = bytes(self.buf[_DATA + start:_DATA + start + first])
+        if first < size:
+            out += bytes(self.buf[_DATA:_DATA + size - first])
+        return out
+
+    @property
+    def waiting(self) -> bool:
+        return bool(struct.unpack_from("<I", self.buf, _WAITING)[0])
+
+    @waiting.setter
+    def waiting(self, value: bool) -> None:
+        struct.pack_into("<I", self.buf, _WAITING, int(value))
+
+    def pending(self) -> int:
+        """Return the number of unread bytes."""
+        return self._u64(_HEAD) - self._u64(_TAIL)
+
+    def write(self, records: Iterable[bytes]) -> int:
+        """Append ``records`` and publish them with a single ``head`` update.
+
+        Returns how many records were written; the remainder did not fit.
+        Callers must hold the producer lock.
+        """
+        head = self._u64(_HEAD)
+        free = self.capacity - (head - self._u64(_TAIL))
+        written = 0
+        for rec in records:
+            need = _LEN.size + len(rec)
+            if need > free:
+                break
+            self._copy_in(head, _LEN.pack(len(rec)))
+            self._copy_in(head + _LEN.size, rec)
+            head += need
+            free -= need
+            written += 1
+        if written:
+            struct.pack_into("<Q", self.buf, _HEAD, head)
+        return written
+
+    def read(self) -> List[bytes]:
+        """Consume every complete record currently in the ring."""
+        head = self._u64(_HEAD)
+        tail = self._u64(_TAIL)
+        out: List[bytes] = []
+        while tail < head:
+            (size,) = _LEN.unpack(self._copy_out(tail, _LEN.size))
+            out.append(self._copy_out(tail + _LEN.size, size))
+            tail += _LEN.size + size
+        if out:
+            struct.pack_into("<Q", self.buf, _TAIL, tail)
+        return out
+
+    def close(self) -> None:
+        self.buf = None  # type: ignore[assignment]
+        self.shm.close()
+        if self.owner:
+            with contextlib.suppress(FileNotFoundError):
+                self.shm.unlink()
+
+
+class _Peer:
+    def __init__(self, name: str, bell: Path) -> None:
+        self.fd = os.open(bell, os.O_WRONLY | os.O_NONBLOCK)
+        try:
+            self.ring = ShmRing.open(name)
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def close(self) -> None:
+        os.close(self.fd)
+        self.ring.close()
+
+
+def _frame(topic: str, data: bytes) -> bytes:
+    raw = topic.encode()
+    return _TOPIC.pack(len(raw)) + raw + data
+
+
+def _unframe(rec: bytes) -> Tuple[str, bytes]:
+    (size,) = _TOPIC.unpack_from(rec)
+    end = _TOPIC.size + size
+    return rec[_TOPIC.size:end].decode(), rec[end:]
+
+
+class ShmTransport:
+    """Broadcast encoded envelopes to every other process attached to ``directory``.
+
+    ``directory`` holds one doorbell FIFO per attached process, named after its
+    shared-memory segment. It should only be writable by trusted processes as
+    shared-memory frames are not authenticated.
+    """
+
+    SCAN_INTERVAL = 0.5
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, directory: str | os.PathLike[str], size: int = 1 << 20) -> None:
+        self.dir = Path(directory)
+        self.size = size
+        self.name = f"af_bus_{os.getpid()}_{secrets.token_hex(4)}"
+        self.dropped = 0
+        self._ring: Optional[ShmRing] = None
+        self._bell: Optional[Path] = None
+        self._fd: Optional[int] = None
+        self._peers: Dict[str, _Peer] = {}
+        self._scanned = 0.0
+        self._callback: Optional[Callable[[str, bytes], None]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._poll: Optional[asyncio.TimerHandle] = None
+
+    def start(self, callback: Callable[[str, bytes], None]) -> None:
+        """Create this process's ring and deliver incoming frames to ``callback``."""
+        self.dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self._ring = ShmRing.create(self.name, self.size)
+        self._bell = self.dir / f"{self.name}.bell"
+        os.mkfifo(self._bell, 0o600)
+        # O_RDWR keeps the FIFO open so the doorbell never reports EOF
+        self._fd = os.open(self._bell, os.O_RDWR | os.O_NONBLOCK)
+        self._callback = callback
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(self._fd, self._wake)
+        self._scanned = 0.0
+        self._park()
+
+    def stop(self) -> None:
+        if self._poll is not None:
+            self._poll.cancel()
+            self._poll = None
+        if self._loop is not None and self._fd is not None:
+            self._loop.remove_reader(self._fd)
+        for peer in self._peers.values():
+            peer.close()
+        self._peers.clear()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        if self._bell is not None:
+            with contextlib.suppress(FileNotFoundError):
+                self._bell.unlink()
+            self._bell = None
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+        self._loop = None
+
+    # consumer side -------------------------------------------------
+    def _wake(self) -> None:
+        if self._fd is not None:
+            with contextlib.suppress(BlockingIOError):
+                os.read(self._fd, 4096)
+        self._drain()
+
+    def _drain(self) -> None:
+        ring = self._ring
+        if ring is None or self._callback is None:
+            return
+        ring.waiting = False
+        while True:
+            records = ring.read()
+            for rec in records:
+                topic, data = _unframe(rec)
+                try:
+                    self._callback(topic, data)
+                except Exception:  # noqa: BLE001 - keep draining
+                    logger.exception("shm frame for %s failed", topic)
+            if not records:
+                break
+        self._park()
+
+    def _park(self) -> None:
+        ring = self._ring
+        if ring is None or self._loop is None:
+            return
+        ring.waiting = True
+        if ring.pending():  # a producer raced the flag
+            self._loop.call_soon(self._drain)
+            return
+        # Python offers no fences; the timer covers a doorbell missed to reordering
+        if self._poll is not None:
+            self._poll.cancel()
+        self._poll = self._loop.call_later(self.POLL_INTERVAL, self._drain)
+
+    # producer side -------------------------------------------------
+    def _scan(self) -> None:
+        now = time.monotonic()
+        if now - self._scanned < self.SCAN_INTERVAL:
+            return
+        self._scanned = now
+        live = {p.name[: -len(".bell")] for p in self.dir.glob("*.bell")} - {self.name}
+        for name in set(self._peers) - live:
+            self._peers.pop(name).close()
+        for name in live - set(self._peers):
+            try:
+                self._peers[name] = _Peer(name, self.dir / f"{name}.bell")
+            except OSError as exc:
+                if exc.errno not in (errno.ENXIO, errno.ENOENT):
+                    logger.warning("cannot attach to bus peer %s: %s", name, exc)
+
+    def send(self, topic: str, payloads: List[bytes]) -> int:
+        """Write ``payloads`` to every peer ring; return the number of dropped frames."""
+        if self._ring is None:
+            return 0
+        self._scan()
+        records = [_frame(topic, data) for data in payloads]
+        dropped = 0
+        for name, peer in list(self._peers.items()):
+            try:
+                fcntl.flock(peer.fd, fcntl.LOCK_EX)
+                try:
+                    dropped += len(records) - peer.ring.write(records)
+                    ring_bell = peer.ring.waiting
+                    if ring_bell:
+                        peer.ring.waiting = False
+                finally:
+                    fcntl.flock(peer.fd, fcntl.LOCK_UN)
+                if ring_bell:
+                    with contextlib.suppress(BlockingIOError):
+                        os.write(peer.fd, b"\0")
+            except OSError:
+                self._peers.pop(name).close()
+        self.dropped += dropped
+        return dropped
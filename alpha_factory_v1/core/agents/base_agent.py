@@ -4,13 +4,14 @@
 The class wires each agent into the :class:`~alpha_factory_v1.common.utils.messaging.A2ABus` and
 provides helper methods for sending and receiving envelopes. Subclasses
 implement :meth:`handle` to process messages and :meth:`run_cycle` for
-periodic behaviour.
+periodic behaviour. :meth:`snapshot` and :meth:`restore` let a supervisor
+hand in-memory state and LLM handles to a replacement instance on restart.
 """
 from __future__ import annotations
 
 import os
 import time
-from typing import Any, TYPE_CHECKING
+from typing import Any, TYPE_CHECKING, TypeVar
 from google.protobuf import struct_pb2
 
 try:
@@ -19,6 +20,7 @@ except Exception:  # pragma: no cover - optional
     LLMProvider = None
 
 from ...common.utils import messaging
+from ...common.utils.logging import AsyncLedger
 
 ADKAdapter = None
 MCPAdapter = None
@@ -33,17 +35,30 @@ try:
 except Exception:  # pragma: no cover - optional
     AgentContext = None
 
+_A = TypeVar("_A", bound="BaseAgent")
+
+# Attributes set by :meth:`BaseAgent.__init__` that survive a warm restart.
+_HANDOFF_STATE = ("name", "island", "backend", "llm", "oai_ctx", "adk", "mcp")
+# Attributes bound to the old instance or replaced by :meth:`BaseAgent.restore`.
+_TRANSIENT_STATE = frozenset({"bus", "ledger", "_handler"})
+
 
 class BaseAgent:
     """Abstract agent type used by specialised agents."""
 
     name: str
 
+    #: Extra instance attributes carried over by :meth:`snapshot`.
+    WARM_STATE: tuple[str, ...] = ()
+
+    #: Serve near-duplicate prompts from the LLM semantic cache tier.
+    SEMANTIC_CACHE: bool = False
+
     def __init__(
         self,
         name: str,
         bus: messaging.A2ABus,
-        ledger: "Ledger",
+        ledger: "Ledger | AsyncLedger",
         *,
         backend: str = "gpt-4o",
         island: str = "default",
@@ -80,6 +95,8 @@ class BaseAgent:
                         self.llm = LLMProvider(
                             temperature=bus.settings.temperature,
                             max_tokens=bus.settings.context_window,
+                            semantic_cache=self.SEMANTIC_CACHE or None,
+                            agent=self.name,
                         )
                     except Exception:
                         self.llm = LLMProvider() if LLMProvider is not None else None
@@ -127,9 +144,36 @@ class BaseAgent:
         )
         if isinstance(payload, dict):
             env.payload.update(payload)
-        self.ledger.log(env)
+        if isinstance(self.ledger, AsyncLedger):
+            await self.ledger.alog(env)
+        else:
+            self.ledger.log(env)
         self.bus.publish(recipient, env)
 
+    def snapshot(self) -> dict[str, Any] | None:
+        """Return state for :meth:`restore`, or ``None`` to require a cold start.
+
+        The LLM provider and adapters are always included. Subclasses list any
+        further attributes in :attr:`WARM_STATE`; an agent holding attributes
+        not covered there is cold started so :meth:`restore` never skips state
+        only ``__init__`` would have set up.
+        """
+        keys = (*_HANDOFF_STATE, *self.WARM_STATE)
+        if vars(self).keys() - _TRANSIENT_STATE - set(keys):
+            return None
+        return {key: getattr(self, key) for key in keys}
+
+    @classmethod
+    def restore(cls: type[_A], bus: messaging.A2ABus, ledger: "Ledger | AsyncLedger", state: dict[str, Any]) -> _A:
+        """Build an agent from :meth:`snapshot` output without calling ``__init__``."""
+        agent = cls.__new__(cls)
+        vars(agent).update(state)
+        agent.bus = bus
+        agent.ledger = ledger
+        agent._handler = agent._on_envelope
+        bus.subscribe(agent.name, agent._handler)
+        return agent
+
     def close(self) -> None:
         """Unsubscribe the agent from the bus."""
         self.bus.unsubscribe(self.name, self._handler)
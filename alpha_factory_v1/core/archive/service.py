@@ -11,6 +11,7 @@ import time
 from pathlib import Path
 from typing import Any, Iterable, Mapping, List
 
+from alpha_factory_v1.common.utils.merkle import MerkleAccumulator, Proof
 from alpha_factory_v1.core.evaluators.novelty import NoveltyIndex
 
 try:
@@ -73,19 +74,31 @@ class ArchiveService:
             """
         )
         self.conn.commit()
+        self._merkle = MerkleAccumulator(self.conn, "entries", hasher=blake3)
         self.rpc_url = rpc_url
         self.wallet = wallet
         self.broadcast = broadcast
         self._task: asyncio.Task[None] | None = None
-        self.novelty = NoveltyIndex()
+        novelty_path = None if str(path) == ":memory:" else self.path.with_name(self.path.name + ".novelty")
+        self.novelty = NoveltyIndex(path=novelty_path)
         try:
-            cur = self.conn.execute("SELECT spec FROM entries")
-            for (spec_text,) in cur.fetchall():
-                if isinstance(spec_text, str):
-                    self.novelty.add(spec_text)
+            self._sync_novelty()
         except Exception:  # pragma: no cover - index load errors
             _log.debug("Failed to rebuild novelty index", exc_info=True)
 
+    def _sync_novelty(self) -> None:
+        """Embed only the entries added since the persisted novelty index was saved."""
+        max_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM entries").fetchone()[0]
+        if self.novelty.last_id > max_id:
+            _log.warning("Novelty index is ahead of %s – rebuilding", self.path)
+            self.novelty.reset()
+        cur = self.conn.execute("SELECT id, spec FROM entries WHERE id > ? ORDER BY id", (self.novelty.last_id,))
+        rows = [(row_id, spec) for row_id, spec in cur.fetchall() if isinstance(spec, str)]
+        if rows:
+            self.novelty.add_many([spec for _, spec in rows])
+        if max_id != self.novelty.last_id:
+            self.novelty.save(max_id)
+
     def last_hash(self) -> str | None:
         """Return the most recent entry hash or ``None`` if empty."""
         cur = self.conn.execute("SELECT hash FROM entries ORDER BY id DESC LIMIT 1")
@@ -94,16 +107,13 @@ class ArchiveService:
 
     def compute_merkle_root(self) -> str:
         """Return the Merkle root over all stored entry hashes."""
-        cur = self.conn.execute("SELECT hash FROM entries ORDER BY id")
-        hashes = [row[0] for row in cur.fetchall() if isinstance(row[0], str)]
-        valid: List[str] = []
-        for h in hashes:
-            try:
-                bytes.fromhex(h)
-            except Exception:
-                continue
-            valid.append(h)
-        return _merkle_root(valid)
+        self._merkle.sync()
+        return self._merkle.root()
+
+    def merkle_proof(self, row_id: int) -> Proof:
+        """Return the inclusion proof of entry ``row_id`` against :meth:`compute_merkle_root`."""
+        self._merkle.sync()
+        return self._merkle.proof(row_id)
 
     def insert_entry(
         self,
@@ -117,12 +127,13 @@ class ArchiveService:
         record = {"parent": parent, "spec": spec, "scores": dict(scores)}
         digest = blake3(json.dumps(record, sort_keys=True).encode()).hexdigest()
         with self.conn:
-            self.conn.execute(
+            cur = self.conn.execute(
                 "INSERT INTO entries(parent, spec, scores, hash, ts) VALUES(?,?,?,?,?)",
                 (parent, json.dumps(spec), json.dumps(record["scores"]), digest, time.time()),
             )
         try:
             self.novelty.add(json.dumps(spec))
+            self.novelty.checkpoint(cur.lastrowid)
         except Exception:  # pragma: no cover - embed errors
             _log.debug("Failed to add spec to novelty index", exc_info=True)
         return self.compute_merkle_root()
@@ -188,8 +199,12 @@ class ArchiveService:
             self._task = None
 
     def close(self) -> None:
-        """Close the underlying database connection."""
+        """Persist the novelty index and close the database connection."""
         if self.conn:
+            try:
+                self.novelty.save()
+            except Exception:  # pragma: no cover - disk errors
+                _log.debug("Failed to persist novelty index", exc_info=True)
             self.conn.close()
             self.conn = None  # type: ignore[assignment]
 
@@ -1,10 +1,15 @@
 # SPDX-License-Identifier: Apache-2.0
 """Embedding-based novelty scoring utilities."""
+
 from __future__ import annotations
 
+import json
 import logging
 import hashlib
-from typing import Any, TYPE_CHECKING
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Sequence, TYPE_CHECKING
 
 import numpy as np
 
@@ -42,13 +47,23 @@ def _get_model() -> "SentenceTransformer":
 
 def embed(text: str) -> np.ndarray:
     """Return the MiniLM embedding for ``text``."""
+    return embed_many([text])
+
+
+def embed_many(texts: Sequence[str]) -> np.ndarray:
+    """Return MiniLM embeddings for ``texts`` as a ``(len(texts), dim)`` array.
+
+    All texts are encoded in a single forward pass.
+    """
+    if not texts:
+        return np.zeros((0, _DIM), dtype="float32")
     try:
         model = _get_model()
-        vec = model.encode([text], normalize_embeddings=True)
-        return np.asarray(vec, dtype="float32")  # type: ignore[no-any-return]
+        vecs = model.encode(list(texts), normalize_embeddings=True)
+        return np.asarray(vecs, dtype="float32").reshape(len(texts), -1)
     except Exception as exc:  # pragma: no cover - offline fallback
         _LOG.warning("SentenceTransformer unavailable (%s) → hashing fallback.", exc)
-        return _hash_embedding(text)
+        return np.concatenate([_hash_embedding(t) for t in texts])
 
 
 def _hash_embedding(text: str) -> np.ndarray:
@@ -64,29 +79,192 @@ def _softmax(x: np.ndarray) -> np.ndarray:
     return e / (e.sum() + 1e-12)  # type: ignore[no-any-return]
 
 
+def _normalise(vecs: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    return vecs / np.maximum(norms, 1e-12)  # type: ignore[no-any-return]
+
+
 class NoveltyIndex:
-    """In-memory FAISS index tracking the embedding mean."""
+    """In-memory FAISS index tracking the embedding mean.
+
+    Embeddings are memoised in an LRU cache keyed on the text hash so repeated
+    queries skip the encoder. Indexed vectors are L2-normalised which makes the
+    inner product a cosine similarity for the kNN score.
+
+    When ``path`` is given the index persists itself as ``<path>.npy`` (a
+    memory-mapped matrix of indexed vectors grown geometrically),
+    ``<path>.json`` (count, mean and the caller supplied ``last_id``) and
+    ``<path>.faiss``. Reopening restores the state without re-embedding.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, *, cache_size: int = 4096, path: str | Path | None = None) -> None:
         self.dim: int = _DIM
         self.index: faiss.IndexFlatIP | None = faiss.IndexFlatIP(self.dim) if faiss else None
         self.mean: np.ndarray = np.zeros(self.dim, dtype="float32")
         self.count: int = 0
+        self.last_id: int = 0
+        self.cache_size = cache_size
+        self._cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._vectors: list[np.ndarray] = []  # fallback storage without FAISS
+        self.path = Path(path) if path is not None else None
+        self._store: np.memmap | None = None
+        if self.path is not None:
+            self._load()
+
+    def _file(self, suffix: str) -> Path:
+        assert self.path is not None
+        return self.path.with_name(self.path.name + suffix)
+
+    def _load(self) -> None:
+        meta_file = self._file(".json")
+        try:
+            meta = json.loads(meta_file.read_text(encoding="utf-8"))
+            store = np.load(self._file(".npy"), mmap_mode="r+")
+            if store.shape[1] != self.dim or int(meta["count"]) > store.shape[0]:
+                raise ValueError("novelty store shape mismatch")
+        except FileNotFoundError:
+            return
+        except Exception:
+            _LOG.warning("Discarding unreadable novelty store at %s", self.path, exc_info=True)
+            self.reset()
+            return
+        self._store = store
+        self.count = int(meta["count"])
+        self.last_id = int(meta.get("last_id", 0))
+        self.mean = np.asarray(meta["mean"], dtype="float32")
+        if self.index is None:
+            return
+        start = 0
+        index_file = self._file(".faiss")
+        if index_file.exists():
+            try:
+                loaded = faiss.read_index(str(index_file))
+                if loaded.d == self.dim and loaded.ntotal <= self.count:
+                    self.index, start = loaded, int(loaded.ntotal)
+            except Exception:
+                _LOG.debug("Rebuilding FAISS index from %s", self._file(".npy"), exc_info=True)
+        if start < self.count:
+            self.index.add(np.ascontiguousarray(store[start:self.count]))
+
+    def reset(self) -> None:
+        """Drop all indexed vectors and any persisted state."""
+        self.index = faiss.IndexFlatIP(self.dim) if faiss else None
+        self.mean = np.zeros(self.dim, dtype="float32")
+        self.count = 0
+        self.last_id = 0
+        self._vectors = []
+        self._store = None
+        if self.path is not None:
+            for suffix in (".npy", ".json", ".faiss"):
+                self._file(suffix).unlink(missing_ok=True)
+
+    def _append_store(self, unit: np.ndarray) -> None:
+        need = self.count + len(unit)
+        if self._store is None or self._store.shape[0] < need:
+            capacity = max(1024, need, 2 * (self._store.shape[0] if self._store is not None else 0))
+            tmp = self._file(".npy.tmp")
+            grown = np.lib.format.open_memmap(tmp, mode="w+", dtype="float32", shape=(capacity, self.dim))
+            if self._store is not None:
+                grown[: self.count] = self._store[: self.count]
+            grown.flush()
+            del grown
+            os.replace(tmp, self._file(".npy"))
+            self._store = np.load(self._file(".npy"), mmap_mode="r+")
+        self._store[self.count:need] = unit
+
+    def checkpoint(self, last_id: int | None = None) -> None:
+        """Flush vectors and metadata to disk, recording ``last_id`` as indexed."""
+        if last_id is not None:
+            self.last_id = last_id
+        if self.path is None:
+            return
+        if self._store is not None:
+            self._store.flush()
+        meta = {"count": self.count, "last_id": self.last_id, "mean": self.mean.tolist()}
+        tmp = self._file(".json.tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, self._file(".json"))
+
+    def save(self, last_id: int | None = None) -> None:
+        """Persist the FAISS index alongside :meth:`checkpoint` data."""
+        self.checkpoint(last_id)
+        if self.path is not None and self.index is not None:
+            tmp = self._file(".faiss.tmp")
+            faiss.write_index(self.index, str(tmp))
+            os.replace(tmp, self._file(".faiss"))
+
+    def _embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return embeddings for ``texts`` encoding only cache misses."""
+        keys = [hashlib.blake2b(t.encode("utf-8"), digest_size=16).digest() for t in texts]
+        missing: dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key in self._cache:
+                self._cache.move_to_end(key)
+            else:
+                missing.setdefault(key, text)
+        fresh: dict[bytes, np.ndarray] = {}
+        if missing:
+            vecs = embed_many(list(missing.values()))
+            fresh = dict(zip(missing, vecs))
+            if self.cache_size > 0:
+                for key, vec in fresh.items():
+                    self._cache[key] = vec
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        out = np.empty((len(texts), self.dim), dtype="float32")
+        for i, key in enumerate(keys):
+            out[i] = fresh[key] if key in fresh else self._cache[key]
+        return out
 
     def add(self, text: str) -> None:
         """Index the embedding of ``text`` and update the mean vector."""
-        vec = embed(text)
+        self.add_many([text])
+
+    def add_many(self, texts: Sequence[str]) -> None:
+        """Index ``texts`` with a single batched embedding call."""
+        if not texts:
+            return
+        self._add_vectors(self._embed(texts))
+
+    def _add_vectors(self, vecs: np.ndarray) -> None:
+        unit = _normalise(vecs)
+        if self.path is not None:
+            self._append_store(unit)
         if self.index is not None:
-            self.index.add(vec)
-        self.mean = (self.mean * self.count + vec[0]) / (self.count + 1)
-        self.count += 1
+            self.index.add(unit)
+        elif self._store is None:
+            self._vectors.append(unit)
+        self.mean = (self.mean * self.count + vecs.sum(axis=0)) / (self.count + len(vecs))
+        self.count += len(vecs)
 
     def divergence(self, text: str) -> float:
         """Return the KL divergence between ``text`` and the index mean."""
-        vec = embed(text)
+        return float(self.divergence_many([text])[0])
+
+    def divergence_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Return the KL divergence to the index mean for each of ``texts``."""
+        vecs = self._embed(texts)
         if self.count == 0:
-            return 1.0
-        p = _softmax(vec[0])
+            return np.ones(len(texts), dtype=float)
+        p = np.exp(vecs - vecs.max(axis=1, keepdims=True))
+        p /= p.sum(axis=1, keepdims=True) + 1e-12
         q = _softmax(self.mean)
-        kl = float(np.sum(p * np.log((p + 1e-12) / (q + 1e-12))))
-        return kl
+        return np.sum(p * np.log((p + 1e-12) / (q + 1e-12)), axis=1).astype(float)  # type: ignore[no-any-return]
+
+    def knn_novelty(self, text: str, k: int = 5) -> float:
+        """Return the mean cosine distance from ``text`` to its ``k`` nearest archived vectors."""
+        return float(self.knn_novelty_many([text], k)[0])
+
+    def knn_novelty_many(self, texts: Sequence[str], k: int = 5) -> np.ndarray:
+        """Vectorised :meth:`knn_novelty` for ``texts``."""
+        if self.count == 0:
+            return np.ones(len(texts), dtype=float)
+        query = _normalise(self._embed(texts))
+        k = max(1, min(k, self.count))
+        if self.index is not None:
+            sims, _ = self.index.search(query, k)
+        else:
+            stored = self._store[: self.count] if self._store is not None else np.concatenate(self._vectors)
+            sims = query @ stored.T
+            sims = -np.sort(-sims, axis=1)[:, :k]
+        return (1.0 - sims).mean(axis=1).astype(float)  # type: ignore[no-any-return]
@@ -5,9 +5,6 @@ from __future__ import annotations
 from pathlib import Path
 import click
 
-from alpha_factory_v1.core.self_evolution import harness
-from alpha_factory_v1.core.governance.stake_registry import StakeRegistry
-
 try:
     from alpha_factory_v1.demos.alpha_agi_insight_v1.src.interface import cli as _insight_cli
 except Exception:  # pragma: no cover - optional
@@ -23,6 +20,9 @@ def orch() -> None:
 @click.argument("patch", type=click.Path(exists=True))
 def self_test(patch: str) -> None:
     """Apply PATCH and run sandboxed tests."""
+    from alpha_factory_v1.core.self_evolution import harness
+    from alpha_factory_v1.core.governance.stake_registry import StakeRegistry
+
     registry = StakeRegistry()
     registry.set_stake("orch", 1.0)
     diff = Path(patch).read_text(encoding="utf-8")
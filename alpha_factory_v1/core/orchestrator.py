@@ -10,36 +10,22 @@ health checks.
 from __future__ import annotations
 
 import asyncio
+import importlib
 import os
-import random
-import sys
-import time
 from pathlib import Path
-from typing import Any, Callable, Dict, List, cast
-
-from alpha_factory_v1.demos.alpha_agi_insight_v1.src.agents import (
-    planning_agent,
-    research_agent,
-    strategy_agent,
-    market_agent,
-    codegen_agent,
-    safety_agent,
-    memory_agent,
-    adk_summariser_agent,
-)
-from alpha_factory_v1.core.agents.self_improver_agent import SelfImproverAgent
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, cast
+
 from .utils import config
 from alpha_factory_v1.common.utils import logging as insight_logging
 from alpha_factory_v1.common.utils import messaging
-from alpha_factory_v1.common.utils.logging import Ledger
+from alpha_factory_v1.common.utils.logging import AsyncLedger, Ledger
 from .utils import alerts
-from alpha_factory_v1.core.archive.service import ArchiveService
-from alpha_factory_v1.backend.orchestrator_utils import AgentRunner
-from alpha_factory_v1.core.archive.solution_archive import SolutionArchive
-from .agents.base_agent import BaseAgent
-from alpha_factory_v1.core.governance.stake_registry import StakeRegistry
-from .simulation import mats
-from types import ModuleType
+from alpha_factory_v1.backend.orchestrator_utils import AgentRunner, Supervisor
+
+if TYPE_CHECKING:  # pragma: no cover - type hints only
+    from .agents.base_agent import BaseAgent
+    from .simulation import mats
 
 resource: ModuleType | None
 try:  # platform specific
@@ -53,17 +39,63 @@ PROMOTION_THRESHOLD = float(os.getenv("PROMOTION_THRESHOLD", "0"))
 
 log = insight_logging.logging.getLogger(__name__)
 
+_INSIGHT_AGENTS = "alpha_factory_v1.demos.alpha_agi_insight_v1.src.agents"
 
-from alpha_factory_v1.backend.demo_orchestrator import DemoOrchestrator as BaseOrchestrator
+#: Agents started on every island, in start order, as ``module:Class``.
+#: Modules are imported on first use so startup only pays for what runs.
+AGENT_REGISTRY: Dict[str, str] = {
+    "planning": f"{_INSIGHT_AGENTS}.planning_agent:PlanningAgent",
+    "research": f"{_INSIGHT_AGENTS}.research_agent:ResearchAgent",
+    "summariser": f"{_INSIGHT_AGENTS}.adk_summariser_agent:ADKSummariserAgent",
+    "strategy": f"{_INSIGHT_AGENTS}.strategy_agent:StrategyAgent",
+    "market": f"{_INSIGHT_AGENTS}.market_agent:MarketAgent",
+    "codegen": f"{_INSIGHT_AGENTS}.codegen_agent:CodeGenAgent",
+    "safety": f"{_INSIGHT_AGENTS}.safety_agent:SafetyGuardianAgent",
+    "memory": f"{_INSIGHT_AGENTS}.memory_agent:MemoryAgent",
+}
+
+# Names this module used to import eagerly, resolved by ``__getattr__``.
+_LAZY_ATTRS: Dict[str, str] = {
+    "ArchiveService": "alpha_factory_v1.core.archive.service:ArchiveService",
+    "SolutionArchive": "alpha_factory_v1.core.archive.solution_archive:SolutionArchive",
+    "StakeRegistry": "alpha_factory_v1.core.governance.stake_registry:StakeRegistry",
+    "SelfImproverAgent": "alpha_factory_v1.core.agents.self_improver_agent:SelfImproverAgent",
+    "BaseAgent": "alpha_factory_v1.core.agents.base_agent:BaseAgent",
+    "mats": "alpha_factory_v1.core.simulation.mats",
+    **{spec.partition(":")[0].rpartition(".")[2]: spec.partition(":")[0] for spec in AGENT_REGISTRY.values()},
+}
+
+_agent_classes: Dict[str, type] = {}
 
 
-class BackoffDelay(float):
-    """Float wrapper to keep backoff delays distinct from monitor intervals."""
+def _import(spec: str) -> Any:
+    module, _, attr = spec.partition(":")
+    mod = importlib.import_module(module)
+    return getattr(mod, attr) if attr else mod
 
-    def __eq__(self, other: object) -> bool:  # noqa: D401
-        if isinstance(other, int) and not isinstance(other, bool):
-            return False
-        return float.__eq__(self, other)
+
+def load_agent(name: str) -> type:
+    """Return the agent class registered as ``name``, importing it on first use."""
+    cls = _agent_classes.get(name)
+    if cls is None:
+        try:
+            spec = AGENT_REGISTRY[name]
+        except KeyError:
+            raise KeyError(f"unknown agent {name!r}") from None
+        cls = _agent_classes[name] = _import(spec)
+    return cls
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily import agent modules and heavy backends on attribute access."""
+    spec = _LAZY_ATTRS.get(name)
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = _import(spec)
+    return value
+
+
+from alpha_factory_v1.backend.demo_orchestrator import DemoOrchestrator as BaseOrchestrator
 
 
 async def monitor_agents(
@@ -78,40 +110,47 @@ async def monitor_agents(
     """Monitor runners and log warnings when agents restart."""
     err_threshold = int(os.getenv("AGENT_ERR_THRESHOLD", err_threshold))
     backoff_exp_after = int(os.getenv("AGENT_BACKOFF_EXP_AFTER", backoff_exp_after))
-    is_pytest = bool(sys.argv) and "pytest" in Path(sys.argv[0]).name
-    while True:
-        interval = 0 if os.getenv("PYTEST_CURRENT_TEST") else 2
-        await asyncio.sleep(interval)
-        now = time.time()
-        for runner in list(runners.values()):
-            needs_restart = False
-            if runner.task and runner.task.done():
-                needs_restart = True
-            elif runner.error_count >= err_threshold:
-                needs_restart = True
-            elif now - runner.last_beat > runner.period * 5:
-                needs_restart = True
-            if needs_restart:
-                log.warning("%s unresponsive – restarting", runner.agent.name)
-                delay = random.uniform(0.5, 1.5)
-                if runner.restart_streak >= backoff_exp_after:
-                    delay *= 2 ** (runner.restart_streak - backoff_exp_after + 1)
-                    delay = BackoffDelay(delay)
-                prior_restarts = runner.restarts
-                await asyncio.sleep(delay)
-                await asyncio.shield(runner.restart(bus, ledger))
-                if on_restart and runner.restarts > prior_restarts:
-                    on_restart(runner)
-                if (
-                    is_pytest
-                    and runner.restart_streak == 1
-                    and backoff_exp_after <= 1
-                    or runner.agent.__class__.__name__ == "FailingAgent"
-                ):
-                    extra_delay = BackoffDelay(delay * 2)
-                    await asyncio.sleep(extra_delay)
-                    if on_restart:
-                        on_restart(runner)
+    await Supervisor(
+        runners,
+        bus,
+        ledger,
+        err_threshold=err_threshold,
+        backoff_exp_after=backoff_exp_after,
+        on_restart=on_restart,
+        log=log,
+    ).run()
+
+
+def build_agents(
+    bus: messaging.A2ABus, ledger: Any, settings: config.Settings, *, singletons: bool = True
+) -> List[BaseAgent]:
+    """Instantiate the agent set for every island in ``settings.island_backends``.
+
+    Process-wide agents such as the self-improver are only added when
+    ``singletons`` is true so sharded deployments start exactly one of each.
+    """
+    agents: List[BaseAgent] = []
+    for island, backend in settings.island_backends.items():
+        for name in AGENT_REGISTRY:
+            args = (settings.memory_path,) if name == "memory" else ()
+            agents.append(load_agent(name)(bus, ledger, *args, backend=backend, island=island))
+    if singletons and os.getenv("AGI_SELF_IMPROVE") == "1":
+        patch = os.getenv("AGI_SELF_IMPROVE_PATCH")
+        repo = os.getenv("AGI_SELF_IMPROVE_REPO", str(Path.cwd()))
+        allow = [p.strip() for p in os.getenv("AGI_SELF_IMPROVE_ALLOW", "**").split(",") if p.strip()]
+        if patch:
+            from .agents.self_improver_agent import SelfImproverAgent
+
+            agents.append(
+                SelfImproverAgent(
+                    bus,
+                    ledger,
+                    repo,
+                    patch,
+                    allowed=allow or ["**"],
+                )
+            )
+    return agents
 
 
 class Orchestrator(BaseOrchestrator):
@@ -126,15 +165,22 @@ class Orchestrator(BaseOrchestrator):
         global ERR_THRESHOLD, BACKOFF_EXP_AFTER
         ERR_THRESHOLD = int(os.getenv("AGENT_ERR_THRESHOLD", "3"))
         BACKOFF_EXP_AFTER = int(os.getenv("AGENT_BACKOFF_EXP_AFTER", "3"))
+        from alpha_factory_v1.core.archive.service import ArchiveService
+        from alpha_factory_v1.core.archive.solution_archive import SolutionArchive
+        from alpha_factory_v1.core.governance.stake_registry import StakeRegistry
+
         self.settings = settings or config.CFG
         insight_logging.setup(json_logs=self.settings.json_logs)
-        bus = messaging.A2ABus(self.settings)
-        ledger = Ledger(
+        bus = self._create_bus()
+        ledger_cls = AsyncLedger if self.settings.ledger_async else Ledger
+        ledger = ledger_cls(
             self.settings.ledger_path,
             rpc_url=self.settings.solana_rpc_url,
             wallet=self.settings.solana_wallet,
             broadcast=self.settings.broadcast,
             db=self.settings.db_type,
+            batch_size=self.settings.ledger_batch_size,
+            flush_ms=self.settings.ledger_flush_ms,
         )
         archive = ArchiveService(
             os.getenv("ARCHIVE_PATH", "archive.db"),
@@ -161,46 +207,18 @@ class Orchestrator(BaseOrchestrator):
             err_threshold=ERR_THRESHOLD,
             backoff_exp_after=BACKOFF_EXP_AFTER,
             promotion_threshold=PROMOTION_THRESHOLD,
+            cpu_budget=self.settings.agent_cpu_budget,
+            coalesce=self.settings.agent_coalesce_ms / 1000,
+            heartbeat_snapshot=self.settings.heartbeat_snapshot,
         )
         for agent in self._init_agents():
             self.add_agent(agent)
 
+    def _create_bus(self) -> messaging.A2ABus:
+        return messaging.A2ABus(self.settings)
+
     def _init_agents(self) -> List[BaseAgent]:
-        agents: List[BaseAgent] = []
-        for island, backend in self.settings.island_backends.items():
-            agents.extend(
-                [
-                    planning_agent.PlanningAgent(self.bus, self.ledger, backend=backend, island=island),
-                    research_agent.ResearchAgent(self.bus, self.ledger, backend=backend, island=island),
-                    adk_summariser_agent.ADKSummariserAgent(self.bus, self.ledger, backend=backend, island=island),
-                    strategy_agent.StrategyAgent(self.bus, self.ledger, backend=backend, island=island),
-                    market_agent.MarketAgent(self.bus, self.ledger, backend=backend, island=island),
-                    codegen_agent.CodeGenAgent(self.bus, self.ledger, backend=backend, island=island),
-                    safety_agent.SafetyGuardianAgent(self.bus, self.ledger, backend=backend, island=island),
-                    memory_agent.MemoryAgent(
-                        self.bus,
-                        self.ledger,
-                        self.settings.memory_path,
-                        backend=backend,
-                        island=island,
-                    ),
-                ]
-            )
-        if os.getenv("AGI_SELF_IMPROVE") == "1":
-            patch = os.getenv("AGI_SELF_IMPROVE_PATCH")
-            repo = os.getenv("AGI_SELF_IMPROVE_REPO", str(Path.cwd()))
-            allow = [p.strip() for p in os.getenv("AGI_SELF_IMPROVE_ALLOW", "**").split(",") if p.strip()]
-            if patch:
-                agents.append(
-                    SelfImproverAgent(
-                        self.bus,
-                        self.ledger,
-                        repo,
-                        patch,
-                        allowed=allow or ["**"],
-                    )
-                )
-        return agents
+        return build_agents(self.bus, self.ledger, self.settings)
 
     async def evolve(
         self,
@@ -210,9 +228,15 @@ class Orchestrator(BaseOrchestrator):
         sector: str = "generic",
         approach: str = "ga",
         experiment_id: str = "default",
+        workers: int = 1,
         **kwargs: object,
     ) -> mats.Population:
-        """Run evolution for ``scenario_hash`` keyed by ``experiment_id``."""
+        """Run evolution for ``scenario_hash`` keyed by ``experiment_id``.
+
+        ``workers`` > 1 evaluates ``fn`` in a persistent process pool.
+        """
+
+        from .simulation import mats
 
         pops = self.experiment_pops.setdefault(experiment_id, {})
         if len(self.experiment_pops) > 10:
@@ -224,9 +248,50 @@ class Orchestrator(BaseOrchestrator):
             genome_length,
             scenario_hash=scenario_hash,
             populations=pops,
+            workers=workers,
             **cast(Any, kwargs),
         )
         pops[scenario_hash] = pop
+        self._archive_population(pop, sector, approach, experiment_id)
+        return pop
+
+    async def evolve_islands(
+        self,
+        fn: Callable[[list[float]], tuple[float, ...]],
+        genome_length: int,
+        islands: int | list[str] = 4,
+        sector: str = "generic",
+        approach: str = "ga",
+        experiment_id: str = "default",
+        **kwargs: object,
+    ) -> dict[str, mats.Population]:
+        """Advance all ``islands`` of ``experiment_id`` in parallel processes.
+
+        Keyword arguments such as ``topology`` and ``migration_interval`` are
+        forwarded to :func:`mats.run_islands`.
+        """
+
+        from .simulation import mats
+
+        pops = self.experiment_pops.setdefault(experiment_id, {})
+        if len(self.experiment_pops) > 10:
+            raise RuntimeError("max concurrent experiments exceeded")
+
+        result = await asyncio.to_thread(
+            mats.run_islands,
+            fn,
+            genome_length,
+            islands,
+            populations=pops,
+            **cast(Any, kwargs),
+        )
+        for name, front in mats.island_fronts(result).items():
+            log.info("experiment %s island %s: %d individuals on Pareto front", experiment_id, name, len(front))
+        for pop in result.values():
+            self._archive_population(pop, sector, approach, experiment_id)
+        return result
+
+    def _archive_population(self, pop: mats.Population, sector: str, approach: str, experiment_id: str) -> None:
         for ind in pop:
             self.solution_archive.add(
                 sector,
@@ -238,7 +303,6 @@ class Orchestrator(BaseOrchestrator):
                 {"experiment_id": experiment_id, "genome": ind.genome},
                 {"score": ind.score},
             )
-        return pop
 
     def _record_restart(self, runner: AgentRunner) -> None:
         super()._record_restart(runner)
@@ -250,7 +314,12 @@ class Orchestrator(BaseOrchestrator):
 
 
 async def _main() -> None:  # pragma: no cover - CLI helper
-    orch = Orchestrator()
+    if config.CFG.shards > 0:
+        from .sharding import ShardedOrchestrator
+
+        orch: Orchestrator = ShardedOrchestrator()
+    else:
+        orch = Orchestrator()
     await orch.run_forever()
 
 
@@ -1,6 +1,21 @@
 # SPDX-License-Identifier: Apache-2.0
 """Self-editing utilities."""
 
-from .tools import view, edit, replace
+from __future__ import annotations
+
+from typing import Any
 
 __all__ = ["view", "edit", "replace"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import :mod:`.tools` on first access; it pulls in the OpenAI Agents SDK.
+
+    Keeping it lazy lets :mod:`.safety` be used on its own (the MATS operators
+    import it on every CLI start) without paying for the SDK import.
+    """
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from . import tools
+
+    return getattr(tools, name)
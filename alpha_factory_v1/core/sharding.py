@@ -0,0 +1,431 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Multi-process sharded orchestrator.
+
+Islands from ``settings.island_backends`` are split into ``settings.shards``
+groups and each group runs in its own worker process with its own
+:class:`~alpha_factory_v1.backend.orchestrator_utils.AgentRunner` instances.
+Workers reach the coordinator through a Unix socket:
+
+* :class:`ShardBus` is the worker-side :class:`~..common.utils.messaging.A2ABus`.
+  It dispatches to local handlers and forwards publishes and subscriptions
+  upstream.
+* :class:`ShardHub` is the coordinator bus. It relays envelopes between
+  shards and local subscribers, appends forwarded ledger records to the
+  single global ledger and exposes every remote agent as a
+  :class:`RemoteRunner` so :func:`~.orchestrator.monitor_agents` keeps
+  supervising all agents from one place.
+
+:class:`ShardedOrchestrator` ties the pieces together and respawns shard
+processes that exit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import multiprocessing as mp
+import os
+import struct
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from alpha_factory_v1.backend.orchestrator_utils import AgentRunner, LivenessTable
+from alpha_factory_v1.common.utils import logging as insight_logging
+from alpha_factory_v1.common.utils import messaging
+from .orchestrator import Orchestrator, build_agents
+from .utils import config
+
+__all__ = [
+    "RemoteLedger",
+    "RemoteRunner",
+    "ShardBus",
+    "ShardHub",
+    "ShardedOrchestrator",
+    "run_shard",
+]
+
+log = insight_logging.logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">IB")  # body length, frame kind
+_TOPIC = struct.Struct(">H")
+_SUB, _UNSUB, _ENV, _LOG, _AGENT, _STATUS, _RESTART = range(7)
+STATUS_INTERVAL = 1.0
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    size, kind = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return kind, await reader.readexactly(size)
+
+
+def _write_frame(writer: asyncio.StreamWriter, kind: int, body: bytes) -> None:
+    if not writer.is_closing():
+        writer.writelines((_HEADER.pack(len(body), kind), body))
+
+
+def _pack_envelope(topic: str, env: messaging.EnvelopeLike) -> bytes:
+    name = topic.encode()
+    return _TOPIC.pack(len(name)) + name + messaging.encode_envelope(env, messaging.WIRE_BINARY)
+
+
+def _unpack_envelope(body: bytes) -> Tuple[str, messaging.EnvelopeLike]:
+    (size,) = _TOPIC.unpack_from(body)
+    start = _TOPIC.size + size
+    env, _ = messaging.decode_envelope(body[start:])
+    return body[_TOPIC.size:start].decode(), env
+
+
+class ShardBus(messaging.A2ABus):
+    """Worker-side bus that mirrors publishes and subscriptions to the coordinator."""
+
+    def __init__(self, settings: config.Settings) -> None:
+        super().__init__(settings)
+        self._writer: asyncio.StreamWriter | None = None
+
+    def attach(self, writer: asyncio.StreamWriter) -> None:
+        """Use ``writer`` as the upstream link and announce existing subscriptions."""
+        self._writer = writer
+        for topic in self._subs:
+            _write_frame(writer, _SUB, topic.encode())
+
+    def subscribe(self, topic: str, handler: messaging.Handler) -> None:
+        first = topic not in self._subs
+        super().subscribe(topic, handler)
+        if first and self._writer:
+            _write_frame(self._writer, _SUB, topic.encode())
+
+    def unsubscribe(self, topic: str, handler: messaging.Handler) -> None:
+        super().unsubscribe(topic, handler)
+        if topic not in self._subs and self._writer:
+            _write_frame(self._writer, _UNSUB, topic.encode())
+
+    def _upstream(self, topic: str, env: messaging.EnvelopeLike) -> None:
+        if self._writer is None:
+            return
+        try:
+            body = _pack_envelope(topic, env)
+        except (AttributeError, TypeError):  # not an envelope, e.g. heartbeat structs
+            return
+        _write_frame(self._writer, _ENV, body)
+
+    def publish(self, topic: str, env: messaging.EnvelopeLike) -> None:
+        super().publish(topic, env)
+        self._upstream(topic, env)
+
+    def publish_many(self, topic: str, envelopes: Any) -> None:
+        envs = list(envelopes)
+        super().publish_many(topic, envs)
+        for env in envs:
+            self._upstream(topic, env)
+
+    def deliver(self, topic: str, env: messaging.EnvelopeLike) -> None:
+        """Dispatch an envelope relayed by the coordinator to local handlers."""
+        super().publish(topic, env)
+
+
+class RemoteLedger:
+    """Worker-side ledger forwarding records to the coordinator's ledger."""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self._writer = writer
+
+    def log(self, env: messaging.Envelope) -> None:
+        _write_frame(self._writer, _LOG, messaging.encode_envelope(env, messaging.WIRE_BINARY))
+
+
+class _RemoteAgent:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class RemoteRunner:
+    """Coordinator-side proxy exposing the :class:`AgentRunner` attributes used by ``monitor_agents``."""
+
+    def __init__(self, peer: "_Peer", name: str, capabilities: List[str], period: float) -> None:
+        self.agent = _RemoteAgent(name)
+        self.capabilities = capabilities
+        self.period = period
+        self.last_beat = time.time()
+        self.restarts = 0
+        self.error_count = 0
+        self.restart_streak = 0
+        self.task: asyncio.Future[None] | None = asyncio.get_running_loop().create_future()
+        self.liveness: LivenessTable | None = None
+        self._peer: _Peer | None = peer
+
+    def update(self, status: Dict[str, Any]) -> None:
+        self.last_beat = float(status["last_beat"])
+        if self.liveness is not None:
+            self.liveness.set(self.agent.name, self.last_beat)
+        self.error_count = int(status["error_count"])
+        self.restart_streak = int(status["restart_streak"])
+        if status["done"]:
+            self._finish()
+
+    def _finish(self) -> None:
+        if self.task and not self.task.done():
+            self.task.set_result(None)
+
+    def disconnected(self) -> None:
+        self._peer = None
+        self._finish()
+
+    def start(self, bus: object, ledger: object) -> None:
+        """Remote agents are started by their shard."""
+
+    async def restart(self, bus: object, ledger: object) -> None:
+        if self._peer is not None:
+            _write_frame(self._peer.writer, _RESTART, self.agent.name.encode())
+        self.restarts += 1
+        self.restart_streak += 1
+        self.error_count = 0
+        self.last_beat = time.time()
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_future()
+
+
+class _Peer:
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.topics: set[str] = set()
+        self.runners: Dict[str, RemoteRunner] = {}
+
+    def wants(self, topic: str) -> bool:
+        return topic in self.topics or any(messaging.topic_matches(p, topic) for p in self.topics)
+
+
+class ShardHub(messaging.A2ABus):
+    """Coordinator bus relaying envelopes between shards over a Unix socket."""
+
+    def __init__(self, settings: config.Settings, path: str) -> None:
+        super().__init__(settings)
+        self.path = path
+        self.ledger: Any = None
+        self.on_register: Callable[[RemoteRunner], None] | None = None
+        self._peers: List[_Peer] = []
+        self._unix_server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        await super().start()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+        self._unix_server = await asyncio.start_unix_server(self._serve, path=self.path)
+
+    async def stop(self) -> None:
+        if self._unix_server:
+            self._unix_server.close()
+            for peer in list(self._peers):
+                peer.writer.close()
+            await self._unix_server.wait_closed()
+            self._unix_server = None
+        await super().stop()
+
+    def _fan_out(self, topic: str, env: messaging.EnvelopeLike, origin: _Peer | None) -> None:
+        body: bytes | None = None
+        for peer in self._peers:
+            if peer is origin or not peer.wants(topic):
+                continue
+            if body is None:
+                try:
+                    body = _pack_envelope(topic, env)
+                except (AttributeError, TypeError):
+                    return
+            _write_frame(peer.writer, _ENV, body)
+
+    def publish(self, topic: str, env: messaging.EnvelopeLike) -> None:
+        super().publish(topic, env)
+        self._fan_out(topic, env, None)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = _Peer(writer)
+        self._peers.append(peer)
+        try:
+            while True:
+                kind, body = await _read_frame(reader)
+                try:
+                    self._handle(peer, kind, body)
+                except Exception:  # noqa: BLE001 - keep the link alive
+                    log.exception("shard frame %d failed", kind)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass  # shard went away or the hub is shutting down
+        finally:
+            self._peers.remove(peer)
+            for runner in peer.runners.values():
+                runner.disconnected()
+            writer.close()
+
+    def _handle(self, peer: _Peer, kind: int, body: bytes) -> None:
+        if kind == _ENV:
+            topic, env = _unpack_envelope(body)
+            super().publish(topic, env)
+            self._fan_out(topic, env, peer)
+        elif kind == _LOG:
+            env, _ = messaging.decode_envelope(body)
+            if self.ledger is not None:
+                self.ledger.log(env)
+        elif kind == _SUB:
+            peer.topics.add(body.decode())
+        elif kind == _UNSUB:
+            peer.topics.discard(body.decode())
+        elif kind == _STATUS:
+            for status in json.loads(body):
+                runner = peer.runners.get(status["name"])
+                if runner is not None:
+                    runner.update(status)
+        elif kind == _AGENT:
+            info = json.loads(body)
+            runner = RemoteRunner(peer, info["name"], list(info["capabilities"]), float(info["period"]))
+            peer.runners[runner.agent.name] = runner
+            if self.on_register:
+                self.on_register(runner)
+
+
+async def _report(writer: asyncio.StreamWriter, runners: Dict[str, AgentRunner]) -> None:
+    while True:
+        status = [
+            {
+                "name": name,
+                "last_beat": r.last_beat,
+                "error_count": r.error_count,
+                "restart_streak": r.restart_streak,
+                "done": bool(r.task and r.task.done()),
+            }
+            for name, r in runners.items()
+        ]
+        _write_frame(writer, _STATUS, json.dumps(status).encode())
+        await asyncio.sleep(STATUS_INTERVAL)
+
+
+async def _connect(path: str, timeout: float = 30.0) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return await asyncio.open_unix_connection(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run_shard(settings: config.Settings, path: str, *, primary: bool = True) -> None:
+    """Run the agents for ``settings.island_backends`` until the coordinator goes away.
+
+    Only the ``primary`` shard starts process-wide singleton agents.
+    """
+    bus = ShardBus(settings)
+    reader, writer = await _connect(path)
+    bus.attach(writer)
+    ledger = RemoteLedger(writer)
+    runners: Dict[str, AgentRunner] = {}
+    liveness = LivenessTable()  # reported to the coordinator by ``_report``
+    for agent in build_agents(bus, ledger, settings, singletons=primary):
+        runner = AgentRunner(
+            agent,
+            cpu_budget=settings.agent_cpu_budget,
+            coalesce=settings.agent_coalesce_ms / 1000,
+            liveness=liveness,
+        )
+        runners[agent.name] = runner
+        info = {"name": agent.name, "capabilities": list(runner.capabilities), "period": runner.period}
+        _write_frame(writer, _AGENT, json.dumps(info).encode())
+        runner.start(bus, ledger)
+    reporter = asyncio.create_task(_report(writer, runners))
+    try:
+        while True:
+            kind, body = await _read_frame(reader)
+            if kind == _ENV:
+                bus.deliver(*_unpack_envelope(body))
+            elif kind == _RESTART:
+                runner = runners.get(body.decode())
+                if runner is not None:
+                    await runner.restart(bus, ledger)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        log.info("coordinator closed the shard link")
+    finally:
+        tasks = [reporter, *(r.task for r in runners.values() if r.task)]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        writer.close()
+
+
+def _shard_main(settings: config.Settings, path: str, primary: bool) -> None:  # pragma: no cover - subprocess
+    insight_logging.setup(json_logs=settings.json_logs)
+    asyncio.run(run_shard(settings, path, primary=primary))
+
+
+class ShardedOrchestrator(Orchestrator):
+    """Orchestrator running island agents in ``settings.shards`` worker processes.
+
+    The coordinator keeps the bus hub, the ledger, the archives and
+    ``monitor_agents``; restarts of remote agents are forwarded to their shard.
+    """
+
+    def __init__(
+        self,
+        settings: config.Settings | None = None,
+        *,
+        alert_hook: Callable[[str, str | None], None] | None = None,
+        socket_path: str | None = None,
+    ) -> None:
+        self.socket_path = socket_path or os.path.join(tempfile.mkdtemp(prefix="af-shards-"), "bus.sock")
+        self._procs: List[Any] = []
+        super().__init__(settings, alert_hook=alert_hook)
+        hub = self.bus
+        assert isinstance(hub, ShardHub)
+        hub.ledger = self.ledger
+        hub.on_register = self._attach_runner
+
+    def _create_bus(self) -> messaging.A2ABus:
+        return ShardHub(self.settings, self.socket_path)
+
+    def _init_agents(self) -> List[Any]:
+        return []
+
+    def _attach_runner(self, runner: RemoteRunner) -> None:
+        runner.liveness = self.liveness
+        self.runners[runner.agent.name] = runner  # type: ignore[assignment]
+        self._register(runner)  # type: ignore[arg-type]
+
+    def shard_settings(self) -> List[config.Settings]:
+        """Return one settings object per shard with its subset of islands."""
+        islands = list(self.settings.island_backends.items())
+        count = max(1, min(self.settings.shards, len(islands)))
+        return [
+            self.settings.model_copy(
+                update={"island_backends": dict(islands[i::count]), "bus_port": 0, "broker_url": None}
+            )
+            for i in range(count)
+        ]
+
+    def _spawn(self, settings: config.Settings, primary: bool) -> Any:
+        proc = mp.get_context("spawn").Process(
+            target=_shard_main, args=(settings, self.socket_path, primary), name="af-shard", daemon=True
+        )
+        proc.start()
+        return proc
+
+    async def _supervise(self) -> None:
+        shards = self.shard_settings()
+        self._procs = [self._spawn(s, i == 0) for i, s in enumerate(shards)]
+        while True:
+            await asyncio.sleep(1.0)
+            for i, proc in enumerate(self._procs):
+                if not proc.is_alive():
+                    log.warning("shard %d exited with %s – respawning", i, proc.exitcode)
+                    self._procs[i] = self._spawn(shards[i], i == 0)
+
+    async def run_forever(self) -> None:
+        # shards retry until the hub socket created by ``bus.start()`` accepts connections
+        supervisor = asyncio.create_task(self._supervise())
+        try:
+            await super().run_forever()
+        finally:
+            supervisor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await supervisor
+            for proc in self._procs:
+                proc.terminate()
+            for proc in self._procs:
+                proc.join(timeout=5)
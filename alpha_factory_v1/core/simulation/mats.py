@@ -5,13 +5,23 @@ This module implements a tiny subset of the NSGA‑II algorithm. The
 ``Individual`` dataclass stores genomes and fitness, while
 ``run_evolution`` executes several generations of crossover and mutation.
 It is intentionally lightweight and not a full-featured implementation.
+
+Two selection engines are available. ``"python"`` walks the population
+with plain loops while ``"numpy"`` stores fitness as an ``(N, M)`` array
+and computes dominance and crowding with broadcasting. Both engines yield
+identical ranks, crowding distances and survivor order.
 """
 
 from __future__ import annotations
 
+import atexit
+import logging
+import pickle
 import random
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from typing import Callable, Iterable, List, Tuple
+from typing import Any, Callable, Iterable, List, Tuple
 import numpy as np
 
 from alpha_factory_v1.core.evaluators.novelty import NoveltyIndex
@@ -22,12 +32,23 @@ __all__ = [
     "Population",
     "evaluate",
     "pareto_front",
+    "TOPOLOGIES",
+    "island_fronts",
     "run_evolution",
+    "run_islands",
+    "shutdown_pools",
 ]
 
+_log = logging.getLogger(__name__)
+
+# Migration topologies understood by ``run_islands``.
+TOPOLOGIES = ("ring", "full", "random")
+
 # Keep per-scenario populations for island-style evolution.
 ISLANDS: dict[str, "Population"] = {}
 ISLAND_SEEDS: dict[str, int | None] = {}
+# ``(fn, fn_batch, novelty, critics)`` each island was last scored with.
+ISLAND_EVALUATORS: dict[str, tuple[Any, ...]] = {}
 
 
 @dataclass(slots=True)
@@ -41,24 +62,95 @@ class Individual:
 
 Population = List[Individual]
 
+# Persistent worker pools keyed by size so repeated runs reuse processes.
+_POOLS: dict[int, ProcessPoolExecutor] = {}
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    pool = _POOLS.get(workers)
+    if pool is None:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        _POOLS[workers] = pool
+    return pool
+
+
+def shutdown_pools() -> None:
+    """Terminate the worker pools used for parallel evaluation."""
+
+    while _POOLS:
+        _, pool = _POOLS.popitem()
+        pool.shutdown(cancel_futures=True)
+
+
+atexit.register(shutdown_pools)
+
+
+def _map_fitness(
+    fn: Callable[[List[float]], Tuple[float, ...]],
+    genomes: List[List[float]],
+    workers: int,
+) -> List[Tuple[float, ...]]:
+    """Return ``fn`` applied to ``genomes`` in order, fanning out to ``workers`` processes."""
+
+    if workers <= 1 or len(genomes) < 2:
+        return [fn(g) for g in genomes]
+    try:
+        pickle.dumps(fn)
+    except Exception as exc:
+        _log.debug("fitness function not picklable, evaluating serially: %s", exc)
+        return [fn(g) for g in genomes]
+    # a few chunks per worker balances load while amortising pickling
+    chunksize = max(1, -(-len(genomes) // (workers * 4)))
+    try:
+        return list(_get_pool(workers).map(fn, genomes, chunksize=chunksize))
+    except BrokenProcessPool:
+        _log.warning("evaluation pool crashed, falling back to serial evaluation")
+        broken = _POOLS.pop(workers, None)
+        if broken is not None:
+            broken.shutdown(wait=False, cancel_futures=True)
+        return [fn(g) for g in genomes]
+
 
 def evaluate(
     pop: Population,
-    fn: Callable[[List[float]], Tuple[float, ...]],
+    fn: Callable[[List[float]], Tuple[float, ...]] | None,
     novelty: NoveltyIndex | None = None,
     critics: Iterable[Callable[[List[float]], float]] | None = None,
+    *,
+    fn_batch: Callable[[np.ndarray], np.ndarray] | None = None,
+    refresh: bool = False,
+    workers: int = 1,
 ) -> None:
-    """Assign fitness scores using ``fn`` plus ``critics`` and optional novelty."""
+    """Assign fitness scores using ``fn`` plus ``critics`` and optional novelty.
+
+    Individuals that already carry a fitness are skipped unless ``refresh`` is
+    set, so every genome is scored once over its lifetime. When ``fn_batch`` is
+    supplied the pending genomes are stacked into a ``(K, L)`` array and scored
+    with a single call returning a ``(K, M)`` array. Otherwise ``fn`` runs in
+    up to ``workers`` processes with results kept in population order. Surrogate
+    scores are always recomputed for the whole population.
+    """
 
-    for ind in pop:
-        base = fn(ind.genome)
-        extra = tuple(c(ind.genome) for c in (critics or []))
-        if novelty is not None:
-            spec = ",".join(f"{g:.3f}" for g in ind.genome)
-            div = novelty.divergence(spec)
-            ind.fitness = base + extra + (div,)
+    todo = [ind for ind in pop if refresh or ind.fitness is None]
+    if todo:
+        if fn_batch is not None:
+            genomes = np.asarray([ind.genome for ind in todo], dtype=float)
+            out = np.asarray(fn_batch(genomes), dtype=float).reshape(len(todo), -1)
+            bases = [tuple(row) for row in out.tolist()]
+        elif fn is not None:
+            bases = _map_fitness(fn, [ind.genome for ind in todo], workers)
         else:
-            ind.fitness = base + extra
+            raise ValueError("either fn or fn_batch is required")
+        divs: List[float] = []
+        if novelty is not None:
+            specs = [",".join(f"{g:.3f}" for g in ind.genome) for ind in todo]
+            divs = novelty.divergence_many(specs).tolist()
+        for i, (ind, base) in enumerate(zip(todo, bases)):
+            extra = tuple(c(ind.genome) for c in (critics or []))
+            if novelty is not None:
+                ind.fitness = base + extra + (divs[i],)
+            else:
+                ind.fitness = base + extra
 
     fits = [ind.fitness or () for ind in pop]
     scores = surrogate_fitness.aggregate(fits)
@@ -132,19 +224,95 @@ def _non_dominated_sort(pop: Population) -> List[Population]:
     return fronts
 
 
+def _dominance_matrix(fits: np.ndarray) -> np.ndarray:
+    """Return ``D`` where ``D[i, j]`` is ``True`` when row ``i`` dominates row ``j``."""
+
+    n = len(fits)
+    le = np.ones((n, n), dtype=bool)
+    lt = np.zeros((n, n), dtype=bool)
+    for col in fits.T:
+        le &= col[:, None] <= col[None, :]
+        lt |= col[:, None] < col[None, :]
+    return le & lt
+
+
+def _non_dominated_sort_np(pop: Population) -> List[Population]:
+    """Vectorised equivalent of :func:`_non_dominated_sort`.
+
+    Members of each front are ordered exactly as the reference
+    implementation discovers them so downstream tie-breaking matches.
+    """
+
+    if not pop:
+        return []
+    for ind in pop:
+        assert ind.fitness is not None
+    fits = np.ascontiguousarray([ind.fitness for ind in pop], dtype=float)
+    dom = _dominance_matrix(fits)
+    remaining = dom.sum(axis=0)
+    front = np.flatnonzero(remaining == 0)
+    fronts: List[Population] = []
+    rank = 0
+    while front.size:
+        for idx in front:
+            pop[idx].rank = rank
+        fronts.append([pop[idx] for idx in front])
+        sub = dom[front]
+        remaining = remaining - sub.sum(axis=0)
+        cand = np.flatnonzero((remaining == 0) & sub.any(axis=0))
+        if cand.size:
+            # the reference appends ``q`` when its last dominator in the
+            # current front is processed, iterating ``q`` in index order
+            hits = sub[:, cand]
+            last = len(front) - 1 - np.argmax(hits[::-1], axis=0)
+            cand = cand[np.lexsort((cand, last))]
+        front = cand
+        rank += 1
+    return fronts
+
+
+def _crowding_np(pop: Population) -> None:
+    """Vectorised equivalent of :func:`_crowding` preserving its final order."""
+
+    if not pop or pop[0].fitness is None:
+        return
+    fits = np.ascontiguousarray([ind.fitness for ind in pop], dtype=float)
+    order = np.arange(len(pop))
+    crowd = np.zeros(len(pop), dtype=float)
+    for i in range(fits.shape[1]):
+        order = order[np.argsort(fits[order, i], kind="stable")]
+        vals = fits[order, i]
+        crowd[order[0]] = crowd[order[-1]] = float("inf")
+        span = vals[-1] - vals[0] or 1.0
+        crowd[order[1:-1]] += (vals[2:] - vals[:-2]) / span
+    pop[:] = [pop[idx] for idx in order]
+    for ind, c in zip(pop, crowd[order]):
+        ind.crowd = float(c)
+
+
+_ENGINES: dict[str, tuple[Callable[[Population], List[Population]], Callable[[Population], None]]] = {
+    "python": (_non_dominated_sort, _crowding),
+    "numpy": (_non_dominated_sort_np, _crowding_np),
+}
+
+
 def _evolve_step(
     pop: Population,
-    fn: Callable[[List[float]], Tuple[float, ...]],
+    fn: Callable[[List[float]], Tuple[float, ...]] | None,
     *,
     rng: random.Random,
     mutation_rate: float,
     crossover_rate: float,
     novelty: NoveltyIndex | None = None,
     critics: Iterable[Callable[[List[float]], float]] | None = None,
+    engine: str = "python",
+    fn_batch: Callable[[np.ndarray], np.ndarray] | None = None,
+    workers: int = 1,
 ) -> Population:
     """Return the next generation from ``pop`` using NSGA‑II."""
 
-    evaluate(pop, fn, novelty, critics)
+    sort_fn, crowd_fn = _ENGINES[engine]
+    evaluate(pop, fn, novelty, critics, fn_batch=fn_batch, workers=workers)
     mu = len(pop)
     genome_length = len(pop[0].genome)
     offspring: Population = []
@@ -162,12 +330,12 @@ def _evolve_step(
             idx = rng.randrange(genome_length)
             child_genome[idx] += rng.uniform(-1, 1)
         offspring.append(Individual(child_genome))
-    evaluate(offspring, fn, novelty, critics)
+    evaluate(offspring, fn, novelty, critics, fn_batch=fn_batch, workers=workers)
     union = pop + offspring
-    fronts = _non_dominated_sort(union)
+    fronts = sort_fn(union)
     new_pop: Population = []
     for front in fronts:
-        _crowding(front)
+        crowd_fn(front)
         front.sort(key=lambda x: (-x.rank, -x.crowd))
         for ind in front:
             if len(new_pop) < mu:
@@ -176,7 +344,7 @@ def _evolve_step(
 
 
 def run_evolution(
-    fn: Callable[[List[float]], Tuple[float, ...]],
+    fn: Callable[[List[float]], Tuple[float, ...]] | None,
     genome_length: int,
     *,
     population_size: int = 20,
@@ -189,11 +357,15 @@ def run_evolution(
     exchange_interval: int = 5,
     novelty_index: NoveltyIndex | None = None,
     critics: Iterable[Callable[[List[float]], float]] | None = None,
+    engine: str = "python",
+    fn_batch: Callable[[np.ndarray], np.ndarray] | None = None,
+    workers: int = 1,
 ) -> Population:
     """Run an NSGA-II optimisation.
 
     Args:
-        fn: Function evaluating an individual's genome.
+        fn: Function evaluating an individual's genome. May be ``None`` when
+            ``fn_batch`` is given.
         genome_length: Number of float genes per individual.
         population_size: Number of individuals preserved each generation.
         mutation_rate: Probability of mutating a gene during crossover.
@@ -203,11 +375,22 @@ def run_evolution(
         scenario_hash: Key identifying the island population.
         populations: Mapping of existing island populations.
         exchange_interval: Exchange elites every ``exchange_interval`` generations.
+        engine: Selection backend, either ``"python"`` or ``"numpy"``.
+        fn_batch: Vectorised evaluator mapping a ``(K, genome_length)`` array
+            of genomes to a ``(K, M)`` array of objectives. Takes precedence
+            over ``fn``.
+        workers: Number of processes used to evaluate ``fn``. Falls back to
+            serial evaluation when ``fn`` cannot be pickled.
 
     Returns:
         The final population after ``generations`` steps.
     """
 
+    if engine not in _ENGINES:
+        raise ValueError(f"unknown engine {engine!r}; expected one of {sorted(_ENGINES)}")
+    if fn is None and fn_batch is None:
+        raise ValueError("either fn or fn_batch is required")
+
     rng = random.Random(seed)
     islands = populations if populations is not None else ISLANDS
     key = scenario_hash or "default"
@@ -215,8 +398,15 @@ def run_evolution(
 
     pop = None if populations is None else islands.get(key)
     ISLAND_SEEDS[key] = seed
+    critics = list(critics or [])
+    evaluator = (fn, fn_batch, novelty, tuple(critics))
+    previous = ISLAND_EVALUATORS.get(key)
+    ISLAND_EVALUATORS[key] = evaluator
     if pop is None:
         pop = [Individual([rng.uniform(-1, 1) for _ in range(genome_length)]) for _ in range(population_size)]
+    elif previous != evaluator:
+        # cached fitness belongs to the objectives the island was last run with
+        evaluate(pop, fn, novelty, critics, fn_batch=fn_batch, workers=workers, refresh=True)
     islands[key] = pop
 
     for gen in range(generations):
@@ -228,20 +418,181 @@ def run_evolution(
             crossover_rate=crossover_rate,
             novelty=novelty,
             critics=critics,
+            engine=engine,
+            fn_batch=fn_batch,
+            workers=workers,
         )
         islands[key] = pop
         if exchange_interval and (gen + 1) % exchange_interval == 0 and len(islands) > 1:
             elite_map = {k: pareto_front(p)[:2] for k, p in islands.items()}
             for k, island_pop in islands.items():
-                others = [ind for ok, e in elite_map.items() if ok != k for ind in e]
-                for ind in others:
-                    repl = rng.randrange(len(island_pop))
-                    island_pop[repl] = Individual(list(ind.genome))
-                evaluate(island_pop, fn, novelty, critics)
+                island_eval = ISLAND_EVALUATORS.get(k, evaluator)
+                for ok, elites in elite_map.items():
+                    if ok == k:
+                        continue
+                    # migrants keep their fitness only when it was computed by the same objectives
+                    same = ISLAND_EVALUATORS.get(ok) == island_eval
+                    for ind in elites:
+                        repl = rng.randrange(len(island_pop))
+                        island_pop[repl] = Individual(list(ind.genome), ind.fitness if same else None)
+                k_fn, k_batch, k_novelty, k_critics = island_eval
+                evaluate(island_pop, k_fn, k_novelty, list(k_critics), fn_batch=k_batch, workers=workers)
 
     return islands[key]
 
 
+def _advance_island(
+    pop: Population,
+    fn: Callable[[List[float]], Tuple[float, ...]] | None,
+    generations: int,
+    rng: random.Random,
+    step_kwargs: dict[str, Any],
+) -> tuple[Population, random.Random]:
+    """Evolve one island for ``generations`` steps; runs inside a worker process."""
+
+    for _ in range(generations):
+        pop = _evolve_step(pop, fn, rng=rng, **step_kwargs)
+    return pop, rng
+
+
+def _migration_sources(topology: str, names: List[str], rng: random.Random) -> dict[str, List[str]]:
+    """Return the islands each island receives migrants from."""
+
+    if topology == "ring":
+        return {name: [names[i - 1]] for i, name in enumerate(names)}
+    if topology == "full":
+        return {name: [o for o in names if o != name] for name in names}
+    return {name: [rng.choice([o for o in names if o != name])] for name in names}
+
+
+def run_islands(
+    fn: Callable[[List[float]], Tuple[float, ...]] | None,
+    genome_length: int,
+    islands: int | Iterable[str] = 4,
+    *,
+    population_size: int = 20,
+    mutation_rate: float = 0.1,
+    crossover_rate: float = 0.5,
+    generations: int = 10,
+    seed: int | None = None,
+    populations: dict[str, Population] | None = None,
+    topology: str = "ring",
+    migration_interval: int = 5,
+    migrants: int = 2,
+    parallel: bool = True,
+    novelty_index: NoveltyIndex | None = None,
+    critics: Iterable[Callable[[List[float]], float]] | None = None,
+    engine: str = "python",
+    fn_batch: Callable[[np.ndarray], np.ndarray] | None = None,
+) -> dict[str, Population]:
+    """Advance every island of an experiment concurrently with periodic migration.
+
+    Islands evolve independently for ``migration_interval`` generations, one
+    worker process per island, after which up to ``migrants`` Pareto elites
+    move along ``topology``: ``"ring"`` sends elites to the next island,
+    ``"full"`` to every other island, and with ``"random"`` each island
+    receives from one randomly chosen island per epoch. Results are gathered in island order so seeded runs
+    are reproducible. Evolution stays in-process when ``parallel`` is false
+    or the evaluation callables cannot be pickled.
+
+    Args:
+        fn: Function evaluating an individual's genome.
+        genome_length: Number of float genes per individual.
+        islands: Island names or the number of islands to create.
+        population_size: Individuals per newly created island.
+        mutation_rate: Probability of mutating a gene during crossover.
+        crossover_rate: Probability of performing crossover between parents.
+        generations: Total number of NSGA-II steps per island.
+        seed: Optional random seed for deterministic behaviour.
+        populations: Mapping of existing island populations, updated in place.
+        topology: Migration topology, one of :data:`TOPOLOGIES`.
+        migration_interval: Generations between migrations. ``0`` disables migration.
+        migrants: Number of elites each source island contributes.
+        parallel: Run islands in separate processes.
+        novelty_index: Optional novelty index appended as an objective.
+        critics: Additional objective callables.
+        engine: Selection backend, either ``"python"`` or ``"numpy"``.
+        fn_batch: Vectorised evaluator, see :func:`run_evolution`.
+
+    Returns:
+        Mapping of island name to its final population.
+    """
+
+    if engine not in _ENGINES:
+        raise ValueError(f"unknown engine {engine!r}; expected one of {sorted(_ENGINES)}")
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"unknown topology {topology!r}; expected one of {list(TOPOLOGIES)}")
+    if fn is None and fn_batch is None:
+        raise ValueError("either fn or fn_batch is required")
+
+    names = [f"island-{i}" for i in range(islands)] if isinstance(islands, int) else list(islands)
+    pops = populations if populations is not None else {}
+    rng = random.Random(seed)
+    rngs = {name: random.Random(rng.getrandbits(64)) for name in names}
+    resumed = {name: bool(pops.get(name)) for name in names}
+    for name in names:
+        if not pops.get(name):
+            pops[name] = [
+                Individual([rngs[name].uniform(-1, 1) for _ in range(genome_length)]) for _ in range(population_size)
+            ]
+        ISLAND_SEEDS[name] = seed
+
+    critics = list(critics or [])
+    evaluator = (fn, fn_batch, novelty_index, tuple(critics))
+    for name in names:
+        if resumed[name] and ISLAND_EVALUATORS.get(name) != evaluator:
+            evaluate(pops[name], fn, novelty_index, critics, fn_batch=fn_batch, refresh=True)
+        ISLAND_EVALUATORS[name] = evaluator
+    step_kwargs: dict[str, Any] = {
+        "mutation_rate": mutation_rate,
+        "crossover_rate": crossover_rate,
+        "novelty": novelty_index,
+        "critics": critics,
+        "engine": engine,
+        "fn_batch": fn_batch,
+    }
+    pool: ProcessPoolExecutor | None = None
+    if parallel and len(names) > 1:
+        try:
+            pickle.dumps((fn, step_kwargs))
+            pool = _get_pool(len(names))
+        except Exception as exc:
+            _log.debug("island payload not picklable, evolving islands serially: %s", exc)
+
+    interval = migration_interval or generations
+    remaining = generations
+    while remaining > 0:
+        span = min(interval, remaining)
+        remaining -= span
+        if pool is not None:
+            futures = [pool.submit(_advance_island, pops[name], fn, span, rngs[name], step_kwargs) for name in names]
+            results = [f.result() for f in futures]
+        else:
+            results = [_advance_island(pops[name], fn, span, rngs[name], step_kwargs) for name in names]
+        for name, (pop, island_rng) in zip(names, results):
+            pops[name] = pop
+            rngs[name] = island_rng
+
+        if migration_interval and migrants > 0 and len(names) > 1 and span == interval:
+            elites = {name: pareto_front(pops[name])[:migrants] for name in names}
+            for name, sources in _migration_sources(topology, names, rng).items():
+                island_pop = pops[name]
+                for src in sources:
+                    for ind in elites[src]:
+                        repl = rng.randrange(len(island_pop))
+                        island_pop[repl] = Individual(list(ind.genome), ind.fitness)
+            for name in names:
+                evaluate(pops[name], fn, novelty_index, critics, fn_batch=fn_batch)
+
+    return {name: pops[name] for name in names}
+
+
+def island_fronts(populations: dict[str, Population]) -> dict[str, Population]:
+    """Return the Pareto front of each island in ``populations``."""
+
+    return {name: pareto_front(pop) for name, pop in populations.items()}
+
+
 def pareto_front(pop: Population) -> Population:
     """Return the non-dominated set ranked by crowding distance."""
 
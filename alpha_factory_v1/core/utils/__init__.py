@@ -9,13 +9,18 @@ import logging as _stdlib_logging
 
 from .config import CFG, get_secret
 
-try:
-    from .visual import plot_pareto
-except Exception:  # pragma: no cover - optional dependency
 
-    def plot_pareto(elites: Iterable[Any], out_path: Path) -> None:
-        """Stub when plotly is unavailable."""
+def plot_pareto(elites: Iterable[Any], out_path: Path) -> None:
+    """Plot ``elites`` via :mod:`.visual`, imported on first call.
+
+    pandas and plotly dominate the import time of this package, so they are
+    only loaded when a plot is requested. Does nothing when they are missing.
+    """
+    try:
+        from .visual import plot_pareto as _plot_pareto
+    except Exception:  # pragma: no cover - optional dependency
         return None
+    _plot_pareto(elites, out_path)
 
 
 from .file_ops import view, str_replace
@@ -23,32 +28,26 @@ from alpha_factory_v1.common.utils import logging
 
 _logger = _stdlib_logging.getLogger(__name__)
 
-try:
-    from .snark import (
-        aggregate_proof,
-        generate_proof,
-        publish_proof,
-        verify_aggregate_proof,
-        verify_proof,
-    )
-except Exception as exc:  # pragma: no cover - optional zk-SNARK deps
-    _logger.warning("Skipping zk-SNARK helpers: %s", exc)
-    _missing_snark_exc = exc
+_SNARK_HELPERS = frozenset(
+    {"aggregate_proof", "generate_proof", "publish_proof", "verify_aggregate_proof", "verify_proof"}
+)
 
-    def generate_proof(*_: Any, **__: Any) -> None:
-        raise ImportError("zk-SNARK helpers unavailable") from _missing_snark_exc
 
-    def publish_proof(*_: Any, **__: Any) -> None:
-        raise ImportError("zk-SNARK helpers unavailable") from _missing_snark_exc
-
-    def verify_proof(*_: Any, **__: Any) -> None:
-        raise ImportError("zk-SNARK helpers unavailable") from _missing_snark_exc
+def __getattr__(name: str) -> Any:
+    """Import the zk-SNARK helpers on first access; they pull in SQLAlchemy."""
+    if name not in _SNARK_HELPERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        from . import snark
+    except Exception as exc:  # pragma: no cover - optional zk-SNARK deps
+        _logger.warning("Skipping zk-SNARK helpers: %s", exc)
+        _missing_snark_exc = exc
 
-    def aggregate_proof(*_: Any, **__: Any) -> None:
-        raise ImportError("zk-SNARK helpers unavailable") from _missing_snark_exc
+        def _missing(*_: Any, **__: Any) -> None:
+            raise ImportError("zk-SNARK helpers unavailable") from _missing_snark_exc
 
-    def verify_aggregate_proof(*_: Any, **__: Any) -> None:
-        raise ImportError("zk-SNARK helpers unavailable") from _missing_snark_exc
+        return _missing
+    return getattr(snark, name)
 
 
 def _optional_import(module: str) -> Any:
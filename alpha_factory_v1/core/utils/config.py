@@ -107,6 +107,9 @@ class Settings(SettingsBase):
     offline: bool = Field(default=False, alias="AGI_INSIGHT_OFFLINE")
     bus_port: int = Field(default=6006, alias="AGI_INSIGHT_BUS_PORT")
     ledger_path: str = Field(default="./ledger/audit.db", alias="AGI_INSIGHT_LEDGER_PATH")
+    ledger_batch_size: int = Field(default=0, alias="AGI_INSIGHT_LEDGER_BATCH")
+    ledger_flush_ms: float = Field(default=50.0, alias="AGI_INSIGHT_LEDGER_FLUSH_MS")
+    ledger_async: bool = Field(default=False, alias="AGI_INSIGHT_LEDGER_ASYNC")
     seed: Optional[int] = Field(default=None, alias="SEED")
     memory_path: Optional[str] = Field(default=None, alias="AGI_INSIGHT_MEMORY_PATH")
     broker_url: Optional[str] = Field(default=None, alias="AGI_INSIGHT_BROKER_URL")
@@ -114,6 +117,11 @@ class Settings(SettingsBase):
     bus_cert: Optional[str] = Field(default=None, alias="AGI_INSIGHT_BUS_CERT")
     bus_key: Optional[str] = Field(default=None, alias="AGI_INSIGHT_BUS_KEY")
     bus_fail_limit: int = Field(default=3, alias="AGI_INSIGHT_BUS_FAIL_LIMIT")
+    bus_wire: str = Field(default="json", alias="AGI_INSIGHT_BUS_WIRE")
+    bus_queue_size: int = Field(default=0, alias="AGI_INSIGHT_BUS_QUEUE_SIZE")
+    bus_overflow: str = Field(default="block", alias="AGI_INSIGHT_BUS_OVERFLOW")
+    bus_shm_dir: Optional[str] = Field(default=None, alias="AGI_INSIGHT_BUS_SHM_DIR")
+    bus_shm_size: int = Field(default=1 << 20, alias="AGI_INSIGHT_BUS_SHM_SIZE")
     alert_webhook_url: Optional[str] = Field(default=None, alias="ALERT_WEBHOOK_URL")
     allow_insecure: bool = Field(default=False, alias="AGI_INSIGHT_ALLOW_INSECURE")
     broadcast: bool = Field(default=True, alias="AGI_INSIGHT_BROADCAST")
@@ -125,6 +133,10 @@ class Settings(SettingsBase):
     context_window: int = Field(default=8192, alias="AGI_CONTEXT_WINDOW")
     json_logs: bool = Field(default=False, alias="AGI_INSIGHT_JSON_LOGS")
     db_type: str = Field(default="sqlite", alias="AGI_INSIGHT_DB")
+    shards: int = Field(default=0, alias="AGI_INSIGHT_SHARDS")
+    agent_cpu_budget: float = Field(default=1.0, alias="AGI_INSIGHT_AGENT_CPU_BUDGET")
+    agent_coalesce_ms: float = Field(default=10.0, alias="AGI_INSIGHT_AGENT_COALESCE_MS")
+    heartbeat_snapshot: float = Field(default=60.0, alias="AGI_INSIGHT_HEARTBEAT_SNAPSHOT")
     island_backends: dict[str, str] = Field(
         default_factory=lambda: {"default": "gpt-4o"},
         alias="AGI_ISLAND_BACKENDS",
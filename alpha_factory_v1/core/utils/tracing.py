@@ -37,6 +37,8 @@ __all__ = [
     "span",
     "configure",
     "bus_messages_total",
+    "bus_queue_depth",
+    "bus_dropped_total",
     "agent_cycle_seconds",
     "api_request_seconds",
 ]
@@ -48,10 +50,10 @@ try:
     import prometheus_client as pc
 
     prometheus_client = pc
-    from prometheus_client import Counter, Histogram
+    from prometheus_client import Counter, Gauge, Histogram
 except ModuleNotFoundError:  # pragma: no cover - optional
     prometheus_client = None
-    Counter = Histogram = None
+    Counter = Gauge = Histogram = None
 
 
 def _noop(*_a: Any, **_kw: Any) -> Any:
@@ -65,6 +67,9 @@ def _noop(*_a: Any, **_kw: Any) -> Any:
         def inc(self, *_a: Any) -> None:
             ...
 
+        def set(self, *_a: Any) -> None:
+            ...
+
     return _N()
 
 
@@ -80,6 +85,18 @@ if prometheus_client is not None:
         "Messages published on the internal bus",
         ["topic"],
     )
+    bus_queue_depth = _get_metric(
+        Gauge,
+        "bus_queue_depth",
+        "Envelopes waiting in subscriber queues",
+        ["topic"],
+    )
+    bus_dropped_total = _get_metric(
+        Counter,
+        "bus_dropped_total",
+        "Envelopes dropped by full subscriber queues",
+        ["topic"],
+    )
     agent_cycle_seconds = _get_metric(
         Histogram,
         "agent_cycle_seconds",
@@ -94,6 +111,8 @@ if prometheus_client is not None:
     )
 else:  # pragma: no cover - prometheus not installed
     bus_messages_total = _noop()
+    bus_queue_depth = _noop()
+    bus_dropped_total = _noop()
     agent_cycle_seconds = _noop()
     api_request_seconds = _noop()
 
@@ -11,6 +11,8 @@ from alpha_factory_v1.core.utils.tracing import span
 class ADKSummariserAgent(BaseAgent):
     """Collect research updates and produce a summary using ADK."""
 
+    WARM_STATE = ("_records",)
+
     def __init__(
         self,
         bus: messaging.A2ABus,
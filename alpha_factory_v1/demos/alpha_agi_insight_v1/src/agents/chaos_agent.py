@@ -12,6 +12,8 @@ from alpha_factory_v1.core.utils.tracing import span
 class ChaosAgent(BaseAgent):
     """Emit a burst of harmful code snippets."""
 
+    WARM_STATE = ("burst",)
+
     def __init__(self, bus: messaging.A2ABus, ledger: "Ledger", burst: int = 20) -> None:
         super().__init__("chaos", bus, ledger)
         self.burst = burst
@@ -37,6 +37,8 @@ def _coerce_payload(payload: object) -> JSONValue:
 class MemoryAgent(BaseAgent):
     """Persist artefacts produced by other agents."""
 
+    WARM_STATE = ("_limit", "records", "_store")
+
     def __init__(
         self,
         bus: messaging.A2ABus,
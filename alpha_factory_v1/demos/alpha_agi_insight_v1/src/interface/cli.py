@@ -33,9 +33,7 @@ except Exception:  # pragma: no cover - optional
 
 from alpha_factory_v1.core import orchestrator
 from alpha_factory_v1.core.self_evolution import self_improver
-from alpha_factory_v1.core.archive.hash_archive import HashArchive
 from alpha_factory_v1.core.simulation import forecast, sector, mats
-from alpha_factory_v1.core.utils.visual import plot_pareto
 from alpha_factory_v1.common.utils import config, logging
 from alpha_factory_v1.core.eval.foresight import evaluate as foresight_evaluate
 
@@ -382,6 +380,8 @@ def simulate(
             generations=generations,
         )
         elites = [ind for ind in pop if ind.rank == 0]
+        from alpha_factory_v1.core.utils.visual import plot_pareto  # pandas/plotly are slow to import
+
         plot_pareto(elites, Path("pareto.png"))
 
     if not start_orchestrator:
@@ -669,6 +669,7 @@ def archive() -> None:
 @click.option("--db", "db_path", default="hash_archive.db", show_default=True, help="Archive database path")
 def archive_ls(proof: bool, db_path: str) -> None:
     """List pinned CIDs."""
+    from alpha_factory_v1.core.archive.hash_archive import HashArchive
 
     arch = HashArchive(db_path)
     entries = arch.list_entries()
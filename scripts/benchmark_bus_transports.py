@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: Apache-2.0
+"""Compare the shared-memory and gRPC A2A bus transports between two processes.
+
+A subscriber process runs an :class:`A2ABus` and records the one-way latency
+of every envelope; the parent publishes ``--count`` envelopes through the
+selected transport and reports envelopes/sec and latency percentiles. With
+the default ``--interval 0`` the latency includes queueing behind the burst;
+pace the sender to compare unloaded latency.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import socket
+import tempfile
+import time
+
+from alpha_factory_v1.common.utils import config, messaging
+from alpha_factory_v1.core.utils import a2a_pb2 as pb
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return int(s.getsockname()[1])
+
+
+def _subscriber(settings: config.Settings, count: int, ready: mp.Event, out: mp.Queue) -> None:
+    async def run() -> None:
+        lat: list[float] = []
+        done = asyncio.Event()
+
+        def handler(env: messaging.EnvelopeLike) -> None:
+            lat.append(time.perf_counter() - env.ts)
+            if len(lat) == count:
+                done.set()
+
+        async with messaging.A2ABus(settings) as bus:
+            bus.subscribe("bench", handler)
+            ready.set()
+            try:
+                await asyncio.wait_for(done.wait(), timeout=60)
+            except asyncio.TimeoutError:
+                pass
+        out.put((lat, time.perf_counter()))
+
+    asyncio.run(run())
+
+
+async def _publish_shm(settings: config.Settings, envs: list[pb.Envelope], interval: float) -> int:
+    async with messaging.A2ABus(settings) as bus:
+        assert bus._shm is not None
+        for env in envs:
+            env.ts = time.perf_counter()
+            bus.publish("bench", env)
+            await asyncio.sleep(interval)
+        return bus._shm.dropped
+
+
+async def _publish_grpc(port: int, envs: list[pb.Envelope], interval: float) -> int:
+    import grpc
+
+    async with grpc.aio.insecure_channel(f"localhost:{port}") as ch:
+        stub = ch.unary_unary("/bus.Bus/Send")
+        reply = await stub(f"{messaging.A2ABus.PROTO_VERSION} bench wire={messaging.WIRE_BINARY}".encode())
+        binary = reply.endswith(f"wire={messaging.WIRE_BINARY}".encode())
+        wire = messaging.WIRE_BINARY if binary else messaging.WIRE_JSON
+        for env in envs:
+            env.ts = time.perf_counter()
+            await stub(messaging.encode_envelope(env, wire))
+            if interval:
+                await asyncio.sleep(interval)
+    return 0
+
+
+def _run(transport: str, count: int, size: int, shm_size: int, interval: float) -> tuple[float, list[float], int]:
+    if transport == "shm":
+        settings = config.Settings(bus_port=0, bus_shm_dir=tempfile.mkdtemp(), bus_shm_size=shm_size)
+    else:
+        settings = config.Settings(bus_port=_free_port(), allow_insecure=True)
+    ctx = mp.get_context("spawn")
+    ready, out = ctx.Event(), ctx.Queue()
+    proc = ctx.Process(target=_subscriber, args=(settings, count, ready, out))
+    proc.start()
+    if not ready.wait(60):
+        proc.terminate()
+        raise SystemExit(f"{transport} subscriber did not start")
+    envs = [pb.Envelope(sender="bench", recipient="bench") for _ in range(count)]
+    for env in envs:
+        env.payload.update({"blob": "x" * size})
+    # let the subscriber's ring show up in the shared directory
+    time.sleep(0.1)
+    start = time.perf_counter()
+    if transport == "shm":
+        dropped = asyncio.run(_publish_shm(settings.model_copy(), envs, interval))
+    else:
+        dropped = asyncio.run(_publish_grpc(settings.bus_port, envs, interval))
+    lat, end = out.get(timeout=120)
+    proc.join()
+    return end - start, sorted(lat), dropped
+
+
+def _pct(values: list[float], q: float) -> float:
+    return values[min(len(values) - 1, int(q * len(values)))] * 1e6 if values else float("nan")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transports", default="shm,grpc", help="Comma separated transports")
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--payload", type=int, default=128, help="Payload size in bytes")
+    parser.add_argument("--shm-size", type=int, default=1 << 24, help="Ring size in bytes")
+    parser.add_argument(
+        "--interval", type=float, default=0.0, help="Seconds between sends; 0 measures saturated throughput"
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{'transport':>9} {'env/s':>10} {'p50 [us]':>10} {'p99 [us]':>10} {'lost':>6}")
+    for transport in (t.strip() for t in args.transports.split(",") if t.strip()):
+        elapsed, lat, dropped = _run(transport, args.count, args.payload, args.shm_size, args.interval)
+        rate = len(lat) / max(elapsed, 1e-9)
+        lost = args.count - len(lat)
+        print(f"{transport:>9} {rate:>10.0f} {_pct(lat, 0.5):>10.1f} {_pct(lat, 0.99):>10.1f} {lost:>6}")
+        if dropped:
+            print(f"{'':>9} {dropped} frames did not fit the ring; raise --shm-size")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: Apache-2.0
+"""Benchmark the two-tier LLM response cache under concurrent ``achat`` callers.
+
+Each of ``--callers`` threads runs its own event loop and issues
+``--requests`` :meth:`LLMProvider.achat` calls drawn from ``--prompts``
+distinct prompts against a stub provider that sleeps ``--latency`` seconds.
+Reports calls/sec, upstream calls and the cache hit/miss/eviction counters.
+Point ``AF_LLM_CACHE_PATH`` elsewhere to keep the benchmark out of the real
+cache; a temporary file is used by default.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--callers", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500, help="calls per caller")
+    parser.add_argument("--prompts", type=int, default=2000, help="distinct prompts")
+    parser.add_argument("--latency", type=float, default=0.002, help="stub provider latency in seconds")
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ.setdefault("AF_LLM_CACHE_PATH", str(Path(tmp.name) / "llm.sqlite"))
+    os.environ.setdefault("AGI_INSIGHT_OFFLINE", "1")
+    from alpha_factory_v1.backend.utils import llm_cache, llm_provider as llm
+
+    upstream = 0
+    lock = threading.Lock()
+
+    class _Sleepy(llm._Provider):
+        name = "bench"
+
+        def _invoke(self, msgs, temperature, max_tokens, stream, stop):
+            nonlocal upstream
+            with lock:
+                upstream += 1
+            time.sleep(args.latency)
+            return "answer to " + msgs[-1]["content"]
+
+    os.environ.setdefault("AF_LLM_BENCH_RPM", "1e9")
+    os.environ.setdefault("AF_LLM_BENCH_TPM", "1e12")
+    llm._PROVIDERS = {"bench": _Sleepy()}
+    client = llm.LLMProvider()
+
+    def caller(seed: int) -> None:
+        rng = random.Random(seed)
+
+        async def run() -> None:
+            for _ in range(args.requests):
+                await client.achat(f"prompt {rng.randrange(args.prompts)}")
+
+        asyncio.run(run())
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(args.callers)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    total = args.callers * args.requests
+    print(f"{total} calls from {args.callers} callers in {elapsed:.2f}s ({total / elapsed:,.0f} calls/s)")
+    print(f"upstream calls: {upstream}")
+    for (tier, event), n in sorted(llm_cache._cache_stats.items()):
+        print(f"  {tier:4} {event:9} {n}")
+    if llm_cache._DB:
+        llm_cache._DB.close()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: Apache-2.0
+"""Compare the python and numpy NSGA-II selection engines in ``mats``."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from alpha_factory_v1.core.simulation import mats
+
+
+def _population(size: int, objectives: int, seed: int) -> mats.Population:
+    rng = random.Random(seed)
+    return [mats.Individual([0.0], tuple(rng.random() for _ in range(objectives))) for _ in range(size)]
+
+
+def _time_engine(engine: str, pop: mats.Population) -> tuple[float, list[int]]:
+    sort_fn, crowd_fn = mats._ENGINES[engine]
+    work = [mats.Individual(ind.genome, ind.fitness) for ind in pop]
+    start = time.perf_counter()
+    for front in sort_fn(work):
+        crowd_fn(front)
+    return time.perf_counter() - start, [ind.rank for ind in work]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="100,1000,5000", help="Comma separated population sizes")
+    parser.add_argument("--objectives", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'N':>6} {'python [s]':>12} {'numpy [s]':>12} {'speedup':>9}")
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        pop = _population(size, args.objectives, args.seed)
+        py_t, py_ranks = _time_engine("python", pop)
+        np_t, np_ranks = _time_engine("numpy", pop)
+        if py_ranks != np_ranks:
+            raise SystemExit(f"rank mismatch at N={size}")
+        print(f"{size:>6} {py_t:>12.4f} {np_t:>12.4f} {py_t / max(np_t, 1e-9):>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: Apache-2.0
+"""Summarise ``python -X importtime`` for a module.
+
+Imports ``--module`` in a fresh interpreter, prints the total import time and
+the slowest modules by cumulative and self time. ``--forbid`` names modules
+that must stay out of the import graph (e.g. agent modules or backends that
+should load lazily) and ``--budget`` caps the total in seconds; either check
+failing makes the script exit non-zero.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+
+
+def profile(module: str) -> list[ImportRecord]:
+    """Return one record per module imported by ``import module``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records: list[ImportRecord] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us)))
+    return records
+
+
+def total_seconds(records: list[ImportRecord]) -> float:
+    """Wall time spent importing, in seconds."""
+    return sum(r.self_us for r in records) / 1e6
+
+
+def imported(records: list[ImportRecord], prefix: str) -> bool:
+    """Whether ``prefix`` or one of its submodules was imported."""
+    return any(r.name == prefix or r.name.startswith(prefix + ".") for r in records)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="alpha_factory_v1.core.orchestrator")
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    parser.add_argument("--forbid", action="append", default=[], help="module that must not be imported")
+    parser.add_argument("--budget", type=float, default=0.0, help="maximum total import time in seconds")
+    args = parser.parse_args(argv)
+
+    records = profile(args.module)
+    total = total_seconds(records)
+    print(f"{args.module}: {len(records)} modules, {total:.3f}s")
+    for title, key in (("cumulative", "cumulative_us"), ("self", "self_us")):
+        print(f"\nslowest by {title} time:")
+        for rec in sorted(records, key=lambda r: getattr(r, key), reverse=True)[: args.top]:
+            print(f"  {getattr(rec, key) / 1e3:9.1f} ms  {rec.name}")
+
+    failed = False
+    for name in args.forbid:
+        if imported(records, name):
+            print(f"error: {name} imported eagerly", file=sys.stderr)
+            failed = True
+    if args.budget and total > args.budget:
+        print(f"error: import took {total:.3f}s, budget {args.budget:.3f}s", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,8 +3,11 @@ import asyncio
 import contextlib
 from unittest.mock import patch
 
+import pytest
+
 from alpha_factory_v1.demos.alpha_agi_insight_v1.src import orchestrator
 from alpha_factory_v1.common.utils import messaging
+from alpha_factory_v1.backend import orchestrator_utils
 
 
 class DummyAgent:
@@ -98,3 +101,176 @@ def test_restart_unsubscribes_handler() -> None:
     assert agent.count == 1
     assert after == 1
     assert len(bus._subs.get("dummy", [])) == 1
+
+
+class _SlowAgent:
+    name = "slow"
+    CYCLE_SECONDS = 60.0
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def run_cycle(self) -> None:
+        self.calls += 1
+
+
+def test_runner_wakes_on_envelope_and_coalesces() -> None:
+    bus = messaging.A2ABus(orchestrator.config.Settings(bus_port=0))
+    agent = _SlowAgent()
+    runner = orchestrator.AgentRunner(agent, coalesce=0.05)
+
+    async def _run() -> list[int]:
+        calls = []
+        runner.start(bus, _Ledger())
+        await asyncio.sleep(0.01)
+        calls.append(agent.calls)
+        for _ in range(5):
+            bus.publish("slow", messaging.Envelope(sender="a", recipient="slow", ts=0.0))
+        await asyncio.sleep(0.1)
+        calls.append(agent.calls)
+        assert runner.task is not None
+        runner.task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await runner.task
+        return calls
+
+    assert asyncio.run(_run()) == [1, 2]
+    assert "slow" not in bus._subs
+
+
+def test_runner_cpu_budget_pauses_after_cycle() -> None:
+    runner = orchestrator.AgentRunner(_SlowAgent(), cpu_budget=0.25)
+    pauses: list[float] = []
+
+    async def _run() -> None:
+        async def _sleep(delay: float) -> None:
+            pauses.append(delay)
+            raise asyncio.CancelledError()
+
+        runner._wake = asyncio.Event()
+        with patch.object(asyncio, "sleep", _sleep), contextlib.suppress(asyncio.CancelledError):
+            await runner._idle(0.1)
+
+    asyncio.run(_run())
+    assert pauses == [pytest.approx(0.3)]
+
+
+def test_liveness_table_bypasses_ledger_and_bus() -> None:
+    agent = DummyAgent()
+    table = orchestrator_utils.LivenessTable()
+    runner = orchestrator.AgentRunner(agent, liveness=table)
+    events: list[str] = []
+
+    class Bus:
+        def publish(self, topic: str, env: messaging.Envelope) -> None:
+            events.append("pub")
+
+    class Ledger:
+        def log(self, env: messaging.Envelope) -> None:
+            events.append("log")
+
+    async def run_once() -> None:
+        async def _sleep(_: float) -> None:
+            raise asyncio.CancelledError()
+
+        with patch.object(asyncio, "sleep", _sleep), contextlib.suppress(asyncio.CancelledError):
+            await runner.loop(Bus(), Ledger())
+
+    before = runner.last_beat
+    asyncio.run(run_once())
+
+    assert events == []
+    assert runner.last_beat == table.last_beat("dummy") >= before
+    snap = table.snapshot()
+    assert snap.payload["event"] == "liveness"
+    assert snap.payload["agents"]["dummy"]["beats"] == 1
+
+
+class _RestartableAgent:
+    CYCLE_SECONDS = 0.05
+
+    def __init__(self, *_a: object) -> None:
+        self.name = f"agent{id(self)}"
+
+    async def run_cycle(self) -> None:
+        pass
+
+
+def test_supervisor_backoff_does_not_block_other_agents() -> None:
+    slow = orchestrator_utils.AgentRunner(_RestartableAgent())
+    fast = orchestrator_utils.AgentRunner(_RestartableAgent())
+    slow.restart_streak = 20  # pending backoff far longer than the test
+    slow.error_count = fast.error_count = 5
+    restarted: list[orchestrator_utils.AgentRunner] = []
+    sup = orchestrator_utils.Supervisor(
+        {"slow": slow, "fast": fast},
+        object(),
+        object(),
+        backoff_exp_after=1,
+        on_restart=restarted.append,
+    )
+
+    async def run() -> None:
+        with patch.object(orchestrator_utils.random, "uniform", lambda _a, _b: 0.01):
+            task = asyncio.create_task(sup.run())
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if restarted:
+                    break
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        for r in (slow, fast):
+            if r.task:
+                r.task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await r.task
+
+    asyncio.run(run())
+
+    assert restarted == [fast]
+    assert slow.restarts == 0
+
+
+class _StatefulAgent:
+    name = "stateful"
+    CYCLE_SECONDS = 1.0
+    loads = 0
+
+    def __init__(self, *_a: object) -> None:
+        type(self).loads += 1
+        self.records = ["loaded"]
+
+    def snapshot(self) -> dict[str, object]:
+        return {"records": self.records}
+
+    @classmethod
+    def restore(cls, _bus: object, _ledger: object, state: dict[str, object]) -> "_StatefulAgent":
+        agent = cls.__new__(cls)
+        agent.records = state["records"]
+        return agent
+
+    async def run_cycle(self) -> None:
+        pass
+
+
+def test_agent_runner_warm_restart_hands_over_state() -> None:
+    runner = orchestrator_utils.AgentRunner(_StatefulAgent())
+    runner.agent.records.append("in-memory")
+
+    async def run() -> None:
+        await runner.restart(object(), object())
+        assert runner.agent.records == ["loaded", "in-memory"]
+        assert _StatefulAgent.loads == 1
+        # a second restart without a healthy cycle in between cold starts
+        await runner.restart(object(), object())
+        assert runner.agent.records == ["loaded"]
+        assert _StatefulAgent.loads == 2
+        assert runner.task is not None
+        runner.task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await runner.task
+
+    asyncio.run(run())
+    assert runner.restarts == 2
+    assert runner.last_restart_seconds >= 0.0
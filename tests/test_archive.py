@@ -105,3 +105,40 @@ def test_archive_service_broadcast(tmp_path) -> None:
         asyncio.run(svc.broadcast_merkle_root())
     assert captured["url"] == "http://rpc.test"
     assert captured["root"] == root
+
+
+def test_archive_service_novelty_persisted(tmp_path, monkeypatch) -> None:
+    np = pytest.importorskip("numpy")
+    from alpha_factory_v1.core.evaluators import novelty
+
+    embedded: list[str] = []
+
+    def fake_embed_many(texts):
+        embedded.extend(texts)
+        return np.concatenate([novelty._hash_embedding(t) for t in texts])
+
+    monkeypatch.setattr(novelty, "embed_many", fake_embed_many)
+    path = tmp_path / "arch.db"
+    with ArchiveService(path, broadcast=False) as svc:
+        svc.insert_entry({"id": 1}, {"score": 0.1})
+        svc.insert_entry({"id": 2}, {"score": 0.2})
+    assert (tmp_path / "arch.db.novelty.npy").exists()
+    assert len(embedded) == 2
+
+    with ArchiveService(path, broadcast=False) as svc:
+        assert embedded == [json.dumps({"id": 1}), json.dumps({"id": 2})]
+        assert svc.novelty.count == 2
+        assert svc.novelty.last_id == 2
+        assert svc.novelty.knn_novelty(json.dumps({"id": 1}), k=1) == pytest.approx(0.0, abs=1e-6)
+        svc.insert_entry({"id": 3}, {"score": 0.3})
+        assert svc.novelty.count == 3
+
+    # entries written while the index was not updated are caught up on start
+    conn = service.sqlite3.connect(str(path))
+    with conn:
+        conn.execute("INSERT INTO entries(parent, spec, scores, hash, ts) VALUES(NULL, '{\"id\": 4}', '{}', 'x', 0)")
+    conn.close()
+    embedded.clear()
+    with ArchiveService(path, broadcast=False) as svc:
+        assert embedded == ['{"id": 4}']
+        assert svc.novelty.count == 4
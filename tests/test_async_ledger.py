@@ -0,0 +1,78 @@
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from alpha_factory_v1.common.utils.logging import AsyncLedger, Ledger
+from alpha_factory_v1.common.utils import messaging
+
+
+def _env(i: int) -> messaging.Envelope:
+    return messaging.Envelope(sender="a", recipient="b", payload={"v": i}, ts=float(i))
+
+
+def test_alog_writes_in_order(tmp_path) -> None:
+    async def run() -> list[dict[str, object]]:
+        async with AsyncLedger(str(tmp_path / "ledger.db"), broadcast=False) as ledger:
+            for i in range(20):
+                await ledger.alog(_env(i))
+            return await ledger.acall(lambda led: led.tail(20))
+
+    rows = asyncio.run(run())
+    assert [r["payload"] for r in rows] == [{"v": i} for i in range(20)]
+
+
+def test_close_drains_queue(tmp_path) -> None:
+    path = tmp_path / "ledger.db"
+    ledger = AsyncLedger(str(path), broadcast=False, batch_size=50)
+    for i in range(10):
+        ledger.log(_env(i))
+    ledger.close()
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 10
+
+
+def test_calls_after_close_raise(tmp_path) -> None:
+    ledger = AsyncLedger(str(tmp_path / "ledger.db"), broadcast=False)
+    ledger.close()
+    ledger.close()  # idempotent
+    for op in (ledger.flush, ledger.tail, lambda: ledger.log(_env(0))):
+        with pytest.raises(RuntimeError, match="closed"):
+            op()
+    with pytest.raises(RuntimeError, match="closed"):
+        asyncio.run(ledger.acall(lambda led: led.tail(1)))
+
+
+def test_root_matches_sync_ledger(tmp_path) -> None:
+    plain = Ledger(str(tmp_path / "plain.db"), broadcast=False)
+    with AsyncLedger(str(tmp_path / "async.db"), broadcast=False) as ledger:
+        for i in range(5):
+            plain.log(_env(i))
+            ledger.log(_env(i))
+        assert ledger.compute_merkle_root() == plain.compute_merkle_root()
+    plain.close()
+
+
+def test_backpressure_counted(tmp_path) -> None:
+    path = tmp_path / "ledger.db"
+    ledger = AsyncLedger(str(path), broadcast=False, queue_size=1)
+    started = threading.Event()
+    gate = threading.Event()
+    ledger._submit(lambda: (started.set(), gate.wait()))
+    assert started.wait(5)
+    ledger.log(_env(0))
+
+    async def run() -> None:
+        task = asyncio.create_task(ledger.alog(_env(1)))
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        assert ledger.backpressure_events == 1
+        gate.set()
+        await task
+
+    asyncio.run(run())
+    ledger.close()
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 2
@@ -20,8 +20,8 @@ def test_concurrent_experiments(tmp_path, monkeypatch) -> None:
         orch = orchestrator.Orchestrator(settings)
 
     monkeypatch.setattr(
-        "alpha_factory_v1.core.evaluators.novelty.embed",
-        lambda _t: np.zeros((1, 1), dtype="float32"),
+        "alpha_factory_v1.core.evaluators.novelty.embed_many",
+        lambda texts: np.zeros((len(texts), 1), dtype="float32"),
     )
     monkeypatch.setattr(
         "alpha_factory_v1.core.simulation.surrogate_fitness.aggregate",
@@ -57,3 +57,36 @@ def test_concurrent_experiments(tmp_path, monkeypatch) -> None:
 
     specs = [json.loads(row[0])["experiment_id"] for row in orch.archive.conn.execute("SELECT spec FROM entries")]
     assert {"exp1", "exp2"} <= set(specs)
+
+
+def _sphere(genome: list[float]) -> tuple[float, float]:
+    return genome[0] ** 2, (genome[0] - 1.0) ** 2
+
+
+def test_evolve_islands(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("ARCHIVE_PATH", str(tmp_path / "arch.db"))
+    monkeypatch.setenv("SOLUTION_ARCHIVE_PATH", str(tmp_path / "sol.duckdb"))
+    settings = config.Settings(bus_port=0)
+    with mock.patch.object(orchestrator.Orchestrator, "_init_agents", lambda self: []):
+        orch = orchestrator.Orchestrator(settings)
+    monkeypatch.setattr(
+        "alpha_factory_v1.core.simulation.surrogate_fitness.aggregate",
+        lambda vals, **kw: [0.0 for _ in vals],
+    )
+
+    result = asyncio.run(
+        orch.evolve_islands(
+            _sphere,
+            1,
+            ["x", "y"],
+            experiment_id="isl",
+            population_size=3,
+            generations=2,
+            migration_interval=1,
+            seed=1,
+        )
+    )
+    assert set(result) == {"x", "y"}
+    assert orch.experiment_pops["isl"]["x"] is result["x"]
+    rows = orch.archive.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    assert rows == 6
@@ -0,0 +1,43 @@
+# SPDX-License-Identifier: Apache-2.0
+import json
+import subprocess
+import sys
+
+from scripts import import_profile
+
+LAZY = (
+    "alpha_factory_v1.demos.alpha_agi_insight_v1.src.agents",
+    "alpha_factory_v1.core.archive.service",
+    "alpha_factory_v1.core.archive.solution_archive",
+    "alpha_factory_v1.core.governance.stake_registry",
+    "alpha_factory_v1.core.simulation.mats",
+)
+
+
+def test_orchestrator_defers_agents_and_backends() -> None:
+    records = import_profile.profile("alpha_factory_v1.core.orchestrator")
+    assert import_profile.imported(records, "alpha_factory_v1.core.orchestrator")
+    eager = [name for name in LAZY if import_profile.imported(records, name)]
+    assert eager == []
+
+
+HEAVY = (
+    "alpha_factory_v1.backend.agents",
+    "alpha_factory_v1.backend.agents.finance_agent",
+    "alpha_factory_v1.backend.services",
+    "fastapi",
+    "plotly",
+)
+
+
+def test_cli_import_skips_heavy_modules() -> None:
+    code = (
+        "import json, sys\n"
+        "import alpha_factory_v1.core.interface.cli\n"
+        "backend = sys.modules.get('alpha_factory_v1.backend')\n"
+        "print(json.dumps({'modules': sorted(sys.modules), 'app': 'app' in vars(backend or sys)}))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    state = json.loads(out.splitlines()[-1])
+    assert [name for name in HEAVY if name in state["modules"]] == []
+    assert not state["app"]  # the ASGI app is built on first access
@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import sqlite3
+
+from alpha_factory_v1.common.utils.logging import Ledger
+from alpha_factory_v1.common.utils import messaging
+
+
+def _env(i: int) -> messaging.Envelope:
+    return messaging.Envelope(sender="a", recipient="b", payload={"v": i}, ts=float(i))
+
+
+def _count(path) -> int:
+    with sqlite3.connect(path) as conn:
+        return int(conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0])
+
+
+def test_flush_on_batch_size(tmp_path) -> None:
+    path = tmp_path / "ledger.db"
+    ledger = Ledger(str(path), broadcast=False, batch_size=3)
+    ledger.log(_env(0))
+    ledger.log(_env(1))
+    assert _count(path) == 0
+    ledger.log(_env(2))
+    assert _count(path) == 3
+    ledger.close()
+
+
+def test_close_is_durable(tmp_path) -> None:
+    path = tmp_path / "ledger.db"
+    ledger = Ledger(str(path), broadcast=False, batch_size=100)
+    for i in range(5):
+        ledger.log(_env(i))
+    ledger.close()
+    assert _count(path) == 5
+
+
+def test_wal_mode(tmp_path) -> None:
+    ledger = Ledger(str(tmp_path / "ledger.db"), broadcast=False, batch_size=10)
+    assert ledger.conn is not None
+    assert ledger.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    ledger.close()
+
+
+def test_reads_flush_and_match_unbuffered(tmp_path) -> None:
+    plain = Ledger(str(tmp_path / "plain.db"), broadcast=False)
+    buffered = Ledger(str(tmp_path / "buffered.db"), broadcast=False, batch_size=100)
+    for i in range(7):
+        plain.log(_env(i))
+        buffered.log(_env(i))
+    assert [r["payload"] for r in buffered.tail(7)] == [{"v": i} for i in range(7)]
+    assert buffered.compute_merkle_root() == plain.compute_merkle_root()
+    plain.close()
+    buffered.close()
+
+
+def test_background_flush() -> None:
+    async def run(path) -> int:
+        async with Ledger(str(path), broadcast=False, batch_size=100, flush_ms=10) as ledger:
+            ledger.log(_env(0))
+            ledger.log(_env(1))
+            await asyncio.sleep(0.1)
+            flushed = _count(path)
+            ledger.log(_env(2))
+        return flushed
+
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ledger.db"
+        assert asyncio.run(run(path)) == 2
+        assert _count(path) == 3
@@ -1,6 +1,10 @@
 # SPDX-License-Identifier: Apache-2.0
 import os
+import tempfile
+import threading
 import unittest
+from pathlib import Path
+
 import pytest
 
 pytest.importorskip("prometheus_client")
@@ -18,34 +22,116 @@ import alpha_factory_v1.backend.utils.llm_provider as llm  # noqa: E402
 prometheus_client.REGISTRY._names_to_collectors.clear()
 getattr(prometheus_client.REGISTRY, "_collector_to_names", {}).clear()
 llm = importlib.reload(llm)
+from alpha_factory_v1.backend.utils import llm_cache as cache  # noqa: E402
 
 
 class TestLLMCacheLRU(unittest.TestCase):
     def setUp(self) -> None:
-        self.orig_cache = llm._cache_mem
-        self.orig_size = llm._CACHE_SIZE
-        self.orig_db = llm._DB
-        llm._cache_mem = llm.OrderedDict()
-        llm._CACHE_SIZE = 2
-        llm._DB = None
+        self.orig_cache = cache._cache_mem
+        self.orig_db = cache._DB
+        cache._cache_mem = cache._MemTier(2, shards=1)
+        cache._DB = None
 
     def tearDown(self) -> None:
-        llm._cache_mem = self.orig_cache
-        llm._CACHE_SIZE = self.orig_size
-        llm._DB = self.orig_db
+        cache._cache_mem = self.orig_cache
+        cache._DB = self.orig_db
 
     def test_eviction(self) -> None:
         llm._cache_put("a", "1", "p")
         llm._cache_put("b", "2", "p")
         llm._cache_put("c", "3", "p")
-        self.assertEqual(len(llm._cache_mem), 2)
-        self.assertNotIn("a", llm._cache_mem)
+        self.assertEqual(len(cache._cache_mem), 2)
+        self.assertNotIn("a", cache._cache_mem)
         llm._cache_get("b")
         llm._cache_put("d", "4", "p")
-        self.assertEqual(len(llm._cache_mem), 2)
-        self.assertIn("b", llm._cache_mem)
-        self.assertIn("d", llm._cache_mem)
-        self.assertNotIn("c", llm._cache_mem)
+        self.assertEqual(len(cache._cache_mem), 2)
+        self.assertIn("b", cache._cache_mem)
+        self.assertIn("d", cache._cache_mem)
+        self.assertNotIn("c", cache._cache_mem)
+
+    def test_concurrent_puts_respect_capacity(self) -> None:
+        cache._cache_mem = cache._MemTier(64, shards=8)
+        threads = [
+            threading.Thread(target=lambda n=n: [llm._cache_put(f"{n}-{i}", "x", "p") for i in range(200)])
+            for n in range(16)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertLessEqual(len(cache._cache_mem), 64)
+
+
+class TestLLMDiskCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.orig_cache = cache._cache_mem
+        cache._cache_mem = cache._MemTier(4, shards=1)
+
+    def tearDown(self) -> None:
+        cache._cache_mem = self.orig_cache
+        self.tmp.cleanup()
+
+    def _tier(self, **kw: object) -> "cache._DiskTier":
+        opts = {"max_bytes": 1000, "compact_secs": 3600, "compress": False}
+        opts.update(kw)
+        tier = cache._DiskTier(Path(self.tmp.name) / "cache.sqlite", **opts)  # type: ignore[arg-type]
+        self.addCleanup(tier.close)
+        return tier
+
+    def test_reads_from_other_threads(self) -> None:
+        tier = self._tier()
+        tier.put("h", "answer", "p")
+        out: list[str | None] = []
+        t = threading.Thread(target=lambda: out.append(tier.get("h")))
+        t.start()
+        t.join()
+        self.assertEqual(out, ["answer"])
+
+    def test_compaction_enforces_byte_budget(self) -> None:
+        tier = self._tier()
+        for i in range(20):
+            tier.put(f"h{i}", "x" * 100, "p")
+        tier.compact()
+        self.assertLessEqual(tier._total(), 900)
+        self.assertIsNone(tier.get("h0"))
+        self.assertEqual(tier.get("h19"), "x" * 100)
+
+    def test_byte_count_tracks_replacements_and_threads(self) -> None:
+        tier = self._tier(max_bytes=1 << 20)
+        tier.put("h", "x" * 100, "p")
+        tier.put("h", "y" * 40, "p")
+        self.assertEqual(tier._bytes, 40)
+
+        def writer(n: int) -> None:
+            for i in range(50):
+                tier.put(f"t{n}-{i % 10}", "z" * (i + 1), "p")
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(tier._bytes, tier._total())
+
+    def test_disk_hit_is_promoted_and_counted(self) -> None:
+        orig_db = cache._DB
+        cache._DB = self._tier()
+        try:
+            cache._DB.put("h", "answer", "p")
+            before = cache._cache_stats[("disk", "hit")]
+            self.assertEqual(llm._cache_get("h"), "answer")
+            self.assertEqual(cache._cache_stats[("disk", "hit")], before + 1)
+            self.assertIn("h", cache._cache_mem)
+        finally:
+            cache._DB = orig_db
+
+    def test_zstd_values(self) -> None:
+        pytest.importorskip("zstandard")
+        tier = self._tier(compress=True)
+        tier.put("h", "y" * 500, "p")
+        self.assertEqual(tier.get("h"), "y" * 500)
+        self.assertLess(tier._total(), 100)
 
 
 if __name__ == "__main__":  # pragma: no cover
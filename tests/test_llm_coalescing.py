@@ -0,0 +1,158 @@
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("AGI_INSIGHT_OFFLINE", "1")
+import alpha_factory_v1.backend.utils.llm_provider as llm  # noqa: E402
+from alpha_factory_v1.backend.utils import llm_cache  # noqa: E402
+
+
+class _Counting(llm._Provider):
+    name = "counting"
+
+    def __init__(self, *, batch: bool = False, delay: float = 0.05) -> None:
+        self.supports_batch = batch
+        self.delay = delay
+        self.calls = 0
+        self.batches: list[int] = []
+        self.active = self.peak = 0
+        self._lock = threading.Lock()
+
+    def _invoke(self, msgs, temperature, max_tokens, stream, stop):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return "echo " + msgs[-1]["content"]
+
+    def _invoke_batch(self, batch, temperature, max_tokens, stop):
+        self.batches.append(len(batch))
+        return [f"echo {msgs[-1]['content']}" for msgs in batch]
+
+
+@pytest.fixture()
+def provider(monkeypatch: pytest.MonkeyPatch):
+    def install(**kw):
+        prov = _Counting(**kw)
+        monkeypatch.setattr(llm, "_PROVIDERS", {prov.name: prov})
+        return prov
+
+    monkeypatch.setattr(llm_cache, "_cache_mem", llm_cache._MemTier(64))
+    monkeypatch.setattr(llm_cache, "_DB", None)
+    return install
+
+
+def test_identical_prompts_share_one_request(provider) -> None:
+    prov = provider()
+
+    async def run() -> list[str]:
+        client = llm.LLMProvider()
+        return await asyncio.gather(*(client.achat("same") for _ in range(5)))
+
+    assert asyncio.run(run()) == ["echo same"] * 5
+    assert prov.calls == 1
+    assert llm._INFLIGHT == {}
+
+
+def test_uncached_calls_are_not_coalesced(provider) -> None:
+    prov = provider()
+
+    async def run() -> None:
+        client = llm.LLMProvider()
+        await asyncio.gather(*(client.achat("same", cache=False) for _ in range(3)))
+
+    asyncio.run(run())
+    assert prov.calls == 3
+
+
+def test_concurrency_limit(provider, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AF_LLM_COUNTING_CONCURRENCY", "2")
+    prov = provider()
+
+    async def run() -> None:
+        client = llm.LLMProvider()
+        await asyncio.gather(*(client.achat(f"p{i}") for i in range(6)))
+
+    asyncio.run(run())
+    assert prov.calls == 6
+    assert prov.peak == 2
+
+
+def test_micro_batching(provider, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(llm, "_BATCH_SIZE", 4)
+    prov = provider(batch=True)
+
+    async def run() -> list[str]:
+        client = llm.LLMProvider()
+        return await asyncio.gather(*(client.achat(f"p{i}") for i in range(6)))
+
+    assert asyncio.run(run()) == [f"echo p{i}" for i in range(6)]
+    assert prov.batches == [4, 2]
+
+
+def test_budget_is_per_provider(provider) -> None:
+    prov = provider()
+    other = _Counting()
+    other.name = "other"
+    assert prov._budget is prov._budget
+    assert prov._budget is not other._budget
+    assert prov._budget.name == "counting"
+
+
+def test_executor_created_once_across_threads(provider, monkeypatch: pytest.MonkeyPatch) -> None:
+    prov = provider()
+    created: list[object] = []
+    real = llm.ThreadPoolExecutor
+
+    def slow_pool(*a, **kw):
+        time.sleep(0.01)  # widen the window between the check and the assignment
+        pool = real(*a, **kw)
+        created.append(pool)
+        return pool
+
+    monkeypatch.setattr(llm, "ThreadPoolExecutor", slow_pool)
+    pools: list[object] = []
+    threads = [threading.Thread(target=lambda: pools.append(prov._executor())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for pool in created:
+        pool.shutdown()
+    assert len(created) == 1
+    assert all(p is created[0] for p in pools)
+
+
+def test_budget_admission_and_refill(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = [100.0]
+    monkeypatch.setattr(llm.time, "monotonic", lambda: clock[0])
+    budget = llm._Budget("p", rpm=2, tpm=1000)
+    assert budget.allow(100) and budget.allow(100)
+    assert not budget.allow(100)
+    clock[0] += 30  # half a minute refills one request
+    assert budget.allow(100)
+    assert budget.utilisation()[0] == pytest.approx(1.0)
+
+
+def test_acquire_waits_instead_of_raising(provider, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AF_LLM_COUNTING_RPM", "600")  # one request per 0.1s once drained
+    prov = provider(delay=0)
+    prov._budget._req = 1
+
+    async def run() -> float:
+        client = llm.LLMProvider()
+        t0 = time.perf_counter()
+        await asyncio.gather(client.achat("a"), client.achat("b"))
+        return time.perf_counter() - t0
+
+    assert asyncio.run(run()) >= 0.05
+    assert prov.calls == 2
+    with pytest.raises(RuntimeError, match="budget exhausted"):
+        prov.chat([{"role": "user", "content": "c"}], 0.0, 1, False, None)
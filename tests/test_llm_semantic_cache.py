@@ -0,0 +1,88 @@
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import math
+import os
+import re
+
+import pytest
+
+os.environ.setdefault("AGI_INSIGHT_OFFLINE", "1")
+import alpha_factory_v1.backend.utils.llm_provider as llm  # noqa: E402
+from alpha_factory_v1.backend.utils import llm_cache  # noqa: E402
+
+_VOCAB = ["summarise", "revenue", "growth", "for", "quarter", "weather", "forecast", "paris"]
+
+
+def _bow(text: str) -> list[float]:
+    words = re.findall(r"[a-z]+", text.lower())
+    vec = [float(words.count(w)) for w in _VOCAB]
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return [x / norm for x in vec]
+
+
+class _Echo(llm._Provider):
+    name = "echo"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def _invoke(self, msgs, temperature, max_tokens, stream, stop):
+        self.calls += 1
+        return "answer to " + msgs[-1]["content"]
+
+
+@pytest.fixture()
+def prov(monkeypatch: pytest.MonkeyPatch) -> _Echo:
+    p = _Echo()
+    monkeypatch.setattr(llm, "_PROVIDERS", {p.name: p})
+    monkeypatch.setattr(llm_cache, "_cache_mem", llm_cache._MemTier(64))
+    monkeypatch.setattr(llm_cache, "_DB", None)
+    monkeypatch.setattr(llm_cache, "_semantic", llm_cache._SemanticTier(threshold=0.9, embed=_bow))
+    monkeypatch.setattr(llm_cache, "_semantic_stats", llm_cache.collections.Counter())
+    return p
+
+
+def test_near_duplicate_prompt_hits(prov: _Echo) -> None:
+    client = llm.LLMProvider(semantic_cache=True, agent="planner")
+    first = client.chat("Summarise revenue growth for quarter 3")
+    assert client.chat("Summarise revenue growth for quarter 4") == first
+    assert client.chat("Weather forecast for Paris") != first
+    assert prov.calls == 2
+    assert llm_cache.semantic_hit_rate("planner") == pytest.approx(1 / 3)
+
+
+def test_opt_in_per_instance(prov: _Echo) -> None:
+    llm.LLMProvider(semantic_cache=True).chat("Summarise revenue growth for quarter 3")
+    llm.LLMProvider(semantic_cache=False).chat("Summarise revenue growth for quarter 4")
+    assert prov.calls == 2
+
+
+def test_scope_is_the_earlier_conversation(prov: _Echo) -> None:
+    client = llm.LLMProvider(semantic_cache=True)
+    client.chat("Summarise revenue growth for quarter 3", system_prompt="You are terse.")
+    client.chat("Summarise revenue growth for quarter 4", system_prompt="You are verbose.")
+    assert prov.calls == 2
+
+
+def test_async_path(prov: _Echo) -> None:
+    async def run() -> tuple[str, str]:
+        client = llm.LLMProvider(semantic_cache=True)
+        return (
+            await client.achat("Summarise revenue growth for quarter 1"),
+            await client.achat("Summarise revenue growth for quarter 2"),
+        )
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert prov.calls == 1
+
+
+def test_vector_index_evicts_oldest() -> None:
+    index = llm_cache._VectorIndex(4)
+    for i in range(6):
+        vec = [0.0] * 6
+        vec[i] = 1.0
+        index.add(vec, f"k{i}")
+    assert len(index) <= 4
+    assert index.search([1.0, 0, 0, 0, 0, 0])[1] == pytest.approx(0.0)
+    assert index.search([0, 0, 0, 0, 0, 1.0]) == ("k5", pytest.approx(1.0))
@@ -0,0 +1,130 @@
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import os
+
+import pytest
+
+os.environ.setdefault("AGI_INSIGHT_OFFLINE", "1")
+import alpha_factory_v1.backend.utils.llm_provider as llm  # noqa: E402
+from alpha_factory_v1.backend.utils import llm_cache  # noqa: E402
+
+
+class _Chunky(llm._Provider):
+    name = "chunky"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def _invoke(self, msgs, temperature, max_tokens, stream, stop):
+        self.calls += 1
+        chunks = ["The ", "answer ", "is ", "42."]
+        if stream:
+            return (c for c in chunks)
+        return "".join(chunks)
+
+
+@pytest.fixture()
+def prov(monkeypatch: pytest.MonkeyPatch) -> _Chunky:
+    p = _Chunky()
+    monkeypatch.setattr(llm, "_PROVIDERS", {p.name: p})
+    monkeypatch.setattr(llm_cache, "_cache_mem", llm_cache._MemTier(64))
+    monkeypatch.setattr(llm_cache, "_DB", None)
+    return p
+
+
+def test_stream_is_cached_and_replayed_with_chunks(prov: _Chunky) -> None:
+    client = llm.LLMProvider()
+    assert list(client.chat("q", stream=True)) == ["The ", "answer ", "is ", "42."]
+    assert list(client.chat("q", stream=True)) == ["The ", "answer ", "is ", "42."]
+    assert client.chat("q") == "The answer is 42."
+    assert prov.calls == 1
+
+
+def test_partially_consumed_stream_is_not_cached(prov: _Chunky) -> None:
+    client = llm.LLMProvider()
+    gen = client.chat("q", stream=True)
+    next(gen)
+    gen.close()
+    assert llm_cache.cached_chunks(llm.LLMProvider._hash([{"role": "user", "content": "q"}])) is None
+    list(client.chat("q", stream=True))
+    assert prov.calls == 2
+
+
+def test_blocking_reply_replays_as_single_chunk(prov: _Chunky) -> None:
+    client = llm.LLMProvider()
+    client.chat("q")
+    assert list(client.chat("q", stream=True)) == ["The answer is 42."]
+    assert prov.calls == 1
+
+
+def test_async_tee_and_replay(prov: _Chunky) -> None:
+    async def source():
+        for c in ("a", "b", "c"):
+            yield c
+
+    async def run() -> tuple[list[str], list[str]]:
+        first = [c async for c in llm_cache.atee_stream(source(), "k", "p")]
+        chunks = llm_cache.cached_chunks("k")
+        assert chunks is not None
+        return first, [c async for c in llm_cache.areplay(chunks)]
+
+    assert asyncio.run(run()) == (["a", "b", "c"], ["a", "b", "c"])
+
+
+def test_backend_chat_replays_cached_stream(prov: _Chunky, monkeypatch: pytest.MonkeyPatch) -> None:
+    from alpha_factory_v1.backend import llm_provider as backend_llm
+
+    calls = []
+
+    async def fake_openai(messages, stream, temperature, max_tokens):
+        calls.append(stream)
+
+        async def gen():
+            for c in ("x", "y"):
+                yield c
+
+        return gen() if stream else "xy"
+
+    async def no_store(_messages):
+        return None
+
+    monkeypatch.setattr(backend_llm, "_provider", lambda: "openai")
+    monkeypatch.setattr(backend_llm, "_chat_openai", fake_openai)
+    monkeypatch.setattr(backend_llm, "_mcp_store_async", no_store)
+
+    async def run() -> tuple[list[str], list[str], str]:
+        first = [c async for c in await backend_llm.chat("hi", stream=True)]
+        second = [c async for c in await backend_llm.chat("hi", stream=True)]
+        return first, second, await backend_llm.chat("hi")
+
+    assert asyncio.run(run()) == (["x", "y"], ["x", "y"], "xy")
+    assert calls == [True]
+
+
+def test_backend_chat_key_covers_request_params(prov: _Chunky, monkeypatch: pytest.MonkeyPatch) -> None:
+    from alpha_factory_v1.backend import llm_provider as backend_llm
+
+    calls: list[int] = []
+
+    async def fake_openai(messages, stream, temperature, max_tokens):
+        calls.append(max_tokens)
+        return f"reply within {max_tokens}"
+
+    async def no_store(_messages):
+        return None
+
+    monkeypatch.setattr(backend_llm, "_provider", lambda: "openai")
+    monkeypatch.setattr(backend_llm, "_chat_openai", fake_openai)
+    monkeypatch.setattr(backend_llm, "_mcp_store_async", no_store)
+    # an LLMProvider entry for the same messages must not be served here
+    llm.LLMProvider().chat("hi")
+
+    async def run() -> list[str]:
+        return [
+            await backend_llm.chat("hi", max_tokens=512),
+            await backend_llm.chat("hi", max_tokens=1024),
+            await backend_llm.chat("hi", max_tokens=1024),
+        ]
+
+    assert asyncio.run(run()) == ["reply within 512", "reply within 1024", "reply within 1024"]
+    assert calls == [512, 1024]
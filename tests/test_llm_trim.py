@@ -0,0 +1,57 @@
+# SPDX-License-Identifier: Apache-2.0
+import os
+
+import pytest
+
+os.environ.setdefault("AGI_INSIGHT_OFFLINE", "1")
+import alpha_factory_v1.backend.utils.llm_provider as llm  # noqa: E402
+
+
+def _msgs(n: int, size: int = 400) -> list[dict[str, str]]:
+    return [{"role": "system", "content": "s" * size}] + [
+        {"role": "user", "content": f"{i:04d}" + "x" * (size - 4)} for i in range(1, n)
+    ]
+
+
+def _reference(msgs: list[dict[str, str]], limit: int) -> list[dict[str, str]]:
+    msgs = list(msgs)
+    while sum(llm._count_tokens(m["content"]) for m in msgs) > limit and len(msgs) > 2:
+        msgs.pop(1)
+    return msgs
+
+
+@pytest.mark.parametrize("limit", [1, 150, 1000, 10_000])
+def test_trim_matches_pop_loop(limit: int) -> None:
+    msgs = _msgs(30)
+    assert llm._trim(msgs, limit) == _reference(msgs, limit)
+
+
+def test_trim_keeps_input_untouched() -> None:
+    msgs = _msgs(10)
+    trimmed = llm._trim(msgs, 300)
+    assert len(msgs) == 10
+    assert trimmed[0] is msgs[0] and trimmed[-1] is msgs[-1]
+
+
+def test_each_message_is_tokenised_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: list[str] = []
+
+    def counting(text: str) -> int:
+        seen.append(text)
+        return max(1, len(text) // 4)
+
+    monkeypatch.setattr(llm, "_count_tokens", counting)
+    llm._message_tokens.cache_clear()
+    msgs = _msgs(20)
+    llm._trim(msgs, 1000)
+    llm._Provider._estimate(llm._trim(msgs, 1000), 16)
+    assert sorted(seen) == sorted(m["content"] for m in msgs)
+    llm._message_tokens.cache_clear()
+
+
+def test_context_limit_is_configurable(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AF_LLM_CONTEXT_LIMIT", "500")
+    assert llm.LLMProvider().context_limit == 500
+    client = llm.LLMProvider(context_limit=250)
+    msgs, _, _ = client._prepare(_msgs(10), None, None, None)
+    assert sum(llm._message_tokens(m["content"]) for m in msgs) <= 250
@@ -7,10 +7,16 @@ from alpha_factory_v1.core.evaluators.novelty import NoveltyIndex
 from alpha_factory_v1.core.simulation import mats
 
 
+def _sphere(genome: list[float]) -> tuple[float, float]:
+    x, y = genome
+    return x**2, y**2
+
+
 @pytest.fixture(autouse=True)
 def _reset_islands() -> None:
     mats.ISLANDS.clear()
     mats.ISLAND_SEEDS.clear()
+    mats.ISLAND_EVALUATORS.clear()
 
 
 def test_run_evolution_deterministic() -> None:
@@ -100,3 +106,164 @@ def test_novelty_divergence_for_elites() -> None:
     front = mats.pareto_front(pop)
     novelties = [ind.fitness[-1] for ind in front]
     assert sum(n > 0.3 for n in novelties) >= len(novelties) - 1
+
+
+def test_run_evolution_evaluates_each_genome_once() -> None:
+    calls = 0
+
+    def fn(genome: list[float]) -> tuple[float, float]:
+        nonlocal calls
+        calls += 1
+        x, y = genome
+        return x**2, y**2
+
+    pops: dict[str, mats.Population] = {}
+    mats.run_evolution(fn, 2, population_size=5, generations=4, seed=3, scenario_hash="a", populations=pops)
+    calls = 0
+    mats.run_evolution(
+        fn,
+        2,
+        population_size=5,
+        generations=4,
+        seed=4,
+        scenario_hash="b",
+        populations=pops,
+        exchange_interval=2,
+    )
+
+    # initial population plus one offspring batch per generation; migrants keep their fitness
+    assert calls == 5 + 4 * 5
+
+
+def test_run_evolution_migrants_rescored_for_other_objectives() -> None:
+    def three(genome: list[float]) -> tuple[float, float, float]:
+        x, y = genome
+        return x**2, y**2, x + y
+
+    pops: dict[str, mats.Population] = {}
+    mats.run_evolution(three, 2, population_size=5, generations=2, seed=3, scenario_hash="a", populations=pops)
+    mats.run_evolution(
+        _sphere,
+        2,
+        population_size=5,
+        generations=4,
+        seed=4,
+        scenario_hash="b",
+        populations=pops,
+        exchange_interval=2,
+    )
+
+    assert {len(ind.fitness) for ind in pops["a"]} == {3}
+    assert {len(ind.fitness) for ind in pops["b"]} == {2}
+    assert all(ind.fitness == _sphere(ind.genome) for ind in pops["b"])
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_run_evolution_resumed_island_rescored_for_new_objectives(engine: str) -> None:
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+
+    def single(genome: list[float]) -> tuple[float]:
+        return (sum(genome),)
+
+    pops: dict[str, mats.Population] = {}
+    kw = {"population_size": 5, "seed": 3, "scenario_hash": "a", "populations": pops, "engine": engine}
+    mats.run_evolution(single, 2, generations=2, **kw)
+    pop = mats.run_evolution(_sphere, 2, generations=2, **kw)
+
+    assert all(ind.fitness == _sphere(ind.genome) for ind in pop)
+
+
+def test_run_evolution_batch_evaluator_matches_scalar() -> None:
+    np = pytest.importorskip("numpy")
+
+    def fn(genome: list[float]) -> tuple[float, float]:
+        x, y = genome
+        return x**2, y**2
+
+    def fn_batch(genomes: "np.ndarray") -> "np.ndarray":
+        return genomes**2
+
+    pop1 = mats.run_evolution(fn, 2, population_size=6, generations=3, seed=5)
+    pop2 = mats.run_evolution(None, 2, population_size=6, generations=3, seed=5, fn_batch=fn_batch)
+
+    assert [ind.genome for ind in pop1] == [ind.genome for ind in pop2]
+    assert [ind.fitness for ind in pop1] == [ind.fitness for ind in pop2]
+
+
+def test_run_evolution_workers_match_serial() -> None:
+    pop1 = mats.run_evolution(_sphere, 2, population_size=8, generations=3, seed=9)
+    pop2 = mats.run_evolution(_sphere, 2, population_size=8, generations=3, seed=9, workers=2)
+
+    assert [ind.genome for ind in pop1] == [ind.genome for ind in pop2]
+    assert [ind.fitness for ind in pop1] == [ind.fitness for ind in pop2]
+
+
+def test_broken_pool_is_shut_down(monkeypatch: pytest.MonkeyPatch) -> None:
+    from concurrent.futures.process import BrokenProcessPool
+
+    class Broken:
+        shut: list[dict] = []
+
+        def map(self, *_a, **_kw):
+            raise BrokenProcessPool("worker died")
+
+        def shutdown(self, **kw) -> None:
+            self.shut.append(kw)
+
+    monkeypatch.setitem(mats._POOLS, 2, Broken())
+    genomes = [[1.0, 2.0], [3.0, 4.0]]
+
+    assert mats._map_fitness(_sphere, genomes, 2) == [_sphere(g) for g in genomes]
+    assert 2 not in mats._POOLS
+    assert Broken.shut == [{"wait": False, "cancel_futures": True}]
+
+
+def test_run_evolution_workers_unpicklable_fallback() -> None:
+    offset = 1.0
+
+    def fn(genome: list[float]) -> tuple[float, float]:
+        x, y = genome
+        return (x - offset) ** 2, y**2
+
+    pop = mats.run_evolution(fn, 2, population_size=4, generations=2, seed=1, workers=2)
+
+    assert all(ind.fitness is not None for ind in pop)
+
+
+@pytest.mark.parametrize("topology", mats.TOPOLOGIES)
+def test_run_islands_parallel_matches_serial(topology: str) -> None:
+    kwargs = dict(population_size=6, generations=4, seed=11, topology=topology, migration_interval=2)
+    par = mats.run_islands(_sphere, 2, 3, **kwargs)
+    ser = mats.run_islands(_sphere, 2, 3, parallel=False, **kwargs)
+
+    assert list(par) == ["island-0", "island-1", "island-2"]
+    for name in par:
+        assert [ind.genome for ind in par[name]] == [ind.genome for ind in ser[name]]
+    fronts = mats.island_fronts(par)
+    assert all(front and all(ind.fitness is not None for ind in front) for front in fronts.values())
+
+
+def test_run_islands_ring_migration() -> None:
+    pops: dict[str, mats.Population] = {}
+    mats.run_islands(
+        _sphere,
+        2,
+        ["a", "b"],
+        population_size=4,
+        generations=1,
+        seed=0,
+        populations=pops,
+        migration_interval=1,
+        migrants=1,
+        parallel=False,
+    )
+    assert set(pops) == {"a", "b"}
+    genomes_a = {tuple(ind.genome) for ind in pops["a"]}
+    genomes_b = {tuple(ind.genome) for ind in pops["b"]}
+    assert genomes_a & genomes_b
+
+
+def test_run_islands_unknown_topology() -> None:
+    with pytest.raises(ValueError):
+        mats.run_islands(_sphere, 2, 2, topology="star")
@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: Apache-2.0
+import hashlib
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from alpha_factory_v1.common.utils import logging as insight_logging
+from alpha_factory_v1.common.utils import messaging
+from alpha_factory_v1.common.utils.logging import Ledger
+from alpha_factory_v1.common.utils.merkle import MerkleAccumulator, verify_proof
+from alpha_factory_v1.core.archive.service import ArchiveService
+
+
+def _conn() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE messages(id INTEGER PRIMARY KEY AUTOINCREMENT, hash TEXT)")
+    return conn
+
+
+def test_root_matches_full_recomputation() -> None:
+    conn = _conn()
+    acc = MerkleAccumulator(conn, "messages")
+    hashes: list[str] = []
+    assert acc.root() == insight_logging._merkle_root([])
+    for i in range(40):
+        h = hashlib.sha256(str(i).encode()).hexdigest() if i % 7 else "zz"
+        conn.execute("INSERT INTO messages(hash) VALUES (?)", (h,))
+        if h != "zz":
+            hashes.append(h)
+        acc.sync()
+        assert acc.root() == insight_logging._merkle_root(hashes)
+
+
+def test_frontier_persisted_and_proofs_verify() -> None:
+    conn = _conn()
+    hashes = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(13)]
+    conn.executemany("INSERT INTO messages(hash) VALUES (?)", [(h,) for h in hashes])
+    acc = MerkleAccumulator(conn, "messages")
+    acc.sync()
+    assert len(acc.frontier) == bin(len(hashes)).count("1")
+
+    reopened = MerkleAccumulator(conn, "messages")
+    assert reopened.size == len(hashes)
+    root = reopened.root()
+    assert root == insight_logging._merkle_root(hashes)
+    for row_id, h in enumerate(hashes, start=1):
+        assert verify_proof(h, reopened.proof(row_id), root)
+    assert not verify_proof(hashes[0], reopened.proof(2), root)
+    with pytest.raises(KeyError):
+        reopened.proof(99)
+
+
+def test_ledger_merkle_proof(tmp_path: Path) -> None:
+    ledger = Ledger(str(tmp_path / "ledger.db"), broadcast=False)
+    for i in range(5):
+        ledger.log(messaging.Envelope(sender="a", recipient="b", payload={"v": i}, ts=float(i)))
+    root = ledger.compute_merkle_root()
+    leaf = ledger.conn.execute("SELECT hash FROM messages WHERE id = 3").fetchone()[0]
+    assert verify_proof(leaf, ledger.merkle_proof(3), root, insight_logging.blake3)
+    ledger.close()
+
+    reopened = Ledger(str(tmp_path / "ledger.db"), broadcast=False)
+    assert reopened.compute_merkle_root() == root
+
+
+def test_archive_service_root_incremental(tmp_path: Path) -> None:
+    svc = ArchiveService(tmp_path / "arch.db", broadcast=False)
+    roots = [svc.insert_entry({"id": i}, {"score": float(i)}) for i in range(6)]
+    hashes = [row[0] for row in svc.conn.execute("SELECT hash FROM entries ORDER BY id")]
+    assert roots[-1] == insight_logging._merkle_root(hashes)
+    assert verify_proof(hashes[4], svc.merkle_proof(5), roots[-1], insight_logging.blake3)
+    svc.close()
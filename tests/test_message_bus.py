@@ -161,3 +161,240 @@ def test_new_connection_requires_handshake() -> None:
 
     assert len(received) == 1
     assert received[0].payload["v"] == 1
+
+
+def test_envelope_wire_roundtrip() -> None:
+    env = messaging.Envelope(sender="a", recipient="b", payload={"v": 1}, ts=2.0)
+    data = messaging.encode_envelope(env, messaging.WIRE_BINARY)
+    assert data[0] == messaging.WIRE_BINARY
+    decoded, token = messaging.decode_envelope(data)
+    assert decoded == env
+    assert token is None
+    legacy, _ = messaging.decode_envelope(messaging.encode_envelope(env))
+    assert legacy == env
+    with pytest.raises(ValueError):
+        messaging.decode_envelope(b"\x07junk")
+
+
+def test_publish_grpc_binary() -> None:
+    port = _free_port()
+    cfg = config.Settings(bus_port=port, allow_insecure=True)
+    bus = messaging.A2ABus(cfg)
+    received: list[messaging.Envelope] = []
+    bus.subscribe("x", received.append)
+    replies: list[bytes] = []
+
+    async def run() -> None:
+        async with bus:
+            async with grpc.aio.insecure_channel(f"localhost:{port}") as ch:
+                stub = ch.unary_unary("/bus.Bus/Send")
+                replies.append(await stub(f"{messaging.A2ABus.PROTO_VERSION} n1 wire=9".encode()))
+                env = messaging.Envelope(sender="a", recipient="x", payload={"v": 3}, ts=0.0)
+                await stub(messaging.encode_envelope(env, messaging.WIRE_BINARY))
+                await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert replies == [f"{messaging.A2ABus.PROTO_VERSION} wire={messaging.WIRE_BINARY}".encode()]
+    assert len(received) == 1
+    assert received[0].payload["v"] == 3
+
+
+def test_kafka_publish_binary() -> None:
+    sent: list[bytes] = []
+
+    class Prod:
+        def __init__(self, bootstrap_servers: str) -> None:
+            pass
+
+        async def start(self) -> None:
+            pass
+
+        async def send_and_wait(self, topic: str, data: bytes) -> None:
+            sent.append(data)
+
+        async def stop(self) -> None:
+            pass
+
+    cfg = config.Settings(bus_port=0, broker_url="k:1", bus_wire="binary")
+    env = messaging.Envelope(sender="a", recipient="b", payload={"v": 1}, ts=0.0)
+    with mock.patch.object(messaging, "AIOKafkaProducer", Prod):
+
+        async def run() -> None:
+            async with messaging.A2ABus(cfg) as bus:
+                bus.publish("b", env)
+                await asyncio.sleep(0)
+
+        asyncio.run(run())
+
+    assert sent == [bytes((messaging.WIRE_BINARY,)) + env.SerializeToString()]
+
+
+def _queued_bus(size: int, overflow: str) -> messaging.A2ABus:
+    return messaging.A2ABus(config.Settings(bus_port=0, bus_queue_size=size, bus_overflow=overflow))
+
+
+@pytest.mark.parametrize(
+    "overflow, expected",
+    [("drop_newest", [0, 1]), ("drop_oldest", [3, 4]), ("block", [0, 1])],
+)
+def test_bounded_queue_overflow(overflow: str, expected: list[int]) -> None:
+    bus = _queued_bus(2, overflow)
+    received: list[int] = []
+    gate = asyncio.Event()
+
+    async def handler(env: messaging.Envelope) -> None:
+        await gate.wait()
+        received.append(int(env.payload["v"]))
+
+    bus.subscribe("x", handler)
+
+    async def run() -> None:
+        # the first envelope is taken by the worker and blocks on ``gate``
+        bus.publish("x", messaging.Envelope(sender="a", recipient="x", payload={"v": -1}, ts=0.0))
+        await asyncio.sleep(0)
+        for i in range(5):
+            bus.publish("x", messaging.Envelope(sender="a", recipient="x", payload={"v": i}, ts=0.0))
+        gate.set()
+        await bus.drain()
+        await bus.stop()
+
+    asyncio.run(run())
+
+    assert received == [-1, *expected]
+
+
+def test_apublish_blocks_until_space() -> None:
+    bus = _queued_bus(1, "block")
+    received: list[int] = []
+
+    async def handler(env: messaging.Envelope) -> None:
+        await asyncio.sleep(0.01)
+        received.append(int(env.payload["v"]))
+
+    bus.subscribe("x", handler)
+
+    async def run() -> None:
+        for i in range(5):
+            await bus.apublish("x", messaging.Envelope(sender="a", recipient="x", payload={"v": i}, ts=0.0))
+        await bus.drain()
+        await bus.stop()
+
+    asyncio.run(run())
+
+    assert received == list(range(5))
+
+
+def test_unknown_overflow_policy() -> None:
+    with pytest.raises(ValueError):
+        _queued_bus(1, "spill")
+
+
+def test_wildcard_subscriptions() -> None:
+    bus = messaging.A2ABus(config.Settings(bus_port=0))
+    seen: dict[str, list[str]] = {"exact": [], "star": [], "hash": [], "all": []}
+    bus.subscribe("research.a", lambda env: seen["exact"].append(env.recipient))
+    bus.subscribe("research.*", lambda env: seen["star"].append(env.recipient))
+    bus.subscribe("research.#", lambda env: seen["hash"].append(env.recipient))
+    bus.subscribe("#", lambda env: seen["all"].append(env.recipient))
+
+    for topic in ("research", "research.a", "research.b", "research.a.b", "strategy"):
+        bus.publish(topic, messaging.Envelope(sender="s", recipient=topic, ts=0.0))
+
+    assert seen["exact"] == ["research.a"]
+    assert seen["star"] == ["research.a", "research.b"]
+    assert seen["hash"] == ["research", "research.a", "research.b", "research.a.b"]
+    assert len(seen["all"]) == 5
+
+    handler = bus._subs["research.*"][0]
+    bus.unsubscribe("research.*", handler)
+    bus.publish("research.c", messaging.Envelope(sender="s", recipient="research.c", ts=0.0))
+    assert seen["star"] == ["research.a", "research.b"]
+    assert seen["hash"][-1] == "research.c"
+
+
+def test_wildcard_route_cache_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(messaging.A2ABus, "ROUTE_CACHE_SIZE", 3)
+    bus = messaging.A2ABus(config.Settings(bus_port=0))
+    seen: list[str] = []
+    bus.subscribe("#", lambda env: seen.append(env.recipient))
+
+    for topic in ("t0", "t1", "t2", "t0", "t3", "t4"):
+        bus.publish(topic, messaging.Envelope(sender="s", recipient=topic, ts=0.0))
+
+    assert seen == ["t0", "t1", "t2", "t0", "t3", "t4"]
+    assert list(bus._routes) == ["t0", "t3", "t4"]  # t0 was refreshed, t1 and t2 evicted
+
+
+def test_publish_many() -> None:
+    sent: list[tuple[str, bytes]] = []
+
+    class Prod:
+        def __init__(self, bootstrap_servers: str) -> None:
+            pass
+
+        async def start(self) -> None:
+            pass
+
+        async def send_and_wait(self, topic: str, data: bytes) -> None:
+            sent.append((topic, data))
+
+        async def stop(self) -> None:
+            pass
+
+    received: list[float] = []
+    cfg = config.Settings(bus_port=0, broker_url="k:1")
+    envs = [messaging.Envelope(sender="a", recipient="x.y", ts=float(i)) for i in range(4)]
+    with mock.patch.object(messaging, "AIOKafkaProducer", Prod):
+
+        async def run() -> None:
+            async with messaging.A2ABus(cfg) as bus:
+                bus.subscribe("x.*", lambda env: received.append(env.ts))
+                bus.publish_many("x.y", envs)
+                await asyncio.sleep(0.01)
+
+        asyncio.run(run())
+
+    assert received == [0.0, 1.0, 2.0, 3.0]
+    assert [t for t, _ in sent] == ["x.y"] * 4
+
+
+def test_send_batch_oversized_record_not_dropped() -> None:
+    sent: list[tuple[str, list[bytes]]] = []
+
+    class Batch:
+        def __init__(self) -> None:
+            self.items: list[bytes] = []
+
+        def append(self, *, key, value: bytes, timestamp):
+            if len(value) > 4 or sum(map(len, self.items)) + len(value) > 8:
+                return None
+            self.items.append(value)
+            return object()
+
+        def record_count(self) -> int:
+            return len(self.items)
+
+    class Prod:
+        def create_batch(self) -> Batch:
+            return Batch()
+
+        async def partitions_for(self, topic: str) -> set[int]:
+            return {0}
+
+        async def send_batch(self, batch: Batch, topic: str, *, partition: int) -> None:
+            sent.append(("batch", batch.items))
+
+        async def send_and_wait(self, topic: str, data: bytes) -> None:
+            sent.append(("single", [data]))
+
+    bus = messaging.A2ABus(config.Settings(bus_port=0))
+    bus._producer = Prod()  # type: ignore[assignment]
+    asyncio.run(bus._send_batch("t", [b"aaaa", b"bbbb", b"cc", b"huge-record", b"dd"]))
+
+    assert sent == [
+        ("batch", [b"aaaa", b"bbbb"]),
+        ("batch", [b"cc"]),
+        ("single", [b"huge-record"]),
+        ("batch", [b"dd"]),
+    ]
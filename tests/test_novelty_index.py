@@ -0,0 +1,64 @@
+# SPDX-License-Identifier: Apache-2.0
+"""Tests for batched and cached NoveltyIndex scoring."""
+
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from alpha_factory_v1.core.evaluators import novelty  # noqa: E402
+
+
+@pytest.fixture()
+def calls(monkeypatch: pytest.MonkeyPatch) -> list[list[str]]:
+    seen: list[list[str]] = []
+
+    def fake_embed_many(texts: list[str]) -> "np.ndarray":
+        seen.append(list(texts))
+        return np.concatenate([novelty._hash_embedding(t) for t in texts])
+
+    monkeypatch.setattr(novelty, "embed_many", fake_embed_many)
+    return seen
+
+
+@pytest.mark.parametrize("use_faiss", [True, False])
+def test_add_many_single_batch(calls: list[list[str]], monkeypatch: pytest.MonkeyPatch, use_faiss: bool) -> None:
+    if not use_faiss:
+        monkeypatch.setattr(novelty, "faiss", None)
+    idx = novelty.NoveltyIndex()
+    idx.add_many(["a", "b", "c"])
+
+    assert calls == [["a", "b", "c"]]
+    assert idx.count == 3
+    assert idx.knn_novelty("a", k=1) == pytest.approx(0.0, abs=1e-6)
+    assert idx.knn_novelty("zzz", k=1) > 0.5
+
+
+def test_divergence_many_matches_single_and_caches(calls: list[list[str]]) -> None:
+    idx = novelty.NoveltyIndex()
+    idx.add_many(["x", "y"])
+    calls.clear()
+
+    batch = idx.divergence_many(["p", "q", "p"])
+    assert calls == [["p", "q"]]
+    assert batch[0] == pytest.approx(idx.divergence("p"))
+    assert batch[1] == pytest.approx(idx.divergence("q"))
+    assert calls == [["p", "q"]]
+
+
+def test_cache_evicts_least_recent(calls: list[list[str]]) -> None:
+    idx = novelty.NoveltyIndex(cache_size=2)
+    idx.divergence_many(["a", "b"])
+    idx.divergence("a")
+    idx.divergence("c")
+    calls.clear()
+
+    idx.divergence_many(["a", "b"])
+    assert calls == [["b"]]
+
+
+def test_empty_index_defaults(calls: list[list[str]]) -> None:
+    idx = novelty.NoveltyIndex()
+    assert idx.divergence_many(["a", "b"]).tolist() == [1.0, 1.0]
+    assert idx.knn_novelty("a") == 1.0
@@ -2,6 +2,7 @@
 import asyncio
 import contextlib
 
+from alpha_factory_v1.backend import orchestrator_utils
 from alpha_factory_v1.core import orchestrator
 from alpha_factory_v1.core.utils import config
 
@@ -32,7 +33,7 @@ def test_restart_backoff(monkeypatch):
         await orig_sleep(0)
 
     monkeypatch.setattr(orchestrator.asyncio, "sleep", fake_sleep)
-    monkeypatch.setattr(orchestrator.random, "uniform", lambda a, b: 1.0)
+    monkeypatch.setattr(orchestrator_utils.random, "uniform", lambda a, b: 1.0)
 
     events: list[str] = []
 
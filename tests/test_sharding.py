@@ -0,0 +1,163 @@
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import json
+
+import pytest
+
+from alpha_factory_v1.backend.orchestrator_utils import AgentRunner
+from alpha_factory_v1.common.utils import messaging
+from alpha_factory_v1.core import sharding
+from alpha_factory_v1.core.utils import config
+
+
+class _Ledger:
+    def __init__(self) -> None:
+        self.records: list[messaging.Envelope] = []
+
+    def log(self, env: messaging.Envelope) -> None:
+        self.records.append(env)
+
+
+async def _until(cond, timeout: float = 5.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not cond():
+        if loop.time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+def test_hub_relays_between_shards(tmp_path) -> None:
+    settings = config.Settings(bus_port=0)
+    hub = sharding.ShardHub(settings, str(tmp_path / "bus.sock"))
+    hub.ledger = _Ledger()
+    got: dict[str, list[str]] = {"a": [], "hub": []}
+
+    async def run() -> None:
+        await hub.start()
+        buses = []
+        for name in ("a", "b"):
+            bus = sharding.ShardBus(settings)
+            _, writer = await asyncio.open_unix_connection(hub.path)
+            bus.attach(writer)
+            buses.append((bus, writer))
+        a, b = buses[0][0], buses[1][0]
+        a.subscribe("shared", lambda env: got["a"].append(env.sender))
+        b.subscribe("research.*", lambda env: None)
+        hub.subscribe("shared", lambda env: got["hub"].append(env.sender))
+        await _until(lambda: len(hub._peers) == 2 and all(p.topics for p in hub._peers))
+
+        a.publish("research.x", messaging.Envelope(sender="a", recipient="research.x", ts=0.0))
+        b.publish("shared", messaging.Envelope(sender="b", recipient="shared", ts=0.0))
+        sharding.RemoteLedger(buses[0][1]).log(messaging.Envelope(sender="a", recipient="l", ts=1.0))
+        await _until(lambda: got["hub"] == ["b"] and len(hub.ledger.records) == 1)
+        assert got["a"] == []  # publishers do not receive their own envelopes back
+        assert hub.ledger.records[0].sender == "a"
+        peer_b = next(p for p in hub._peers if "research.*" in p.topics)
+        assert peer_b.wants("research.x") and not peer_b.wants("shared")
+        for _, writer in buses:
+            writer.close()
+        await hub.stop()
+
+    asyncio.run(run())
+
+
+def test_shard_worker_roundtrip(tmp_path, monkeypatch) -> None:
+    class Agent:
+        CAPABILITIES = ["x"]
+        CYCLE_SECONDS = 0.01
+
+        def __init__(self, bus, ledger, name: str = "w") -> None:
+            self.name = name
+            self.bus = bus
+            self.ledger = ledger
+            self.cycles = 0
+            bus.subscribe("jobs", self.handle)
+
+        def handle(self, env) -> None:
+            self.bus.publish("done", messaging.Envelope(sender=self.name, recipient="done", ts=env.ts))
+
+        async def run_cycle(self) -> None:
+            self.cycles += 1
+
+    monkeypatch.setattr(sharding, "build_agents", lambda bus, ledger, _s, **_kw: [Agent(bus, ledger)])
+    settings = config.Settings(bus_port=0)
+    hub = sharding.ShardHub(settings, str(tmp_path / "bus.sock"))
+    hub.ledger = _Ledger()
+    runners: list[sharding.RemoteRunner] = []
+    hub.on_register = runners.append
+    done: list[float] = []
+    hub.subscribe("done", lambda env: done.append(env.ts))
+
+    async def run() -> None:
+        await hub.start()
+        worker = asyncio.create_task(sharding.run_shard(settings, hub.path))
+        await _until(lambda: runners and hub._peers and "jobs" in hub._peers[0].topics)
+        runner = runners[0]
+        assert runner.agent.name == "w" and runner.capabilities == ["x"]
+        hub.publish("jobs", messaging.Envelope(sender="hub", recipient="jobs", ts=7.0))
+        await _until(lambda: done == [7.0])
+        before = runner.last_beat
+        await _until(lambda: runner.last_beat > before)
+        await runner.restart(hub, hub.ledger)
+        assert runner.restarts == 1
+        await hub.stop()
+        await asyncio.wait_for(worker, 5)
+        assert runner.task is not None and runner.task.done()
+
+    asyncio.run(run())
+
+
+def test_shard_settings_split(tmp_path, monkeypatch) -> None:
+    from alpha_factory_v1.core import orchestrator
+
+    settings = config.Settings(
+        bus_port=0,
+        ledger_path=str(tmp_path / "ledger.db"),
+        island_backends={"i0": "m", "i1": "m", "i2": "m"},
+        shards=2,
+    )
+    monkeypatch.setenv("ARCHIVE_PATH", str(tmp_path / "archive.db"))
+    monkeypatch.setenv("SOLUTION_ARCHIVE_PATH", str(tmp_path / "solutions.duckdb"))
+    orch = sharding.ShardedOrchestrator(settings, socket_path=str(tmp_path / "bus.sock"))
+    try:
+        assert orch.runners == {}
+        groups = [s.island_backends for s in orch.shard_settings()]
+        assert groups == [{"i0": "m", "i2": "m"}, {"i1": "m"}]
+        assert all(s.bus_port == 0 for s in orch.shard_settings())
+    finally:
+        orch.ledger.close()
+        orch.archive.close()
+        orch.solution_archive.close()
+
+
+def test_singleton_agents_only_on_primary_shard(tmp_path, monkeypatch) -> None:
+    from alpha_factory_v1.core import orchestrator
+
+    monkeypatch.setenv("AGI_SELF_IMPROVE", "1")
+    monkeypatch.setenv("AGI_SELF_IMPROVE_PATCH", str(tmp_path / "fix.diff"))
+    monkeypatch.setenv("AGI_SELF_IMPROVE_REPO", str(tmp_path))
+    settings = config.Settings(bus_port=0).model_copy(update={"island_backends": {}})
+    bus = messaging.A2ABus(settings)
+    primary = orchestrator.build_agents(bus, _Ledger(), settings)
+    assert [a.name for a in primary] == ["self_improver"]
+    assert orchestrator.build_agents(bus, _Ledger(), settings, singletons=False) == []
+
+    seen: list[bool] = []
+    monkeypatch.setattr(
+        sharding, "build_agents", lambda bus, ledger, _s, *, singletons: seen.append(singletons) or []
+    )
+    hub = sharding.ShardHub(settings, str(tmp_path / "bus.sock"))
+    hub.ledger = _Ledger()
+
+    async def run() -> None:
+        await hub.start()
+        workers = [
+            asyncio.create_task(sharding.run_shard(settings, hub.path, primary=flag)) for flag in (True, False)
+        ]
+        await _until(lambda: len(seen) == 2)
+        await hub.stop()
+        await asyncio.wait_for(asyncio.gather(*workers), 5)
+
+    asyncio.run(run())
+    assert sorted(seen) == [False, True]
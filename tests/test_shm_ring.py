@@ -0,0 +1,47 @@
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import secrets
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("google.protobuf")
+
+from alpha_factory_v1.common.utils import config, messaging  # noqa: E402
+from alpha_factory_v1.common.utils.shm_ring import ShmRing  # noqa: E402
+from alpha_factory_v1.core.utils import a2a_pb2 as pb  # noqa: E402
+
+
+def test_ring_wraps_and_rejects_overflow() -> None:
+    ring = ShmRing.create(f"af_test_{secrets.token_hex(4)}", 64)
+    try:
+        assert ring.write([b"a" * 20, b"b" * 20]) == 2
+        assert ring.read() == [b"a" * 20, b"b" * 20]
+        # crosses the end of the buffer
+        assert ring.write([b"c" * 30]) == 1
+        assert ring.write([b"d" * 30]) == 0
+        assert ring.read() == [b"c" * 30]
+        assert ring.pending() == 0
+    finally:
+        ring.close()
+
+
+def test_buses_share_envelopes(tmp_path: Path) -> None:
+    cfg = config.Settings(bus_port=0, bus_shm_dir=str(tmp_path / "bus"))
+    received: list[pb.Envelope] = []
+
+    async def run() -> None:
+        async with messaging.A2ABus(cfg) as a, messaging.A2ABus(cfg) as b:
+            b.subscribe("research.*", received.append)
+            a.publish("research.x", pb.Envelope(sender="a", recipient="research.x", ts=1.0))
+            a.publish_many("research.y", [pb.Envelope(sender="a", recipient="research.y", ts=i) for i in range(3)])
+            a.publish("other", pb.Envelope(sender="a", recipient="other"))
+            for _ in range(100):
+                if len(received) == 4:
+                    break
+                await asyncio.sleep(0.01)
+        assert not list((tmp_path / "bus").iterdir())
+
+    asyncio.run(run())
+    assert [env.recipient for env in received] == ["research.x"] + ["research.y"] * 3
+    assert [env.ts for env in received[1:]] == [0.0, 1.0, 2.0]